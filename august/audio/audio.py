@@ -1,12 +1,16 @@
+import copy
+import random
 from pathlib import Path
 
-import librosa
 import soundfile as sf
 from numpy import ndarray
 
-from august.audio import utils
+from august.audio import features, inplace, rooms, utils
+from august.audio.cache import get_decode_cache
 from august.audio.config import AugustAudioConfig
 from august.audio.decorators import AugustAudioMark, mark_augmentation
+from august.audio.filters import FilterStage, random_cutoff, random_order
+from august.audio.streaming import MASK_FADE_DURATION
 from august.mixins import ExecuteAugmentationMixin
 
 
@@ -18,6 +22,13 @@ class AugustAudio(ExecuteAugmentationMixin):
     polarity inversion, pitch scaling, gain adjustments, adding noise, applying time masking,
     and filtering (low-pass and high-pass).
 
+    If a segment duration is configured, only a random window of the file is loaded.
+    If a decode cache is configured, compressed files are decoded once and memory-mapped from the cache afterwards.
+    In in-place mode, gain, polarity inversion, noise, time masks and time shifts change the waveform
+    in place in its own data type, and copies share the waveform until one of them changes it.
+    If spectrograms are saved instead of audio, the log-mel spectrogram is computed once after all
+    waveform augmentations, and time and frequency masks are applied to it.
+
     Args:
         audio_path (str or Path): The path to the input audio file.
         config (AugustAudioConfig, optional): Configuration settings for audio augmentation. Defaults to AugustAudioConfig().
@@ -26,6 +37,7 @@ class AugustAudio(ExecuteAugmentationMixin):
         y (ndarray): The audio waveform.
         sr (int): The sample rate of the audio.
         config (AugustAudioConfig): The configuration settings for audio augmentation.
+        features (ndarray or None): The augmented log-mel spectrogram, None until computed.
     """
 
     _augmentations = AugustAudioMark.augmentations
@@ -38,20 +50,188 @@ class AugustAudio(ExecuteAugmentationMixin):
             audio_path (str or Path): The path to the input audio file.
             config (AugustAudioConfig, optional): Configuration settings for audio augmentation. Defaults to AugustAudioConfig().
         """
-        self.y: ndarray
+        cache = None
+        if config.decode_cache_dir is not None:
+            cache = get_decode_cache(
+                config.decode_cache_dir, config.decode_cache_size, config.decode_cache_dtype
+            )
+        self._y: ndarray
         self.sr: int
-        self.y, self.sr = librosa.load(audio_path)
-        self.sr = int(self.sr)
+        self._y, self.sr = utils.load(
+            audio_path,
+            sample_rate=config.sample_rate,
+            res_type=config.res_type,
+            dtype=config.dtype,
+            segment=config.segment,
+            cache=cache,
+        )
         self.config = config
+        self._filters = FilterStage(zero_phase=config.zero_phase_filters)
+        self._stretch_rate = 1.0
+        self._pitch_steps = 0.0
+        # STFT of the decoded source, shared by copies, valid while _pristine is True
+        self._spectrum = utils.SpectrumCache()
+        self._pristine = True
+        self.features: ndarray | None = None
+        # masks of the spectrogram as (axis, start, width), in fractions of its size along the axis
+        self._feature_masks: list[tuple[int, float, float]] = []
+
+    @property
+    def y(self) -> ndarray:
+        """
+        The augmented audio waveform, with all pending filters and time-pitch changes applied.
+        """
+        self._apply_filters()
+        self._apply_time_pitch()
+        return self._y
+
+    @y.setter
+    def y(self, y: ndarray) -> None:
+        self._y = y
+        self._filters = FilterStage(zero_phase=self.config.zero_phase_filters)
+        self._stretch_rate, self._pitch_steps = 1.0, 0.0
+        self._pristine = False
+
+    def _apply_filters(self) -> None:
+        """
+        Apply pending low-pass and high-pass filters in a single pass.
+        """
+        if self._filters.pending:
+            self.y = self._filters.apply(self._y)
+
+    def _apply_time_pitch(self) -> None:
+        """
+        Apply pending time stretching and pitch scaling with one STFT, reusing the STFT of the source if possible.
+        """
+        if self._stretch_rate == 1.0 and self._pitch_steps == 0.0:
+            return
+        # WSOLA of the fast quality doesn't use the STFT
+        high_quality = self._pristine and self.config.quality == "high"
+        spectrum = self._spectrum.get(self._y) if high_quality else None
+        self.y = utils.time_pitch(
+            self._y,
+            self.sr,
+            rate=self._stretch_rate,
+            n_steps=self._pitch_steps,
+            res_type=self.config.res_type,
+            spectrum=spectrum,
+            quality=self.config.quality,
+        )
+
+    def _scale(self, y: ndarray) -> None:
+        """
+        Replace the waveform with a scaled version of it (gain or polarity inversion).
+
+        Scaling commutes with filters and time-pitch changes, so pending ones are kept
+        and can still be combined with later ones.
+
+        Args:
+            y (ndarray): The scaled audio waveform.
+        """
+        if y is not self._y:
+            self._y = y
+            self._pristine = False
+
+    def _writable(self, apply_pending: bool = True) -> ndarray:
+        """
+        Get the waveform for an in-place change, copying it first if it is shared with copies.
+
+        Args:
+            apply_pending (bool, optional): Whether to apply pending filters and time-pitch changes first.
+                Defaults to True.
+
+        Returns:
+            ndarray: The audio waveform.
+        """
+        y = self.y if apply_pending else self._y
+        if not y.flags.writeable:
+            y = self._y = y.copy()
+        self._pristine = False
+        return y
+
+    def _apply_features(self) -> None:
+        """
+        Compute the log-mel spectrogram of the augmented audio and apply pending masks to it.
+        """
+        self.features = features.log_mel(
+            self.y,
+            self.sr,
+            n_fft=self.config.n_fft,
+            hop_length=self.config.hop_length,
+            n_mels=self.config.n_mels,
+        )
+        for axis, start, width in self._feature_masks:
+            size = self.features.shape[axis]
+            # masks narrower than one band or frame still mask one, instead of rounding to nothing
+            width = min(max(1, round(width * size)), size)
+            features.mask(self.features, axis, min(int(start * size), size - width), width)
+        self._feature_masks = []
+
+    def _add_feature_mask(self, axis: int, min_part: float, max_part: float) -> None:
+        """
+        Add a mask of the spectrogram, applied once the spectrogram is computed.
+
+        Args:
+            axis (int): features.FREQUENCY_AXIS or features.TIME_AXIS.
+            min_part (float): The minimal width of the mask, as a fraction of the spectrogram size,
+                masks are at least one band or frame wide.
+            max_part (float): The maximum width of the mask, as a fraction of the spectrogram size.
+        """
+        width = random.uniform(min_part, max_part)
+        self._feature_masks.append((axis, random.uniform(0, 1 - width), width))
+
+    def augment(self) -> None:
+        """
+        Execute augmentations and apply pending filters and time-pitch changes.
+
+        If spectrograms are saved, the spectrogram is computed and masked as well.
+        """
+        super().augment()
+        self._apply_filters()
+        self._apply_time_pitch()
+        if self.config.features:
+            self._apply_features()
+
+    def copy(self) -> "AugustAudio":
+        """
+        Create an independent copy of the augmented audio, without decoding the source file again.
+
+        Copies of an unchanged source share its cached STFT. In in-place mode, the waveform
+        itself is shared and copied only when it is changed.
+
+        Returns:
+            AugustAudio: The copy, sharing configuration with this object.
+        """
+        clone = copy.copy(self)
+        y = self.y
+        if self.config.in_place:
+            y = y.view()
+            y.flags.writeable = False
+            self._y = y
+            clone.y = y
+        else:
+            clone.y = y.copy()
+        clone._pristine = self._pristine
+        clone.features = None
+        clone._feature_masks = []
+        return clone
 
     def save(self, filename: str | Path, format: str = "wav") -> None:
         """
         Save the augmented audio to a file.
 
+        If spectrograms are saved instead of audio, the suffix of the file name is replaced by
+        the configured output format and the format argument is ignored.
+
         Args:
             filename (str or Path): The path to the file where the augmented audio will be saved.
             format (str, optional): The file format to use for saving the audio. Defaults to "wav".
         """
+        if self.config.features:
+            if self.features is None:
+                self._apply_features()
+            features.save(filename, self.features, self.sr, self.config.output_format)
+            return
         sf.write(filename, data=self.y, samplerate=self.sr, format=format)
 
     @mark_augmentation
@@ -61,6 +241,12 @@ class AugustAudio(ExecuteAugmentationMixin):
         """
         p = self.config.time_shift_p
         min_shift, max_shift = self.config.min_shift, self.config.max_shift
+        if self.config.in_place:
+            if random.random() < p:
+                y = self._writable()
+                shift = round(random.uniform(min_shift, max_shift) * len(y))
+                inplace.time_shift(y, shift, int(self.sr * MASK_FADE_DURATION))
+            return
         self.y = utils.time_shift(self.y, self.sr, min_shift=min_shift, max_shift=max_shift, p=p)
 
     @mark_augmentation
@@ -68,9 +254,12 @@ class AugustAudio(ExecuteAugmentationMixin):
         """
         Apply time stretching to the audio if the random probability is within the configured range.
         """
-        p = self.config.time_stretch_p
-        min_factor, max_factor = self.config.min_stretch_factor, self.config.max_stretch_factor
-        self.y = utils.time_stretch(self.y, self.sr, min_factor=min_factor, max_factor=max_factor, p=p)
+        if random.random() < self.config.time_stretch_p:
+            # combined with a pitch scaling if one follows, but not with filters applied before
+            self._apply_filters()
+            self._stretch_rate *= random.uniform(
+                self.config.min_stretch_factor, self.config.max_stretch_factor
+            )
 
     @mark_augmentation
     def invert_polarity(self) -> None:
@@ -78,18 +267,22 @@ class AugustAudio(ExecuteAugmentationMixin):
         Invert the polarity of the audio if the random probability is within the configured range.
         """
         p = self.config.invert_polarity_p
-        self.y = utils.invert_polarity(self.y, self.sr, p=p)
+        if self.config.in_place:
+            if random.random() < p:
+                # scaling commutes with pending filters and time-pitch changes
+                inplace.gain(self._writable(apply_pending=False), -1)
+            return
+        self._scale(utils.invert_polarity(self._y, self.sr, p=p))
 
     @mark_augmentation
     def pitch_scale(self) -> None:
         """
         Apply pitch scaling to the audio if the random probability is within the configured range.
         """
-        p = self.config.pitch_scale_p
-        min_semitones, max_semitones = self.config.min_semitones, self.config.max_semitones
-        self.y = utils.pitch_scale(
-            self.y, self.sr, min_semitones=min_semitones, max_semitones=max_semitones, p=p
-        )
+        if random.random() < self.config.pitch_scale_p:
+            # combined with a time stretching if one follows, but not with filters applied before
+            self._apply_filters()
+            self._pitch_steps += random.randint(self.config.min_semitones, self.config.max_semitones)
 
     @mark_augmentation
     def random_gain(self) -> None:
@@ -98,7 +291,13 @@ class AugustAudio(ExecuteAugmentationMixin):
         """
         p = self.config.random_gain_p
         min_factor, max_factor = self.config.min_gain_factor, self.config.max_gain_factor
-        self.y = utils.random_gain(self.y, self.sr, min_factor=min_factor, max_factor=max_factor, p=p)
+        if self.config.in_place:
+            if random.random() < p:
+                inplace.gain(self._writable(apply_pending=False), random.uniform(min_factor, max_factor))
+            return
+        self._scale(
+            utils.random_gain(self._y, self.sr, min_factor=min_factor, max_factor=max_factor, p=p)
+        )
 
     @mark_augmentation
     def gaussian_noise(self) -> None:
@@ -107,6 +306,10 @@ class AugustAudio(ExecuteAugmentationMixin):
         """
         p = self.config.gaussian_noise_p
         min_amplitude, max_amplitude = self.config.min_gain_amplitude, self.config.max_gain_amplitude
+        if self.config.in_place:
+            if random.random() < p:
+                inplace.gaussian_noise(self._writable(), random.uniform(min_amplitude, max_amplitude))
+            return
         self.y = utils.gaussian_noise(
             self.y, self.sr, min_amplitude=min_amplitude, max_amplitude=max_amplitude, p=p
         )
@@ -118,30 +321,67 @@ class AugustAudio(ExecuteAugmentationMixin):
         """
         p = self.config.time_mask_p
         min_part, max_part = self.config.min_mask_part, self.config.max_mask_part
+        if self.config.features:
+            if random.random() < p:
+                self._add_feature_mask(features.TIME_AXIS, min_part, max_part)
+            return
+        if self.config.in_place:
+            if random.random() < p:
+                y = self._writable()
+                width = random.randint(int(len(y) * min_part), int(len(y) * max_part))
+                start = random.randint(0, len(y) - width)
+                fade = min(round(self.sr * MASK_FADE_DURATION), width // 2)
+                inplace.time_mask(y, start, width, fade)
+            return
         self.y = utils.time_mask(self.y, self.sr, min_part=min_part, max_part=max_part, p=p)
 
+    @mark_augmentation
+    def frequency_mask(self) -> None:
+        """
+        Mask a band of mel frequencies of the saved spectrogram if the random probability is within the configured range.
+
+        Frequency masks are applied only if spectrograms are saved instead of audio.
+        """
+        if self.config.features and random.random() < self.config.frequency_mask_p:
+            min_part, max_part = self.config.min_frequency_mask_part, self.config.max_frequency_mask_part
+            self._add_feature_mask(features.FREQUENCY_AXIS, min_part, max_part)
+
     @mark_augmentation
     def low_pass_filter(self) -> None:
         """
         Apply a low-pass filter to the audio if the random probability is within the configured range.
+
+        The filter is applied later, together with a high-pass filter if one follows.
         """
-        p = self.config.low_pass_filter_p
-        min_freq, max_freq = self.config.min_low_pass_freq, self.config.max_low_pass_freq
-        self.y = utils.low_pass_filter(self.y, self.sr, min_freq=min_freq, max_freq=max_freq, p=p)
+        if random.random() < self.config.low_pass_filter_p:
+            self._apply_time_pitch()
+            cutoff = random_cutoff(self.config.min_low_pass_freq, self.config.max_low_pass_freq)
+            self._filters.low_pass(cutoff, random_order(self._filters.zero_phase), self.sr)
 
     @mark_augmentation
     def high_pass_filter(self) -> None:
         """
         Apply a high-pass filter to the audio if the random probability is within the configured range.
+
+        The filter is applied later, together with a low-pass filter if one follows.
         """
-        p = self.config.high_pass_filter_p
-        min_freq, max_freq = self.config.min_high_pass_freq, self.config.max_high_pass_freq
-        self.y = utils.high_pass_filter(self.y, self.sr, min_freq=min_freq, max_freq=max_freq, p=p)
+        if random.random() < self.config.high_pass_filter_p:
+            self._apply_time_pitch()
+            cutoff = random_cutoff(self.config.min_high_pass_freq, self.config.max_high_pass_freq)
+            self._filters.high_pass(cutoff, random_order(self._filters.zero_phase), self.sr)
 
     @mark_augmentation
     def room(self) -> None:
         """
         Apply room simulation to the audio if the random probability is within the configured range.
+
+        Rooms are taken from a room bank, simulated once per bank or loaded from impulse response files.
         """
-        p = self.config.room_p
-        self.y = utils.room(self.y, self.sr, p=p)
+        if random.random() < self.config.room_p:
+            bank = rooms.get_room_bank(
+                self.config.room_bank_path,
+                self.config.sample_rate or rooms.DEFAULT_ROOM_SR,
+                self.config.room_bank_size,
+                self.config.room_ir_dir,
+            )
+            self.y = bank.apply(self.y, self.sr)
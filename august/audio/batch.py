@@ -0,0 +1,376 @@
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+from numpy import ndarray
+
+from august.audio.config import AugustAudioConfig
+from august.audio.decorators import AugustAudioBatchMark, mark_batch_augmentation
+from august.audio.filters import FilterStage, filter_batch, random_cutoffs
+from august.audio.streaming import MASK_FADE_DURATION
+from august.mixins import ExecuteAugmentationMixin
+
+
+class AugustAudioBatch(ExecuteAugmentationMixin):
+    """
+    A class for augmenting a batch of audio clips at once with vectorized array operations.
+
+    Clips are stored as rows of a zero-padded (N, T) float32 array together with their lengths.
+    Every augmentation draws its random parameters for all clips in bulk and applies them to
+    the whole batch, so the per-clip Python overhead of AugustAudio is paid once per batch.
+    Gain, polarity inversion, noise, time shift, time mask and filters are supported; time stretch,
+    pitch scale and rooms change the length of clips and are not.
+
+    The input array is never modified, it is copied the first time an augmentation writes to it,
+    so variants of one clip share a single broadcast row until they are augmented.
+
+    Args:
+        ys (ndarray): Batch of zero-padded waveforms of shape (N, T).
+        lengths (ndarray): Lengths of the waveforms of shape (N,).
+        sr (int): The sample rate of the audio.
+        config (AugustAudioConfig, optional): Configuration settings for audio augmentation. Defaults to AugustAudioConfig().
+        rng (np.random.Generator or None, optional): Random generator used to draw parameters. Defaults to None.
+
+    Attributes:
+        ys (ndarray): The batch of waveforms, with all pending filters applied.
+        lengths (ndarray): Lengths of the waveforms.
+        sr (int): The sample rate of the audio.
+        config (AugustAudioConfig): The configuration settings for audio augmentation.
+        rng (np.random.Generator): Random generator used to draw parameters.
+    """
+
+    _augmentations = AugustAudioBatchMark.augmentations
+
+    def __init__(
+        self,
+        ys: ndarray,
+        lengths: ndarray,
+        sr: int,
+        config: AugustAudioConfig = AugustAudioConfig(),
+        rng: np.random.Generator | None = None,
+    ) -> None:
+        """
+        Initialize the AugustAudioBatch object.
+
+        Args:
+            ys (ndarray): Batch of zero-padded waveforms of shape (N, T).
+            lengths (ndarray): Lengths of the waveforms of shape (N,).
+            sr (int): The sample rate of the audio.
+            config (AugustAudioConfig, optional): Configuration settings for audio augmentation. Defaults to AugustAudioConfig().
+            rng (np.random.Generator or None, optional): Random generator used to draw parameters. Defaults to None.
+
+        Raises:
+            ValueError: If waveforms are not a 2D array or lengths don't fit them.
+        """
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if ys.ndim != 2 or lengths.shape != ys.shape[:1]:
+            raise ValueError("Waveforms should be an array of shape (N, T) with N lengths.")
+        if np.any(lengths < 1) or np.any(lengths > ys.shape[1]):
+            raise ValueError("Lengths should be between 1 and the length of the padded waveforms.")
+        ys = np.asarray(ys, dtype=np.float32).view()
+        ys.flags.writeable = False
+        self._ys = ys
+        self.lengths = lengths
+        self.sr = sr
+        self.config = config
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._filters = [FilterStage(zero_phase=config.zero_phase_filters) for _ in range(len(ys))]
+
+    @classmethod
+    def from_clips(
+        cls,
+        clips: list[ndarray],
+        sr: int,
+        config: AugustAudioConfig = AugustAudioConfig(),
+        rng: np.random.Generator | None = None,
+    ) -> "AugustAudioBatch":
+        """
+        Create a batch from waveforms of different lengths, padding them with zeros.
+
+        Args:
+            clips (list[ndarray]): The audio waveforms.
+            sr (int): The sample rate of the audio.
+            config (AugustAudioConfig, optional): Configuration settings for audio augmentation. Defaults to AugustAudioConfig().
+            rng (np.random.Generator or None, optional): Random generator used to draw parameters. Defaults to None.
+
+        Returns:
+            AugustAudioBatch: The batch of clips.
+        """
+        lengths = np.array([len(y) for y in clips])
+        ys = np.zeros((len(clips), lengths.max()), dtype=np.float32)
+        for row, y in zip(ys, clips):
+            row[: len(y)] = y
+        return cls(ys, lengths, sr, config=config, rng=rng)
+
+    @classmethod
+    def variants(
+        cls,
+        y: ndarray,
+        sr: int,
+        k: int,
+        config: AugustAudioConfig = AugustAudioConfig(),
+        rng: np.random.Generator | None = None,
+    ) -> "AugustAudioBatch":
+        """
+        Create a batch of k variants of one clip, broadcasting the clip instead of copying it.
+
+        Args:
+            y (ndarray): The audio waveform.
+            sr (int): The sample rate of the audio.
+            k (int): The number of variants.
+            config (AugustAudioConfig, optional): Configuration settings for audio augmentation. Defaults to AugustAudioConfig().
+            rng (np.random.Generator or None, optional): Random generator used to draw parameters. Defaults to None.
+
+        Returns:
+            AugustAudioBatch: The batch of variants.
+        """
+        ys = np.broadcast_to(np.asarray(y, dtype=np.float32), (k, len(y)))
+        return cls(ys, np.full(k, len(y)), sr, config=config, rng=rng)
+
+    def __len__(self) -> int:
+        return len(self._ys)
+
+    @property
+    def ys(self) -> ndarray:
+        """
+        The batch of augmented waveforms, with all pending filters applied.
+        """
+        self._apply_filters()
+        return self._ys
+
+    @ys.setter
+    def ys(self, ys: ndarray) -> None:
+        self._ys = ys
+        self._filters = [FilterStage(zero_phase=self.config.zero_phase_filters) for _ in range(len(ys))]
+
+    def _clear_padding(self) -> None:
+        """
+        Silence the padding after every clip.
+        """
+        for row in np.flatnonzero(self.lengths < self._ys.shape[1]):
+            self._ys[row, self.lengths[row] :] = 0
+
+    def _writable(self) -> ndarray:
+        """
+        Get the waveforms for writing, copying them first if they are shared with the input.
+
+        Returns:
+            ndarray: The batch of waveforms.
+        """
+        if not self._ys.flags.writeable:
+            self._ys = np.array(self._ys)
+        return self._ys
+
+    def _draw(self, p: float) -> ndarray:
+        """
+        Draw which clips of the batch an augmentation should be applied to.
+
+        Args:
+            p (float): The probability of applying the augmentation.
+
+        Returns:
+            ndarray: Boolean mask of shape (N,).
+        """
+        return self.rng.random(len(self)) < p
+
+    def _apply_filters(self) -> None:
+        """
+        Apply pending low-pass and high-pass filters, with one pass per distinct filter cascade.
+        """
+        if any(stage.pending for stage in self._filters):
+            self.ys = filter_batch(self._ys, self._filters)
+            # filter responses ring into the padding
+            self._clear_padding()
+
+    def _scale(self, factors: ndarray) -> None:
+        """
+        Scale every clip (gain or polarity inversion).
+
+        Scaling commutes with filters, so pending filters are kept.
+
+        Args:
+            factors (ndarray): Scale factors of shape (N,), 1 keeps a clip unchanged.
+        """
+        self._ys = self._ys * factors.astype(np.float32)[:, None]
+
+    def _noise(self, amplitudes: ndarray) -> None:
+        """
+        Add Gaussian noise to every clip, leaving the padding silent.
+
+        Args:
+            amplitudes (ndarray): Amplitudes of noise of shape (N,), 0 keeps a clip unchanged.
+        """
+        self._apply_filters()
+        rows = np.flatnonzero(amplitudes > 0)
+        noise = self.rng.standard_normal((len(rows), self._ys.shape[1]), dtype=np.float32)
+        noise *= amplitudes[rows].astype(np.float32)[:, None]
+        ys = self._writable()
+        if len(rows) == len(self):
+            ys += noise
+        else:
+            ys[rows] += noise
+        self._clear_padding()
+
+    def _shift(self, shifts: ndarray) -> None:
+        """
+        Roll every clip within its length, fading the audio in and out around the seam as audiomentations.Shift does.
+
+        Every shifted row is rebuilt from two slices, which moves less memory than a gather
+        with a full-size index array.
+
+        Args:
+            shifts (ndarray): Shifts in samples of shape (N,), 0 keeps a clip unchanged.
+        """
+        self._apply_filters()
+        seams = shifts % self.lengths
+        fade = max(int(self.sr * MASK_FADE_DURATION), 1)
+        ys = self._writable()
+        for row in np.flatnonzero(seams):
+            length, seam = self.lengths[row], seams[row]
+            y = ys[row, :length]
+            y[:] = np.concatenate((y[length - seam :], y[: length - seam]))
+            # silent at the seam, linear fades to full level on both sides
+            start, end = max(seam - fade, 0), min(seam + fade, length)
+            y[start:end] *= np.abs(np.arange(start - seam, end - seam, dtype=np.float32)) / fade
+
+    def _mask(self, starts: ndarray, widths: ndarray) -> None:
+        """
+        Silence a region of every clip, with linear fades on both sides.
+
+        Only the masked slice of every row is scaled, instead of the whole batch.
+
+        Args:
+            starts (ndarray): First samples of the masked regions of shape (N,).
+            widths (ndarray): Lengths of the masked regions of shape (N,), 0 keeps a clip unchanged.
+        """
+        self._apply_filters()
+        ys = self._writable()
+        for row in np.flatnonzero(widths):
+            start, width = starts[row], widths[row]
+            fade = max(min(round(self.sr * MASK_FADE_DURATION), width // 2), 1)
+            positions = np.arange(start, start + width)
+            points = [start, start + fade, start + width - fade, start + width]
+            ys[row, start : start + width] *= np.interp(positions, points, [1, 0, 0, 1]).astype(
+                np.float32
+            )
+
+    def _add_filters(self, btype: str, mask: ndarray, min_freq: float, max_freq: float) -> None:
+        """
+        Add a low-pass or high-pass filter to the pending filters of selected clips.
+
+        Args:
+            btype (str): The filter type, "lowpass" or "highpass".
+            mask (ndarray): Boolean mask of shape (N,) selecting clips.
+            min_freq (float): The minimum cutoff frequency.
+            max_freq (float): The maximum cutoff frequency.
+        """
+        cutoffs = random_cutoffs(min_freq, max_freq, self.rng, len(self))
+        # 12 to 24 dB per octave, as filters.random_order
+        min_order, max_order = (1, 2) if self.config.zero_phase_filters else (2, 4)
+        orders = self.rng.integers(min_order, max_order, len(self), endpoint=True)
+        for index in np.flatnonzero(mask):
+            stage = self._filters[index]
+            add = stage.low_pass if btype == "lowpass" else stage.high_pass
+            add(cutoffs[index], int(orders[index]), self.sr)
+
+    def augment(self) -> None:
+        """
+        Execute augmentations and apply pending filters.
+        """
+        super().augment()
+        self._apply_filters()
+
+    def clips(self) -> list[ndarray]:
+        """
+        Get the augmented clips without padding.
+
+        Returns:
+            list[ndarray]: The augmented audio waveforms.
+        """
+        return [y[:length] for y, length in zip(self.ys, self.lengths)]
+
+    def save(self, filenames: list[str | Path], format: str = "wav") -> None:
+        """
+        Save every augmented clip to its own file.
+
+        Args:
+            filenames (list[str or Path]): The paths of the files, one per clip.
+            format (str, optional): The file format to use for saving the audio. Defaults to "wav".
+        """
+        for filename, y in zip(filenames, self.clips()):
+            sf.write(filename, data=y, samplerate=self.sr, format=format)
+
+    @mark_batch_augmentation
+    def time_shift(self) -> None:
+        """
+        Apply time shifting to clips drawn with the configured probability.
+        """
+        mask = self._draw(self.config.time_shift_p)
+        shifts = self.rng.uniform(self.config.min_shift, self.config.max_shift, len(self))
+        if mask.any():
+            self._shift(np.where(mask, np.round(shifts * self.lengths).astype(np.int64), 0))
+
+    @mark_batch_augmentation
+    def invert_polarity(self) -> None:
+        """
+        Invert the polarity of clips drawn with the configured probability.
+        """
+        mask = self._draw(self.config.invert_polarity_p)
+        if mask.any():
+            self._scale(np.where(mask, -1.0, 1.0))
+
+    @mark_batch_augmentation
+    def random_gain(self) -> None:
+        """
+        Apply random gain adjustments to clips drawn with the configured probability.
+        """
+        mask = self._draw(self.config.random_gain_p)
+        factors = self.rng.uniform(self.config.min_gain_factor, self.config.max_gain_factor, len(self))
+        if mask.any():
+            self._scale(np.where(mask, factors, 1.0))
+
+    @mark_batch_augmentation
+    def gaussian_noise(self) -> None:
+        """
+        Add Gaussian noise to clips drawn with the configured probability.
+        """
+        mask = self._draw(self.config.gaussian_noise_p)
+        min_amplitude, max_amplitude = self.config.min_gain_amplitude, self.config.max_gain_amplitude
+        amplitudes = self.rng.uniform(min_amplitude, max_amplitude, len(self))
+        if mask.any():
+            self._noise(np.where(mask, amplitudes, 0))
+
+    @mark_batch_augmentation
+    def time_mask(self) -> None:
+        """
+        Apply time masking to clips drawn with the configured probability.
+        """
+        mask = self._draw(self.config.time_mask_p)
+        min_widths = (self.lengths * self.config.min_mask_part).astype(np.int64)
+        max_widths = (self.lengths * self.config.max_mask_part).astype(np.int64)
+        widths = self.rng.integers(min_widths, max_widths, endpoint=True)
+        starts = self.rng.integers(0, self.lengths - widths, endpoint=True)
+        if mask.any():
+            self._mask(starts, np.where(mask, widths, 0))
+
+    @mark_batch_augmentation
+    def low_pass_filter(self) -> None:
+        """
+        Apply a low-pass filter to clips drawn with the configured probability.
+
+        Filters are applied later, clips with the same filters are filtered together.
+        """
+        mask = self._draw(self.config.low_pass_filter_p)
+        min_freq, max_freq = self.config.min_low_pass_freq, self.config.max_low_pass_freq
+        self._add_filters("lowpass", mask, min_freq, max_freq)
+
+    @mark_batch_augmentation
+    def high_pass_filter(self) -> None:
+        """
+        Apply a high-pass filter to clips drawn with the configured probability.
+
+        Filters are applied later, clips with the same filters are filtered together.
+        """
+        mask = self._draw(self.config.high_pass_filter_p)
+        min_freq, max_freq = self.config.min_high_pass_freq, self.config.max_high_pass_freq
+        self._add_filters("highpass", mask, min_freq, max_freq)
@@ -0,0 +1,152 @@
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from numpy import ndarray
+
+# full scale of int16 samples
+INT16_SCALE = 32768
+
+
+class DecodeCache:
+    """
+    An on-disk cache of decoded audio, stored as .npy files and memory-mapped on later loads.
+
+    Every entry is a {key}.npy file with the samples and a {key}.sr file with their sample rate, so a hit
+    opens its files by name without listing the directory.
+
+    Entries are keyed by the path, modification time and size of the source file and by the load
+    settings, so changed files and different settings never reuse stale audio. Hits refresh the
+    modification time of the entry, which evict uses to remove the least recently used entries.
+
+    Args:
+        directory (str or Path): The directory of the cache, created if it doesn't exist.
+        max_bytes (int): The size the cache is reduced to by evict.
+        dtype (str, optional): The data type of stored samples, "float32" or "int16". Defaults to "float32".
+
+    Attributes:
+        directory (Path): The directory of the cache.
+        max_bytes (int): The size the cache is reduced to by evict.
+        dtype (str): The data type of stored samples.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int, dtype: str = "float32") -> None:
+        """
+        Initialize the DecodeCache object.
+
+        Args:
+            directory (str or Path): The directory of the cache, created if it doesn't exist.
+            max_bytes (int): The size the cache is reduced to by evict.
+            dtype (str, optional): The data type of stored samples, "float32" or "int16". Defaults to "float32".
+
+        Raises:
+            ValueError: If the data type is not float32 or int16.
+        """
+        if dtype not in ("float32", "int16"):
+            raise ValueError("Decoded audio can be cached only as float32 or int16.")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+
+    def key(self, audio_path: str | Path, **settings) -> str:
+        """
+        Get the key of a source file loaded with some settings.
+
+        Args:
+            audio_path (str or Path): The path to the source audio file.
+            **settings: The load settings, such as sample rate and resampler.
+
+        Returns:
+            str: The key of the cache entry.
+        """
+        stat = os.stat(audio_path)
+        parts = [os.path.abspath(audio_path), stat.st_mtime_ns, stat.st_size, self.dtype]
+        parts += [f"{name}={value}" for name, value in sorted(settings.items())]
+        return hashlib.sha1("\0".join(map(str, parts)).encode()).hexdigest()
+
+    def get(self, key: str, dtype: str) -> tuple[ndarray, int] | None:
+        """
+        Load a cache entry, memory-mapped if it is stored with the requested data type.
+
+        Args:
+            key (str): The key of the cache entry.
+            dtype (str): The data type of the returned waveform.
+
+        Returns:
+            tuple[ndarray, int] or None: The waveform (read-only if memory-mapped) and its sample rate,
+            None if the entry doesn't exist.
+        """
+        path = self.directory / f"{key}.npy"
+        try:
+            y = np.load(path, mmap_mode="r")
+            sr = int(path.with_suffix(".sr").read_text())
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            # not cached, evicted by another process or partially written by an older version
+            return None
+        if y.dtype == np.int16:
+            return (y / np.asarray(INT16_SCALE, dtype=dtype)).astype(dtype, copy=False), sr
+        return y.astype(dtype, copy=False), sr
+
+    def put(self, key: str, y: ndarray, sr: int) -> None:
+        """
+        Store a decoded waveform.
+
+        Args:
+            key (str): The key of the cache entry.
+            y (ndarray): The audio waveform.
+            sr (int): The sample rate of the waveform.
+        """
+        if self.dtype == "int16":
+            y = np.clip(np.rint(y * INT16_SCALE), -INT16_SCALE, INT16_SCALE - 1).astype(np.int16)
+        else:
+            y = y.astype(np.float32, copy=False)
+        path = self.directory / f"{key}.npy"
+        # write to temporary files first, so that other processes never load a partially written entry,
+        # the sample rate first, so that it exists whenever the samples do
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as file:
+            file.write(str(sr))
+        os.replace(temporary_path, path.with_suffix(".sr"))
+        with open(temporary_path, "wb") as file:
+            np.save(file, y)
+        os.replace(temporary_path, path)
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits in its size limit.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npy"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for entry_path in (path, path[: -len(".npy")] + ".sr"):
+                try:
+                    os.remove(entry_path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+
+@lru_cache
+def get_decode_cache(directory: str, size: float, dtype: str = "float32") -> DecodeCache:
+    """
+    Get the decode cache of the current process.
+
+    Args:
+        directory (str): The directory of the cache.
+        size (float): The size in GB the cache is reduced to by evict.
+        dtype (str, optional): The data type of stored samples. Defaults to "float32".
+
+    Returns:
+        DecodeCache: The decode cache.
+    """
+    return DecodeCache(directory, int(size * 10**9), dtype)
@@ -1,11 +1,58 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+OutputFormat = Literal["wav", "npy", "npz"]
+ResampleType = Literal["soxr_vhq", "soxr_hq", "soxr_mq", "soxr_lq", "soxr_qq", "polyphase", "linear"]
+
 
 class AugustAudioConfig(BaseModel):
     """
     Model storing configuration data for AugustAudio class
     """
 
+    sample_rate: int | None = Field(
+        22050,
+        description="Sample rate audio is resampled to on load, the native rate is kept if None",
+        gt=0,
+    )
+    res_type: ResampleType = Field("soxr_hq", description="Resampler used on load, from best to fastest")
+    dtype: Literal["float32", "float64"] = Field("float32", description="Data type of loaded audio")
+    min_segment_duration: float | None = Field(
+        None,
+        description="Minimal duration of a random window read from every file, whole files are read if None",
+        gt=0,
+    )
+    max_segment_duration: float | None = Field(
+        None,
+        description="Maximum duration of a random window, the minimal duration is used if None",
+        gt=0,
+    )
+    decode_cache_dir: str | None = Field(
+        None,
+        description="Directory of the cache of decoded audio of formats other than WAV, FLAC and Ogg",
+    )
+    decode_cache_size: float = Field(
+        10, description="Size in GB the decode cache is reduced to after every run", gt=0
+    )
+    decode_cache_dtype: Literal["float32", "int16"] = Field(
+        "float32", description="Data type of cached audio, int16 takes half the space"
+    )
+    block_size: int = Field(65536, description="Number of samples read at once in streaming mode", gt=0)
+    output_format: OutputFormat = Field(
+        "wav",
+        description="Format of augmented audio, npy and npz save log-mel spectrograms instead of audio",
+    )
+    n_mels: int = Field(80, description="Number of mel bands of saved spectrograms", gt=0)
+    n_fft: int = Field(2048, description="FFT window length of saved spectrograms", gt=0)
+    hop_length: int = Field(
+        512, description="Number of samples between frames of saved spectrograms", gt=0
+    )
+    in_place: bool = Field(
+        False,
+        description="Apply gain, polarity inversion, noise, time masks and time shifts in place, without temporary copies",
+    )
+
     time_shift_p: float = Field(0.5, description="Time shift probability", ge=0, le=1)
     min_shift: float = Field(
         -0.5, description="Minimal shift as a fraction of total length", ge=-1, le=1
@@ -15,6 +62,10 @@ class AugustAudioConfig(BaseModel):
     time_stretch_p: float = Field(0.5, description="Time stretch probability", ge=0, le=1)
     min_stretch_factor: float = Field(0.5, description="Minimal time stretch factor")
     max_stretch_factor: float = Field(1.5, description="Maximum time stretch factor")
+    quality: Literal["high", "fast"] = Field(
+        "high",
+        description="Time stretch and pitch scale engine, phase vocoder (high) or WSOLA (fast, fine for speech)",
+    )
 
     invert_polarity_p: float = Field(0.5, description="Invert polarity probability", ge=0, le=1)
 
@@ -34,6 +85,12 @@ class AugustAudioConfig(BaseModel):
     min_mask_part: float = Field(0.01, description="Minimal mask part", ge=0, le=1)
     max_mask_part: float = Field(0.5, description="Maximum mask part", ge=0, le=1)
 
+    frequency_mask_p: float = Field(
+        0.5, description="Frequency mask probability, applied to saved spectrograms only", ge=0, le=1
+    )
+    min_frequency_mask_part: float = Field(0.01, description="Minimal frequency mask part", ge=0, le=1)
+    max_frequency_mask_part: float = Field(0.15, description="Maximum frequency mask part", ge=0, le=1)
+
     low_pass_filter_p: float = Field(0.5, description="Low pass filter probability", ge=0, le=1)
     min_low_pass_freq: float = Field(150, description="Minimal low pass filter frequency")
     max_low_pass_freq: float = Field(7500, description="Maximum low pass filter frequency")
@@ -42,4 +99,31 @@ class AugustAudioConfig(BaseModel):
     min_high_pass_freq: float = Field(20, description="Minimal high pass filter frequency")
     max_high_pass_freq: float = Field(2400, description="Maximum high pass filter frequency")
 
+    zero_phase_filters: bool = Field(
+        False, description="Apply low and high pass filters forwards and backwards without phase shift"
+    )
+
     room_p: float = Field(0.5, description="Room effect probability", ge=0, le=1)
+    room_bank_path: str | None = Field(
+        None, description="Path of the room impulse response bank, created there if it doesn't exist"
+    )
+    room_ir_dir: str | None = Field(
+        None, description="Directory with impulse response WAV files used instead of simulated rooms"
+    )
+    room_bank_size: int = Field(32, description="Number of simulated rooms in the bank", gt=0)
+
+    @property
+    def segment(self) -> tuple[float, float | None] | None:
+        """
+        The minimum and maximum duration of a random window read from every file, or None for whole files.
+        """
+        if self.min_segment_duration is None:
+            return None
+        return self.min_segment_duration, self.max_segment_duration
+
+    @property
+    def features(self) -> bool:
+        """
+        Whether log-mel spectrograms are saved instead of audio.
+        """
+        return self.output_format != "wav"
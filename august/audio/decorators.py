@@ -6,3 +6,17 @@ class AugustAudioMark(metaclass=MarkAugmentationMeta):
 
 
 mark_augmentation = AugustAudioMark.mark_augmentation
+
+
+class AugustAudioBatchMark(metaclass=MarkAugmentationMeta):
+    pass
+
+
+mark_batch_augmentation = AugustAudioBatchMark.mark_augmentation
+
+
+class AugustAudioStreamMark(metaclass=MarkAugmentationMeta):
+    pass
+
+
+mark_stream_augmentation = AugustAudioStreamMark.mark_augmentation
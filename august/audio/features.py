@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import librosa
+import numpy as np
+from numpy import ndarray
+
+# axes of spectrograms of shape (n_mels, frames)
+FREQUENCY_AXIS = 0
+TIME_AXIS = 1
+
+
+def log_mel(y: ndarray, sr: int, *, n_fft: int, hop_length: int, n_mels: int) -> ndarray:
+    """
+    Compute the log-mel spectrogram of the audio.
+
+    Args:
+        y (ndarray): The audio waveform.
+        sr (int): The sample rate of the audio.
+        n_fft (int): The FFT window length.
+        hop_length (int): The number of samples between frames.
+        n_mels (int): The number of mel bands.
+
+    Returns:
+        ndarray: The spectrogram in decibels of shape (n_mels, frames), with the data type of the audio.
+    """
+    mel = librosa.feature.melspectrogram(y=y, sr=sr, n_fft=n_fft, hop_length=hop_length, n_mels=n_mels)
+    return librosa.power_to_db(mel).astype(y.dtype, copy=False)
+
+
+def mask(features: ndarray, axis: int, start: int, width: int) -> None:
+    """
+    Mask consecutive mel bands or frames of a spectrogram in place, as SpecAugment does.
+
+    Masked values are set to the mean of the spectrogram, which is silence-like for normalized
+    features while keeping the value range of decibels.
+
+    Args:
+        features (ndarray): The spectrogram of shape (n_mels, frames).
+        axis (int): FREQUENCY_AXIS to mask mel bands, TIME_AXIS to mask frames.
+        start (int): The first masked band or frame.
+        width (int): The number of masked bands or frames.
+    """
+    region = [slice(None), slice(None)]
+    region[axis] = slice(start, start + width)
+    features[tuple(region)] = features.mean()
+
+
+def save(filename: str | Path, features: ndarray, sr: int, output_format: str) -> Path:
+    """
+    Save a spectrogram as a .npy array or a compressed .npz archive, which also stores the sample rate.
+
+    Args:
+        filename (str or Path): The path of the output file, its suffix is replaced by the format.
+        features (ndarray): The spectrogram.
+        sr (int): The sample rate of the audio.
+        output_format (str): "npy" or "npz".
+
+    Returns:
+        Path: The path of the saved file.
+    """
+    path = Path(filename).with_suffix(f".{output_format}")
+    if output_format == "npz":
+        np.savez_compressed(path, features=features, sr=sr)
+    else:
+        np.save(path, features)
+    return path
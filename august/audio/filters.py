@@ -0,0 +1,250 @@
+import math
+import random
+from functools import lru_cache
+
+import numpy as np
+from numpy import ndarray
+from scipy.signal import butter, sosfilt, sosfilt_zi, sosfiltfilt
+
+# cutoff frequencies are rounded to this many steps per octave, so that filter designs can be cached
+CUTOFF_BUCKETS_PER_OCTAVE = 24
+# reference frequency of cutoff buckets
+BUCKET_REFERENCE_FREQ = 1000.0
+
+
+def cutoff_bucket(freq: float) -> int:
+    """
+    Get the bucket of a cutoff frequency, buckets are spaced evenly on a logarithmic scale.
+
+    Args:
+        freq (float): The cutoff frequency in Hz.
+
+    Returns:
+        int: The bucket index.
+    """
+    return round(CUTOFF_BUCKETS_PER_OCTAVE * math.log2(freq / BUCKET_REFERENCE_FREQ))
+
+
+def bucket_freq(bucket: int) -> float:
+    """
+    Get the cutoff frequency of a bucket.
+
+    Args:
+        bucket (int): The bucket index.
+
+    Returns:
+        float: The cutoff frequency in Hz.
+    """
+    return BUCKET_REFERENCE_FREQ * 2 ** (bucket / CUTOFF_BUCKETS_PER_OCTAVE)
+
+
+def random_cutoff(min_freq: float, max_freq: float) -> float:
+    """
+    Draw a random cutoff frequency, uniformly on the mel scale as audiomentations does.
+
+    Args:
+        min_freq (float): The minimum cutoff frequency.
+        max_freq (float): The maximum cutoff frequency.
+
+    Returns:
+        float: The cutoff frequency in Hz.
+    """
+    min_mel, max_mel = (1127 * math.log1p(freq / 700) for freq in (min_freq, max_freq))
+    return 700 * math.expm1(random.uniform(min_mel, max_mel) / 1127)
+
+
+def random_cutoffs(min_freq: float, max_freq: float, rng: np.random.Generator, size: int) -> ndarray:
+    """
+    Draw random cutoff frequencies for many clips at once, with the distribution of random_cutoff.
+
+    Args:
+        min_freq (float): The minimum cutoff frequency.
+        max_freq (float): The maximum cutoff frequency.
+        rng (np.random.Generator): Random generator used to draw the frequencies.
+        size (int): The number of frequencies.
+
+    Returns:
+        ndarray: The cutoff frequencies in Hz.
+    """
+    min_mel, max_mel = (1127 * math.log1p(freq / 700) for freq in (min_freq, max_freq))
+    return 700 * np.expm1(rng.uniform(min_mel, max_mel, size) / 1127)
+
+
+def random_order(zero_phase: bool = False) -> int:
+    """
+    Draw a random Butterworth filter order for a rolloff between 12 and 24 dB per octave.
+
+    Args:
+        zero_phase (bool, optional): Whether the filter is applied forwards and backwards,
+            which doubles its rolloff. Defaults to False.
+
+    Returns:
+        int: The filter order.
+    """
+    return random.randint(1, 2) if zero_phase else random.randint(2, 4)
+
+
+@lru_cache(maxsize=1024)
+def butter_sos(btype: str, bucket: int, order: int, sr: int) -> ndarray:
+    """
+    Design a Butterworth filter, cached per (filter type, cutoff bucket, order, sample rate).
+
+    Args:
+        btype (str): The filter type, "lowpass" or "highpass".
+        bucket (int): The cutoff frequency bucket.
+        order (int): The filter order.
+        sr (int): The sample rate of the audio.
+
+    Returns:
+        ndarray: Second-order sections of the filter.
+    """
+    # keep the cutoff below the Nyquist frequency, scipy does not accept higher frequencies
+    cutoff = min(bucket_freq(bucket), sr // 2 * 0.9999)
+    sos = butter(order, cutoff, btype=btype, fs=sr, output="sos")
+    sos.setflags(write=False)
+    return sos
+
+
+@lru_cache(maxsize=1024)
+def cascade(designs: tuple[tuple[str, int, int, int], ...]) -> tuple[ndarray, ndarray]:
+    """
+    Join Butterworth filters into one cascade, cached per sequence of filter designs.
+
+    Args:
+        designs (tuple[tuple[str, int, int, int], ...]): Arguments of butter_sos for every filter.
+
+    Returns:
+        tuple[ndarray, ndarray]: Second-order sections of the cascade and their steady state for a unit step.
+    """
+    sos = np.concatenate([butter_sos(*design) for design in designs])
+    # solving for the steady state costs more than filtering a short clip
+    return sos, sosfilt_zi(sos)
+
+
+def apply_sos(y: ndarray, sos: ndarray, zero_phase: bool = False, zi: ndarray | None = None) -> ndarray:
+    """
+    Apply a cascade of second-order sections in a single pass along the last axis.
+
+    Args:
+        y (ndarray): The audio waveform, or a batch of waveforms of shape (N, T).
+        sos (ndarray): Second-order sections of the filter.
+        zero_phase (bool, optional): Whether to filter forwards and backwards. Defaults to False.
+        zi (ndarray or None, optional): Steady state of the filter for a unit step,
+            computed if None. Defaults to None.
+
+    Returns:
+        ndarray: The filtered audio, with the data type of the input.
+    """
+    if zero_phase:
+        return sosfiltfilt(sos, y, axis=-1).astype(y.dtype, copy=False)
+    # start from the steady state of the first sample, as audiomentations does
+    if zi is None:
+        zi = sosfilt_zi(sos)
+    zi = zi[:, None, :] * y[None, :, :1] if y.ndim > 1 else zi * y[0]
+    filtered, _ = sosfilt(sos, y, axis=-1, zi=zi)
+    return filtered.astype(y.dtype, copy=False)
+
+
+class FilterStage:
+    """
+    Deferred low-pass and high-pass filters of an audio waveform.
+
+    Filters are collected as second-order sections instead of being applied one by one.
+    When both a low-pass and a high-pass filter are pending, their sections form one band-pass
+    cascade, which is applied with a single pass over the waveform.
+
+    Args:
+        zero_phase (bool, optional): Whether filters are applied forwards and backwards. Defaults to False.
+
+    Attributes:
+        designs (list[tuple[str, int, int, int]]): Designs of pending filters, as arguments of butter_sos.
+        zero_phase (bool): Whether filters are applied forwards and backwards.
+    """
+
+    def __init__(self, zero_phase: bool = False) -> None:
+        """
+        Initialize the FilterStage object.
+
+        Args:
+            zero_phase (bool, optional): Whether filters are applied forwards and backwards. Defaults to False.
+        """
+        self.designs: list[tuple[str, int, int, int]] = []
+        self.zero_phase = zero_phase
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether there are any filters waiting to be applied.
+        """
+        return bool(self.designs)
+
+    @property
+    def sos(self) -> ndarray:
+        """
+        Second-order sections of all pending filters, as one cascade.
+        """
+        return cascade(tuple(self.designs))[0]
+
+    def low_pass(self, cutoff: float, order: int, sr: int) -> None:
+        """
+        Add a low-pass filter.
+
+        Args:
+            cutoff (float): The cutoff frequency in Hz.
+            order (int): The filter order.
+            sr (int): The sample rate of the audio.
+        """
+        self.designs.append(("lowpass", cutoff_bucket(cutoff), order, sr))
+
+    def high_pass(self, cutoff: float, order: int, sr: int) -> None:
+        """
+        Add a high-pass filter.
+
+        Args:
+            cutoff (float): The cutoff frequency in Hz.
+            order (int): The filter order.
+            sr (int): The sample rate of the audio.
+        """
+        self.designs.append(("highpass", cutoff_bucket(cutoff), order, sr))
+
+    def apply(self, y: ndarray) -> ndarray:
+        """
+        Apply all pending filters to the audio in a single pass.
+
+        Args:
+            y (ndarray): The audio waveform.
+
+        Returns:
+            ndarray: The filtered audio waveform.
+        """
+        if not self.pending:
+            return y
+        sos, zi = cascade(tuple(self.designs))
+        return apply_sos(y, sos, zero_phase=self.zero_phase, zi=zi)
+
+
+def filter_batch(ys: ndarray, stages: list[FilterStage]) -> ndarray:
+    """
+    Apply pending filters of many clips at once.
+
+    Clips with the same filter cascade (which is common, since cutoffs are bucketed) are filtered
+    together with one call over a 2D array.
+
+    Args:
+        ys (ndarray): Batch of waveforms of shape (N, T).
+        stages (list[FilterStage]): The filter stage of every clip.
+
+    Returns:
+        ndarray: The filtered batch of waveforms.
+    """
+    groups: dict[tuple, list[int]] = {}
+    for index, stage in enumerate(stages):
+        if stage.pending:
+            key = (stage.zero_phase, tuple(stage.designs))
+            groups.setdefault(key, []).append(index)
+    result = ys.copy()
+    for key, indices in groups.items():
+        zero_phase, designs = key
+        sos, zi = cascade(designs)
+        result[indices] = apply_sos(ys[indices], sos, zero_phase=zero_phase, zi=zi)
+    return result
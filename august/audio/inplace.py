@@ -0,0 +1,99 @@
+import threading
+
+import numpy as np
+from numpy import ndarray
+
+# scratch buffers and random generators of the current thread, worker processes get their own
+_local = threading.local()
+
+
+def scratch(size: int, dtype: np.dtype) -> ndarray:
+    """
+    Get a scratch buffer of the current thread, reallocated only when a larger one is needed.
+
+    Args:
+        size (int): The number of elements.
+        dtype (np.dtype): The data type of the buffer.
+
+    Returns:
+        ndarray: A buffer of the given size, with undefined contents.
+    """
+    buffers = _local.__dict__.setdefault("buffers", {})
+    dtype = np.dtype(dtype)
+    if dtype not in buffers or len(buffers[dtype]) < size:
+        buffers[dtype] = np.empty(size, dtype=dtype)
+    return buffers[dtype][:size]
+
+
+def _rng() -> np.random.Generator:
+    """
+    Get the random generator of the current thread.
+
+    Returns:
+        np.random.Generator: The random generator.
+    """
+    if not hasattr(_local, "rng"):
+        _local.rng = np.random.default_rng()
+    return _local.rng
+
+
+def gain(y: ndarray, factor: float) -> None:
+    """
+    Scale the audio in place.
+
+    Args:
+        y (ndarray): The audio waveform.
+        factor (float): The gain factor, -1 inverts the polarity.
+    """
+    np.multiply(y, factor, out=y, casting="unsafe")
+
+
+def gaussian_noise(y: ndarray, amplitude: float) -> None:
+    """
+    Add Gaussian noise to the audio in place, drawing the noise into the scratch buffer.
+
+    Args:
+        y (ndarray): The audio waveform.
+        amplitude (float): The standard deviation of the noise.
+    """
+    noise = scratch(len(y), y.dtype)
+    _rng().standard_normal(dtype=noise.dtype, out=noise)
+    noise *= amplitude
+    y += noise
+
+
+def time_mask(y: ndarray, start: int, width: int, fade: int) -> None:
+    """
+    Silence a region of the audio in place, with linear fades on both sides.
+
+    Args:
+        y (ndarray): The audio waveform.
+        start (int): The first sample of the masked region.
+        width (int): The length of the masked region.
+        fade (int): The length of the fades, at most half of the region.
+    """
+    ramp = np.arange(fade, dtype=y.dtype) / max(fade, 1)
+    y[start : start + fade] *= 1 - ramp
+    y[start + fade : start + width - fade] = 0
+    y[start + width - fade : start + width] *= ramp
+
+
+def time_shift(y: ndarray, shift: int, fade: int) -> None:
+    """
+    Roll the audio in place through the scratch buffer, fading it in and out around the seam.
+
+    Args:
+        y (ndarray): The audio waveform.
+        shift (int): The shift in samples, negative values shift to the left.
+        fade (int): The length of the fades on both sides of the seam.
+    """
+    length = len(y)
+    seam = shift % length
+    if not seam:
+        return
+    buffer = scratch(length, y.dtype)
+    buffer[:] = y
+    y[:seam] = buffer[length - seam :]
+    y[seam:] = buffer[: length - seam]
+    start, end = max(seam - fade, 0), min(seam + fade, length)
+    y[start:end] *= np.abs(np.arange(start - seam, end - seam, dtype=y.dtype)) / fade
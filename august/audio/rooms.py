@@ -0,0 +1,221 @@
+import hashlib
+import os
+import random
+from functools import lru_cache
+from pathlib import Path
+
+import librosa
+import numpy as np
+import soundfile as sf
+from audiomentations import RoomSimulator
+from numpy import ndarray
+from scipy.signal import oaconvolve
+
+from august.utils.dirs import files_with_extensions
+
+# sample rate of simulated rooms when audio is loaded at its native sample rate
+DEFAULT_ROOM_SR = 22050
+# directory of banks created when no bank path is given, so that later runs load them instead of simulating rooms
+ROOM_BANK_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "august" / "rooms"
+
+
+class RoomBank:
+    """
+    A bank of room impulse responses, applied to audio by FFT convolution.
+
+    Simulating a room takes hundreds of milliseconds, so rooms are simulated once (or impulse responses
+    are loaded from WAV files) and every sample is convolved with a randomly chosen impulse response.
+    Banks are stored on disk as float16 arrays in a compressed .npz file.
+
+    Args:
+        irs (list[ndarray]): The impulse responses.
+        sr (int): The sample rate of the impulse responses.
+
+    Attributes:
+        irs (list[ndarray]): The float32 impulse responses.
+        sr (int): The sample rate of the impulse responses.
+    """
+
+    def __init__(self, irs: list[ndarray], sr: int) -> None:
+        """
+        Initialize the RoomBank object.
+
+        Args:
+            irs (list[ndarray]): The impulse responses.
+            sr (int): The sample rate of the impulse responses.
+
+        Raises:
+            ValueError: If there are no impulse responses.
+        """
+        if not irs:
+            raise ValueError("Room bank should contain at least one impulse response.")
+        self.irs = [np.asarray(ir, dtype=np.float32) for ir in irs]
+        self.sr = sr
+        self._resampled: dict[int, list[ndarray]] = {sr: self.irs}
+
+    def __len__(self) -> int:
+        return len(self.irs)
+
+    @classmethod
+    def simulate(cls, sr: int, size: int) -> "RoomBank":
+        """
+        Simulate random rooms with the default parameters of audiomentations.RoomSimulator.
+
+        Args:
+            sr (int): The sample rate of the impulse responses.
+            size (int): The number of rooms.
+
+        Returns:
+            RoomBank: The bank of simulated rooms.
+        """
+        simulator = RoomSimulator(p=1)
+        irs = []
+        for _ in range(size):
+            simulator.randomize_parameters(np.zeros(1, dtype=np.float32), sr)
+            irs.append(simulator.room.rir[0][0])
+        return cls(irs, sr)
+
+    @classmethod
+    def from_directory(cls, directory: str | Path, sr: int) -> "RoomBank":
+        """
+        Load impulse responses from WAV files in a directory.
+
+        Args:
+            directory (str or Path): The directory with impulse response WAV files.
+            sr (int): The sample rate to resample the impulse responses to.
+
+        Returns:
+            RoomBank: The bank of loaded impulse responses.
+        """
+        irs = []
+        for path in sorted(files_with_extensions(str(directory), (".wav", ".WAV"))):
+            ir, ir_sr = sf.read(path, dtype="float32", always_2d=True)
+            irs.append(librosa.resample(ir.mean(axis=1), orig_sr=ir_sr, target_sr=sr))
+        return cls(irs, sr)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "RoomBank":
+        """
+        Load a bank saved with RoomBank.save.
+
+        Args:
+            path (str or Path): The path to the .npz file.
+
+        Returns:
+            RoomBank: The loaded bank.
+        """
+        with np.load(path) as data:
+            return cls(np.split(data["irs"], data["offsets"][1:-1]), int(data["sr"]))
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the bank as concatenated float16 impulse responses in a compressed .npz file.
+
+        Args:
+            path (str or Path): The path to the .npz file.
+        """
+        offsets = np.cumsum([0] + [len(ir) for ir in self.irs])
+        irs = np.concatenate(self.irs).astype(np.float16)
+        # write to a temporary file first, so that other processes never load a partially written bank
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            np.savez_compressed(file, irs=irs, offsets=offsets, sr=self.sr)
+        os.replace(temporary_path, path)
+
+    def irs_at(self, sr: int) -> list[ndarray]:
+        """
+        Get the impulse responses at a sample rate, resampling them once per sample rate.
+
+        Args:
+            sr (int): The sample rate.
+
+        Returns:
+            list[ndarray]: The impulse responses.
+        """
+        if sr not in self._resampled:
+            self._resampled[sr] = [
+                librosa.resample(ir, orig_sr=self.sr, target_sr=sr).astype(np.float32) for ir in self.irs
+            ]
+        return self._resampled[sr]
+
+    def apply(self, y: ndarray, sr: int) -> ndarray:
+        """
+        Convolve the audio with a randomly chosen impulse response.
+
+        Args:
+            y (ndarray): The audio waveform.
+            sr (int): The sample rate of the audio.
+
+        Returns:
+            ndarray: The reverberated audio waveform, longer than the input by the length of the impulse response.
+        """
+        ir = random.choice(self.irs_at(sr))
+        return oaconvolve(y, ir.astype(y.dtype, copy=False)).astype(y.dtype, copy=False)
+
+
+def default_bank_path(sr: int, size: int, directory: str | Path | None = None) -> Path:
+    """
+    Get the path of the bank in ROOM_BANK_DIR for some settings.
+
+    Banks of simulated rooms are keyed by the sample rate and the number of rooms, banks of impulse responses
+    by the sample rate and the path, modification time and size of every WAV file of the directory,
+    so changed impulse responses never reuse a stale bank.
+
+    Args:
+        sr (int): The sample rate of the impulse responses.
+        size (int): The number of rooms to simulate.
+        directory (str or Path or None, optional): The directory with impulse response WAV files,
+            rooms are simulated if None. Defaults to None.
+
+    Returns:
+        Path: The path to the .npz file of the bank.
+    """
+    parts = [sr, size] if directory is None else [sr]
+    if directory is not None:
+        for path in sorted(files_with_extensions(str(directory), (".wav", ".WAV"))):
+            stat = os.stat(path)
+            parts += [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+    key = hashlib.sha1("\0".join(map(str, parts)).encode()).hexdigest()
+    return ROOM_BANK_DIR / f"rooms-{key}.npz"
+
+
+def prepare_room_bank(path: str | Path, sr: int, size: int, directory: str | Path | None = None) -> None:
+    """
+    Create a room bank file if it doesn't exist yet.
+
+    Args:
+        path (str or Path): The path to the .npz file of the bank.
+        sr (int): The sample rate of the impulse responses.
+        size (int): The number of rooms to simulate.
+        directory (str or Path or None, optional): The directory with impulse response WAV files,
+            rooms are simulated if None. Defaults to None.
+    """
+    if Path(path).exists():
+        return
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    bank = RoomBank.simulate(sr, size) if directory is None else RoomBank.from_directory(directory, sr)
+    bank.save(path)
+
+
+@lru_cache
+def get_room_bank(path: str | None, sr: int, size: int, directory: str | None = None) -> RoomBank:
+    """
+    Get the room bank of the current process, loading or creating it on first use.
+
+    Args:
+        path (str or None): The path to the .npz file of the bank, created if it doesn't exist.
+            The bank is kept only in memory if None.
+        sr (int): The sample rate of the impulse responses.
+        size (int): The number of rooms to simulate.
+        directory (str or None, optional): The directory with impulse response WAV files,
+            rooms are simulated if None. Defaults to None.
+
+    Returns:
+        RoomBank: The room bank.
+    """
+    if path is not None:
+        prepare_room_bank(path, sr, size, directory)
+        return RoomBank.load(path)
+    if directory is not None:
+        return RoomBank.from_directory(directory, sr)
+    return RoomBank.simulate(sr, size)
@@ -0,0 +1,318 @@
+import copy
+import random
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import soxr
+from numpy import ndarray
+from scipy.signal import oaconvolve, sosfilt, sosfilt_zi
+
+from august.audio import rooms, utils
+from august.audio.config import AugustAudioConfig
+from august.audio.decorators import AugustAudioStreamMark, mark_stream_augmentation
+from august.audio.filters import FilterStage, random_cutoff, random_order
+from august.mixins import ExecuteAugmentationMixin
+
+# fade in and out of time masks, as in audiomentations.TimeMask
+MASK_FADE_DURATION = 0.005
+
+
+class BlockOperation(ABC):
+    """
+    An operation applied to consecutive blocks of a stream, possibly carrying state between blocks.
+
+    Subclasses implement __call__ and override reset if they carry state.
+    """
+
+    def reset(self) -> None:
+        """
+        Reset the state carried between blocks, before processing a stream from the start.
+        """
+
+    @abstractmethod
+    def __call__(self, block: ndarray, start: int) -> ndarray:
+        """
+        Process a block.
+
+        Args:
+            block (ndarray): The block of samples.
+            start (int): The position of the first sample of the block in the stream.
+
+        Returns:
+            ndarray: The processed block, with the same length.
+        """
+
+
+class _Gain(BlockOperation):
+    def __init__(self, factor: float) -> None:
+        self.factor = factor
+
+    def __call__(self, block: ndarray, start: int) -> ndarray:
+        block *= self.factor
+        return block
+
+
+class _Noise(BlockOperation):
+    def __init__(self, amplitude: float) -> None:
+        self.amplitude = amplitude
+
+    def __call__(self, block: ndarray, start: int) -> ndarray:
+        block += self.amplitude * np.random.randn(len(block)).astype(block.dtype)
+        return block
+
+
+class _Mask(BlockOperation):
+    def __init__(self, t0: int, t: int, fade: int) -> None:
+        # gain envelope of the masked region, with linear fades on both sides
+        self.points = [t0, t0 + fade, t0 + t - fade, t0 + t]
+
+    def __call__(self, block: ndarray, start: int) -> ndarray:
+        if start + len(block) > self.points[0] and start < self.points[-1]:
+            positions = np.arange(start, start + len(block))
+            block *= np.interp(positions, self.points, [1, 0, 0, 1]).astype(block.dtype)
+        return block
+
+
+class _Filter(BlockOperation):
+    def __init__(self, sos: ndarray) -> None:
+        self.sos = sos
+        self.zi: ndarray | None = None
+
+    def reset(self) -> None:
+        self.zi = None
+
+    def __call__(self, block: ndarray, start: int) -> ndarray:
+        if self.zi is None:
+            # start from the steady state of the first sample, as filters of whole clips do
+            self.zi = sosfilt_zi(self.sos) * block[0]
+        filtered, self.zi = sosfilt(self.sos, block, zi=self.zi)
+        return filtered.astype(block.dtype, copy=False)
+
+
+class _Convolution(BlockOperation):
+    def __init__(self, ir: ndarray) -> None:
+        self.ir = ir
+        self.tail = np.zeros(0, dtype=ir.dtype)
+
+    def reset(self) -> None:
+        self.tail = np.zeros(0, dtype=self.ir.dtype)
+
+    def __call__(self, block: ndarray, start: int) -> ndarray:
+        # overlap-add, the tail of every block is added to the following ones
+        convolved = oaconvolve(block, self.ir.astype(block.dtype, copy=False))
+        convolved[: len(self.tail)] += self.tail
+        self.tail = convolved[len(block) :]
+        return convolved[: len(block)]
+
+
+class AugustAudioStream(ExecuteAugmentationMixin):
+    """
+    A class for augmenting long audio files block by block, with memory independent of the file length.
+
+    Augmentations are not applied immediately, they are collected as block operations and applied
+    to consecutive blocks read with soundfile while the augmented audio is written to the output file.
+    Only augmentations which can be applied block by block are supported: gain, polarity inversion,
+    noise, time masks, filters (with their state carried between blocks) and rooms (with reverberation
+    tails carried to the following blocks). Time shift, time stretch and pitch scale need the whole file.
+
+    Filters are never zero phase and reverberation tails past the end of the file are cut off,
+    so the output has the length of the input. If a segment duration is configured, only a random
+    window of the file is read.
+
+    Args:
+        audio_path (str or Path): The path to the input audio file, in a format readable by soundfile.
+        config (AugustAudioConfig, optional): Configuration settings for audio augmentation. Defaults to AugustAudioConfig().
+
+    Attributes:
+        audio_path (str or Path): The path to the input audio file.
+        config (AugustAudioConfig): The configuration settings for audio augmentation.
+        sr (int): The sample rate of the augmented audio.
+        length (int): The number of samples of the augmented audio.
+        operations (list[BlockOperation]): Operations applied to every block, in order.
+    """
+
+    _augmentations = AugustAudioStreamMark.augmentations
+
+    def __init__(self, audio_path: str | Path, config: AugustAudioConfig = AugustAudioConfig()) -> None:
+        """
+        Initialize the AugustAudioStream object.
+
+        Args:
+            audio_path (str or Path): The path to the input audio file, in a format readable by soundfile.
+            config (AugustAudioConfig, optional): Configuration settings for audio augmentation. Defaults to AugustAudioConfig().
+        """
+        info = sf.info(str(audio_path))
+        self.audio_path = audio_path
+        self.config = config
+        self._source_sr = info.samplerate
+        self._start, self._frames = 0, info.frames
+        if config.segment is not None:
+            self._start, self._frames = utils.random_segment(
+                info.frames, info.samplerate, *config.segment
+            )
+        self.sr = config.sample_rate or info.samplerate
+        self.length = round(self._frames * self.sr / info.samplerate)
+        self.operations: list[BlockOperation] = []
+        self._filters = FilterStage()
+
+    def copy(self) -> "AugustAudioStream":
+        """
+        Create a copy of the stream without pending augmentations.
+
+        Returns:
+            AugustAudioStream: The copy, sharing configuration with this object.
+        """
+        clone = copy.copy(self)
+        clone.operations = []
+        clone._filters = FilterStage()
+        return clone
+
+    def augment(self) -> None:
+        """
+        Execute augmentations and collect pending filters into one block operation.
+        """
+        super().augment()
+        self._apply_filters()
+
+    def _apply_filters(self) -> None:
+        """
+        Add pending low-pass and high-pass filters as a single block operation.
+        """
+        if self._filters.pending:
+            self.operations.append(_Filter(self._filters.sos))
+            self._filters = FilterStage()
+
+    def _append(self, operation: BlockOperation) -> None:
+        """
+        Add a block operation after pending filters.
+
+        Args:
+            operation (BlockOperation): The operation.
+        """
+        self._apply_filters()
+        self.operations.append(operation)
+
+    def blocks(self):
+        """
+        Iterate over blocks of the augmented audio.
+
+        Yields:
+            ndarray: Consecutive blocks of augmented mono samples.
+        """
+        for operation in self.operations:
+            operation.reset()
+        resampler = None
+        if self.sr != self._source_sr:
+            res_type = self.config.res_type
+            quality = res_type.removeprefix("soxr_").upper() if res_type.startswith("soxr_") else "HQ"
+            resampler = soxr.ResampleStream(
+                self._source_sr, self.sr, 1, dtype=self.config.dtype, quality=quality
+            )
+        start = 0
+        blocks = sf.blocks(
+            str(self.audio_path),
+            blocksize=self.config.block_size,
+            start=self._start,
+            frames=self._frames,
+            dtype=self.config.dtype,
+            always_2d=True,
+        )
+        source_block = next(blocks, None)
+        while source_block is not None:
+            next_block = next(blocks, None)
+            block = source_block.mean(axis=1, dtype=self.config.dtype)
+            if resampler is not None:
+                block = resampler.resample_chunk(block, last=next_block is None)
+            source_block = next_block
+            # the resampler may buffer a whole block
+            if not len(block):
+                continue
+            for operation in self.operations:
+                block = operation(block, start)
+            start += len(block)
+            yield block
+
+    def save(self, filename: str | Path, format: str = "wav") -> None:
+        """
+        Save the augmented audio to a file, writing it block by block.
+
+        Args:
+            filename (str or Path): The path to the file where the augmented audio will be saved.
+            format (str, optional): The file format to use for saving the audio. Defaults to "wav".
+        """
+        with sf.SoundFile(filename, "w", samplerate=self.sr, channels=1, format=format) as file:
+            for block in self.blocks():
+                file.write(block)
+
+    @mark_stream_augmentation
+    def invert_polarity(self) -> None:
+        """
+        Invert the polarity of the audio if the random probability is within the configured range.
+        """
+        if random.random() < self.config.invert_polarity_p:
+            # scaling commutes with filters, so it doesn't end pending filters
+            self.operations.append(_Gain(-1.0))
+
+    @mark_stream_augmentation
+    def random_gain(self) -> None:
+        """
+        Apply random gain adjustments to the audio if the random probability is within the configured range.
+        """
+        if random.random() < self.config.random_gain_p:
+            factor = random.uniform(self.config.min_gain_factor, self.config.max_gain_factor)
+            self.operations.append(_Gain(factor))
+
+    @mark_stream_augmentation
+    def gaussian_noise(self) -> None:
+        """
+        Add Gaussian noise to the audio if the random probability is within the configured range.
+        """
+        if random.random() < self.config.gaussian_noise_p:
+            amplitude = random.uniform(self.config.min_gain_amplitude, self.config.max_gain_amplitude)
+            self._append(_Noise(amplitude))
+
+    @mark_stream_augmentation
+    def time_mask(self) -> None:
+        """
+        Apply time masking to the audio if the random probability is within the configured range.
+        """
+        if random.random() < self.config.time_mask_p:
+            min_length = int(self.length * self.config.min_mask_part)
+            t = random.randint(min_length, int(self.length * self.config.max_mask_part))
+            t0 = random.randint(0, self.length - t)
+            fade = min(round(self.sr * MASK_FADE_DURATION), t // 2)
+            self._append(_Mask(t0, t, fade))
+
+    @mark_stream_augmentation
+    def low_pass_filter(self) -> None:
+        """
+        Apply a low-pass filter to the audio if the random probability is within the configured range.
+        """
+        if random.random() < self.config.low_pass_filter_p:
+            cutoff = random_cutoff(self.config.min_low_pass_freq, self.config.max_low_pass_freq)
+            self._filters.low_pass(cutoff, random_order(), self.sr)
+
+    @mark_stream_augmentation
+    def high_pass_filter(self) -> None:
+        """
+        Apply a high-pass filter to the audio if the random probability is within the configured range.
+        """
+        if random.random() < self.config.high_pass_filter_p:
+            cutoff = random_cutoff(self.config.min_high_pass_freq, self.config.max_high_pass_freq)
+            self._filters.high_pass(cutoff, random_order(), self.sr)
+
+    @mark_stream_augmentation
+    def room(self) -> None:
+        """
+        Apply room simulation to the audio if the random probability is within the configured range.
+        """
+        if random.random() < self.config.room_p:
+            bank = rooms.get_room_bank(
+                self.config.room_bank_path,
+                self.config.sample_rate or rooms.DEFAULT_ROOM_SR,
+                self.config.room_bank_size,
+                self.config.room_ir_dir,
+            )
+            self._append(_Convolution(random.choice(bank.irs_at(self.sr))))
@@ -0,0 +1,66 @@
+import numpy as np
+
+from ..batch import AugustAudioBatch
+from ..config import AugustAudioConfig
+from ..filters import FilterStage
+from ..streaming import _Mask
+
+SR = 16000
+
+
+def _clips() -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    return [rng.standard_normal(length).astype(np.float32) * 0.1 for length in (8000, 12000, 4000)]
+
+
+def test_shift_and_mask_match_single_clip():
+    clips = _clips()
+    batch = AugustAudioBatch.from_clips(clips, SR)
+    batch._shift(np.array([1000, 0, -500]))
+    batch._mask(np.array([0, 2000, 100]), np.array([0, 3000, 50]))
+
+    first, second, third = batch.clips()
+    # away from the faded seam, shifting rolls the clip
+    assert np.array_equal(first[1100:], np.roll(clips[0], 1000)[1100:])
+    assert np.allclose(second, _Mask(2000, 3000, 80)(clips[1].copy(), 0))
+    expected = _Mask(100, 50, 25)(np.roll(clips[2], -500), 0)
+    assert np.allclose(third[:3400], expected[:3400])
+    assert not batch.ys[2, 4000:].any()
+
+
+def test_filters_match_single_clip():
+    clips = _clips()
+    batch = AugustAudioBatch.from_clips(clips, SR)
+    batch._filters[0].low_pass(3000, 4, SR)
+    batch._filters[2].low_pass(3000, 4, SR)
+    batch._filters[2].high_pass(200, 2, SR)
+
+    for index, (clip, augmented) in enumerate(zip(clips, batch.clips())):
+        stage = FilterStage()
+        stage.low_pass(3000, 4, SR)
+        if index == 2:
+            stage.high_pass(200, 2, SR)
+        expected = stage.apply(clip) if index != 1 else clip
+        assert np.allclose(augmented, expected, atol=1e-6)
+    assert not batch.ys[2, 4000:].any()
+
+
+def test_variants_share_clip_until_augmented():
+    y = _clips()[0]
+    config = AugustAudioConfig(
+        time_shift_p=0,
+        invert_polarity_p=0,
+        random_gain_p=1,
+        gaussian_noise_p=1,
+        time_mask_p=1,
+        low_pass_filter_p=1,
+        high_pass_filter_p=1,
+    )
+    batch = AugustAudioBatch.variants(y, SR, 16, config=config, rng=np.random.default_rng(1))
+    assert batch.ys.strides[0] == 0
+    batch.augment()
+
+    assert batch.ys.shape == (16, len(y))
+    assert batch.ys.dtype == np.float32
+    assert len({row.tobytes() for row in batch.ys}) == 16
+    assert not np.shares_memory(batch.ys, y)
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import soundfile as sf
+
+from .. import utils
+from ..cache import DecodeCache
+
+SR = 16000
+
+
+def _load(path, cache, **kwargs):
+    return utils.load(path, sample_rate=None, res_type="soxr_hq", dtype="float32", cache=cache, **kwargs)
+
+
+def test_decoded_audio_is_cached(tmp_path):
+    # AIFF stands in for MP3 and M4A, it is not read directly but decoded by librosa without ffmpeg
+    sf.write(tmp_path / "audio.aiff", np.random.default_rng(0).standard_normal(SR) * 0.1, SR)
+    cache = DecodeCache(tmp_path / "cache", 10**9)
+
+    decoded, sr = _load(tmp_path / "audio.aiff", cache)
+    cached, cached_sr = _load(tmp_path / "audio.aiff", cache)
+    assert isinstance(cached, np.memmap)
+    assert cached_sr == sr == SR
+    assert np.array_equal(cached, decoded)
+
+    segment, _ = _load(tmp_path / "audio.aiff", cache, segment=(0.5, None))
+    assert len(segment) == SR // 2
+
+    # a changed file is decoded again
+    os.utime(tmp_path / "audio.aiff", ns=(0, 0))
+    _load(tmp_path / "audio.aiff", cache)
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 2
+
+
+def test_int16_entries(tmp_path):
+    y = np.random.default_rng(0).uniform(-1, 1, SR).astype(np.float32)
+    cache = DecodeCache(tmp_path, 10**9, dtype="int16")
+    cache.put("key", y, SR)
+
+    cached, sr = cache.get("key", "float32")
+    assert sr == SR
+    assert cached.dtype == np.float32
+    assert np.abs(cached - y).max() <= 1 / 32768
+
+
+def test_evict_least_recently_used(tmp_path):
+    # three entries with their .npy headers
+    cache = DecodeCache(tmp_path, 3 * (SR * 4 + 128))
+    for index, key in enumerate("abcd"):
+        cache.put(key, np.zeros(SR, dtype=np.float32), SR)
+        os.utime(tmp_path / f"{key}.npy", ns=(index * 10**9, index * 10**9))
+    cache.get("a", "float32")
+    cache.evict()
+
+    # samples and sample rates of evicted entries are removed together
+    expected = ["a.npy", "a.sr", "c.npy", "c.sr", "d.npy", "d.sr"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == expected
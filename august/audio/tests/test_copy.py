@@ -0,0 +1,38 @@
+import numpy as np
+import soundfile as sf
+
+from ..audio import AugustAudio
+from ..config import AugustAudioConfig
+
+SR = 16000
+
+
+def test_copies_are_independent(tmp_path):
+    y = (np.random.default_rng(0).standard_normal(SR * 2) * 0.1).astype(np.float32)
+    sf.write(tmp_path / "audio.wav", y, SR, subtype="FLOAT")
+    config = AugustAudioConfig(
+        sample_rate=None,
+        time_shift_p=0,
+        time_stretch_p=1,
+        invert_polarity_p=0,
+        pitch_scale_p=0,
+        random_gain_p=1,
+        gaussian_noise_p=1,
+        time_mask_p=0,
+        low_pass_filter_p=1,
+        high_pass_filter_p=0,
+        room_p=0,
+    )
+    source = AugustAudio(tmp_path / "audio.wav", config)
+
+    first, second = source.copy(), source.copy()
+    first.augment()
+    assert not np.array_equal(first.y, y)
+    assert np.array_equal(source.y, y)
+    assert np.array_equal(second.y, y)
+
+    second.augment()
+    augmented = first.y.copy()
+    source.augment()
+    assert np.array_equal(first.y, augmented)
+    assert not np.shares_memory(first.y, second.y) and not np.shares_memory(first.y, source.y)
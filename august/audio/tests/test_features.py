@@ -0,0 +1,74 @@
+import numpy as np
+import soundfile as sf
+
+from .. import features
+from ..audio import AugustAudio
+from ..config import AugustAudioConfig
+
+SR = 16000
+
+
+def _config(**kwargs) -> AugustAudioConfig:
+    probabilities = (
+        "time_shift_p",
+        "time_stretch_p",
+        "invert_polarity_p",
+        "pitch_scale_p",
+        "random_gain_p",
+        "gaussian_noise_p",
+        "time_mask_p",
+        "frequency_mask_p",
+        "low_pass_filter_p",
+        "high_pass_filter_p",
+        "room_p",
+    )
+    return AugustAudioConfig(sample_rate=None, **{**dict.fromkeys(probabilities, 0), **kwargs})
+
+
+def test_masks_are_applied_to_spectrogram(tmp_path):
+    y = (np.random.default_rng(0).standard_normal(SR * 2) * 0.1).astype(np.float32)
+    sf.write(tmp_path / "audio.wav", y, SR, subtype="FLOAT")
+    config = _config(output_format="npy", n_mels=64, time_mask_p=1, frequency_mask_p=1)
+    audio = AugustAudio(tmp_path / "audio.wav", config)
+    audio.augment()
+
+    # the waveform is not masked
+    assert np.array_equal(audio.y, y)
+    expected = features.log_mel(y, SR, n_fft=2048, hop_length=512, n_mels=64)
+    masked = audio.features != expected
+    assert masked.any(axis=1).all() and masked.any(axis=0).all()
+    assert masked.all(axis=0).any() and masked.all(axis=1).any()
+
+    audio.save(tmp_path / "0_audio.wav")
+    assert np.array_equal(np.load(tmp_path / "0_audio.npy"), audio.features)
+
+
+def test_save_npz(tmp_path):
+    sf.write(tmp_path / "audio.wav", np.zeros(SR, dtype=np.float32), SR)
+    audio = AugustAudio(tmp_path / "audio.wav", _config(output_format="npz"))
+    audio.augment()
+    audio.save(tmp_path / "0_audio.wav")
+
+    with np.load(tmp_path / "0_audio.npz") as data:
+        assert data["features"].shape == (80, SR // 512 + 1)
+        assert data["sr"] == SR
+
+
+def test_narrow_masks_mask_one_band_and_frame(tmp_path):
+    y = (np.random.default_rng(0).standard_normal(SR * 2) * 0.1).astype(np.float32)
+    sf.write(tmp_path / "audio.wav", y, SR, subtype="FLOAT")
+    config = _config(
+        output_format="npy",
+        n_mels=64,
+        time_mask_p=1,
+        frequency_mask_p=1,
+        min_mask_part=0,
+        max_mask_part=0.001,
+        min_frequency_mask_part=0,
+        max_frequency_mask_part=0.001,
+    )
+    audio = AugustAudio(tmp_path / "audio.wav", config)
+    audio.augment()
+
+    masked = audio.features != features.log_mel(y, SR, n_fft=2048, hop_length=512, n_mels=64)
+    assert masked.all(axis=0).sum() == 1 and masked.all(axis=1).sum() == 1
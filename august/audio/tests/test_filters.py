@@ -0,0 +1,42 @@
+import numpy as np
+from audiomentations import HighPassFilter, LowPassFilter
+
+from ..filters import FilterStage, bucket_freq, cutoff_bucket, filter_batch
+
+SR = 22050
+
+
+def _audio() -> np.ndarray:
+    return np.random.default_rng(0).standard_normal(SR).astype(np.float32) * 0.1
+
+
+def test_band_matches_separate_filters():
+    y = _audio()
+    stage = FilterStage()
+    stage.low_pass(3000, 4, SR)
+    stage.high_pass(200, 2, SR)
+
+    low_cutoff, high_cutoff = bucket_freq(cutoff_bucket(3000)), bucket_freq(cutoff_bucket(200))
+    low_pass = LowPassFilter(
+        min_cutoff_freq=low_cutoff, max_cutoff_freq=low_cutoff, min_rolloff=24, max_rolloff=24, p=1
+    )
+    high_pass = HighPassFilter(
+        min_cutoff_freq=high_cutoff, max_cutoff_freq=high_cutoff, min_rolloff=12, max_rolloff=12, p=1
+    )
+    expected = high_pass(low_pass(y, SR), SR)
+
+    filtered = stage.apply(y)
+    assert filtered.dtype == np.float32
+    assert np.allclose(filtered, expected, atol=1e-6)
+
+
+def test_batch_matches_single_clips():
+    ys = np.stack([_audio(), _audio()[::-1], _audio() * 2])
+    stages = [FilterStage() for _ in ys]
+    stages[0].low_pass(1000, 2, SR)
+    stages[1].low_pass(1000, 2, SR)
+    stages[1].high_pass(100, 3, SR)
+
+    filtered = filter_batch(ys, stages)
+    for y, stage, result in zip(ys, stages, filtered):
+        assert np.allclose(result, stage.apply(y), atol=1e-6)
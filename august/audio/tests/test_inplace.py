@@ -0,0 +1,77 @@
+import tracemalloc
+
+import numpy as np
+import soundfile as sf
+
+from .. import inplace
+from ..audio import AugustAudio
+from ..config import AugustAudioConfig
+from ..streaming import _Mask
+
+SR = 16000
+
+OFF = {
+    "time_shift_p": 0,
+    "time_stretch_p": 0,
+    "invert_polarity_p": 0,
+    "pitch_scale_p": 0,
+    "random_gain_p": 0,
+    "gaussian_noise_p": 0,
+    "time_mask_p": 0,
+    "low_pass_filter_p": 0,
+    "high_pass_filter_p": 0,
+    "room_p": 0,
+}
+
+
+def _write(path) -> np.ndarray:
+    y = (np.random.default_rng(0).standard_normal(SR * 5) * 0.1).astype(np.float32)
+    sf.write(path, y, SR, subtype="FLOAT")
+    return y
+
+
+def test_shift_and_mask_match_reference():
+    y = np.random.default_rng(1).standard_normal(SR).astype(np.float32)
+
+    shifted = y.copy()
+    inplace.time_shift(shifted, -3000, 80)
+    assert np.array_equal(shifted[:12900], np.roll(y, -3000)[:12900])
+
+    masked = y.copy()
+    inplace.time_mask(masked, 2000, 5000, 80)
+    assert np.allclose(masked, _Mask(2000, 5000, 80)(y.copy(), 0))
+    assert masked.dtype == np.float32
+
+
+def test_copies_share_waveform_until_changed(tmp_path):
+    y = _write(tmp_path / "audio.wav")
+    source = AugustAudio(
+        tmp_path / "audio.wav", AugustAudioConfig(sample_rate=None, in_place=True, **OFF)
+    )
+
+    unchanged = source.copy()
+    unchanged.augment()
+    assert np.shares_memory(unchanged.y, source.y)
+
+    changed = source.copy()
+    changed.config = source.config.model_copy(update={"random_gain_p": 1})
+    changed.augment()
+    assert not np.shares_memory(changed.y, source.y)
+    assert np.array_equal(source.y, y)
+
+
+def test_peak_memory(tmp_path):
+    _write(tmp_path / "audio.wav")
+    enabled = ("time_shift_p", "invert_polarity_p", "random_gain_p", "gaussian_noise_p", "time_mask_p")
+    config = AugustAudioConfig(sample_rate=None, in_place=True, **{**OFF, **dict.fromkeys(enabled, 1)})
+    source = AugustAudio(tmp_path / "audio.wav", config)
+
+    tracemalloc.start()
+    augmented = source.copy()
+    augmented.augment()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert augmented.y.dtype == np.float32
+    # the copy of the clip and the scratch buffer
+    assert peak < 2.2 * source.y.nbytes
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from ...utils.dirs import files_with_extensions
+from .. import utils
+
+SR = 16000
+
+
+def test_load_segment(tmp_path):
+    y = np.random.default_rng(0).standard_normal(SR * 4).astype(np.float32) * 0.1
+    sf.write(tmp_path / "audio.wav", y, SR, subtype="FLOAT")
+
+    for _ in range(5):
+        segment, sr = utils.load(
+            tmp_path / "audio.wav", sample_rate=None, res_type="soxr_hq", dtype="float32", segment=(1, 2)
+        )
+        assert sr == SR
+        assert SR <= len(segment) <= 2 * SR
+        start = int(np.flatnonzero(y == segment[0])[0])
+        assert np.array_equal(segment, y[start : start + len(segment)])
+
+
+def test_segment_longer_than_file():
+    assert utils.random_segment(100, SR, 10) == (0, 100)
+
+
+def test_soundfile_formats_are_read_directly(tmp_path, monkeypatch):
+    y = np.random.default_rng(0).standard_normal(SR).astype(np.float32) * 0.1
+    for extension in (".flac", ".ogg"):
+        sf.write(tmp_path / f"audio{extension}", y, SR)
+    monkeypatch.setattr(utils.librosa, "load", None)
+
+    for extension in (".flac", ".ogg"):
+        audio, sr = utils.load(
+            tmp_path / f"audio{extension}", sample_rate=None, res_type="soxr_hq", dtype="float32"
+        )
+        assert sr == SR
+        assert audio.dtype == np.float32 and audio.shape == y.shape
+        resampled, sr = utils.load(
+            tmp_path / f"audio{extension}", sample_rate=SR // 2, res_type="soxr_hq", dtype="float32"
+        )
+        assert sr == SR // 2 and len(resampled) == len(y) // 2
+
+
+def test_every_format_is_selected(tmp_path):
+    for name in ("a.wav", "b.flac", "c.ogg", "d.mp3", "e.m4a", "f.txt"):
+        (tmp_path / name).touch()
+
+    selected = {Path(path).name for path in files_with_extensions(str(tmp_path), utils.AUDIO_EXTENSIONS)}
+    assert selected == {"a.wav", "b.flac", "c.ogg", "d.mp3", "e.m4a"}
+    streamed = {
+        Path(path).name for path in files_with_extensions(str(tmp_path), utils.SOUNDFILE_EXTENSIONS)
+    }
+    assert streamed == {"a.wav", "b.flac", "c.ogg"}
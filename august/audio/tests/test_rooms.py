@@ -0,0 +1,58 @@
+import numpy as np
+import soundfile as sf
+
+from ..rooms import ROOM_BANK_DIR, RoomBank, default_bank_path, get_room_bank
+
+SR = 16000
+
+
+def _irs() -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    return [
+        rng.standard_normal(length).astype(np.float32) * np.exp(-np.arange(length) / 200)
+        for length in (800, 1200)
+    ]
+
+
+def test_apply_matches_convolution():
+    y = np.random.default_rng(1).standard_normal(SR).astype(np.float32)
+    bank = RoomBank(_irs()[:1], SR)
+
+    reverberated = bank.apply(y, SR)
+    assert reverberated.dtype == np.float32
+    assert np.allclose(reverberated, np.convolve(y, bank.irs[0]), atol=1e-4)
+
+
+def test_save_and_load(tmp_path):
+    bank = RoomBank(_irs(), SR)
+    bank.save(tmp_path / "rooms.npz")
+    loaded = RoomBank.load(tmp_path / "rooms.npz")
+
+    assert loaded.sr == SR
+    for ir, loaded_ir in zip(bank.irs, loaded.irs):
+        assert loaded_ir.shape == ir.shape
+        assert np.allclose(loaded_ir, ir, atol=1e-2)
+
+
+def test_bank_from_directory(tmp_path):
+    for index, ir in enumerate(_irs()):
+        sf.write(tmp_path / f"{index}.wav", ir / np.abs(ir).max(), SR * 2)
+
+    bank = get_room_bank(str(tmp_path / "rooms.npz"), SR, 4, str(tmp_path))
+    assert len(bank) == 2
+    assert (tmp_path / "rooms.npz").exists()
+    assert [len(ir) for ir in bank.irs] == [400, 600]
+
+
+def test_default_bank_path_is_keyed_by_settings(tmp_path):
+    path = default_bank_path(SR, 4)
+    assert path.parent == ROOM_BANK_DIR
+    assert default_bank_path(SR, 4) == path
+    assert default_bank_path(SR * 2, 4) != path
+    assert default_bank_path(SR, 8) != path
+
+    sf.write(tmp_path / "0.wav", _irs()[0], SR)
+    directory_path = default_bank_path(SR, 4, tmp_path)
+    assert default_bank_path(SR, 8, tmp_path) == directory_path
+    sf.write(tmp_path / "1.wav", _irs()[1], SR)
+    assert default_bank_path(SR, 4, tmp_path) != directory_path
@@ -0,0 +1,68 @@
+import tracemalloc
+
+import numpy as np
+import soundfile as sf
+from scipy.signal import oaconvolve
+
+from ..config import AugustAudioConfig
+from ..filters import FilterStage
+from ..streaming import AugustAudioStream, _Convolution, _Filter, _Mask
+
+SR = 16000
+
+
+def _write(path, seconds: int) -> np.ndarray:
+    y = (np.random.default_rng(0).standard_normal(SR * seconds) * 0.1).astype(np.float32)
+    sf.write(path, y, SR, subtype="FLOAT")
+    return y
+
+
+def test_blocks_match_whole_clip(tmp_path):
+    y = _write(tmp_path / "audio.wav", 5)
+    stream = AugustAudioStream(
+        tmp_path / "audio.wav", AugustAudioConfig(sample_rate=None, block_size=3000)
+    )
+    stage = FilterStage()
+    stage.low_pass(3000, 4, SR)
+    stage.high_pass(100, 2, SR)
+    ir = np.random.default_rng(1).standard_normal(2000).astype(np.float32) * 0.01
+    stream.operations = [_Filter(stage.sos), _Convolution(ir), _Mask(20000, 10000, 80)]
+
+    expected = oaconvolve(stage.apply(y), ir)[: len(y)]
+    expected[20000:30000] *= np.interp(
+        np.arange(20000, 30000), [20000, 20080, 29920, 30000], [1, 0, 0, 1]
+    )
+    assert np.allclose(np.concatenate(list(stream.blocks())), expected, atol=1e-5)
+
+
+def test_memory_does_not_depend_on_length(tmp_path):
+    _write(tmp_path / "audio.wav", 60)
+    config = AugustAudioConfig(
+        sample_rate=8000,
+        block_size=16384,
+        gaussian_noise_p=1,
+        time_mask_p=1,
+        low_pass_filter_p=1,
+        room_p=0,
+    )
+    stream = AugustAudioStream(tmp_path / "audio.wav", config)
+    stream.augment()
+
+    tracemalloc.start()
+    stream.save(tmp_path / "augmented.wav")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert sf.info(tmp_path / "augmented.wav").frames == stream.length
+    # far below the 3.84 MB of the whole decoded float32 file
+    assert peak < SR * 60 * 4 / 4
+
+
+def test_segment(tmp_path):
+    y = _write(tmp_path / "audio.wav", 5)
+    config = AugustAudioConfig(sample_rate=None, block_size=3000, min_segment_duration=1.5)
+    stream = AugustAudioStream(tmp_path / "audio.wav", config)
+
+    assert stream.length == SR * 1.5
+    segment = np.concatenate(list(stream.blocks()))
+    assert np.array_equal(segment, y[stream._start : stream._start + stream.length])
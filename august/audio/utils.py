@@ -1,10 +1,11 @@
 import random
+from pathlib import Path
 
 import librosa
 import numpy as np
+import soundfile as sf
 from audiomentations import (
     AddGaussianNoise,
-    ApplyImpulseResponse,
     Compose,
     HighPassFilter,
     LowPassFilter,
@@ -16,21 +17,124 @@ from numpy import ndarray
 from pydub import AudioSegment
 from pydub.playback import play
 
+from august.audio import rooms, wsola
+from august.audio.cache import DecodeCache
 
-# TODO: add util to download echoes and implement impulse response
-def impulse_response(y: ndarray, sr: int):
+# formats decoded directly by soundfile, without the audioread fallback of librosa
+SOUNDFILE_EXTENSIONS = (".wav", ".flac", ".ogg")
+# all formats of audio files, the others are decoded by librosa through audioread and ffmpeg
+AUDIO_EXTENSIONS = SOUNDFILE_EXTENSIONS + (".mp3", ".m4a")
+
+
+def random_segment(
+    frames: int, sr: int, min_duration: float, max_duration: float | None = None
+) -> tuple[int, int]:
     """
-    Apply impulse response augmentation to the audio.
+    Draw a random window of an audio file.
+
+    Args:
+        frames (int): The number of frames of the file.
+        sr (int): The sample rate of the file.
+        min_duration (float): The minimum duration of the window in seconds.
+        max_duration (float or None, optional): The maximum duration of the window in seconds,
+            the minimum duration is used if None. Defaults to None.
+
+    Returns:
+        tuple[int, int]: The first frame and the number of frames of the window,
+        the whole file if it is shorter than the window.
+    """
+    duration = random.uniform(min_duration, max_duration) if max_duration is not None else min_duration
+    length = min(frames, round(duration * sr))
+    return random.randint(0, frames - length), length
+
+
+def load(
+    audio_path: str | Path,
+    *,
+    sample_rate: int | None,
+    res_type: str,
+    dtype: str,
+    segment: tuple[float, float | None] | None = None,
+    cache: DecodeCache | None = None,
+) -> tuple[ndarray, int]:
+    """
+    Load an audio file as a mono waveform, resampling it at most once.
+
+    WAV, FLAC and Ogg files are read directly with soundfile. If a segment duration is given, only
+    a random window of the file is read, WAV, FLAC and Ogg files are seeked to the window instead of
+    being decoded from the start.
+
+    Other formats are decoded by librosa, through audioread and ffmpeg for formats not supported by
+    soundfile. If a cache is given, they are decoded once, the whole decoded file is cached and windows
+    are cut from the memory-mapped cache entry.
+
+    Args:
+        audio_path (str or Path): The path to the input audio file.
+        sample_rate (int or None): The sample rate to resample to, None keeps the native sample rate.
+        res_type (str): The resampler used by librosa.resample.
+        dtype (str): The data type of the waveform, "float32" or "float64".
+        segment (tuple[float, float or None] or None, optional): The minimum and maximum duration
+            of a random window in seconds, the whole file is loaded if None. Defaults to None.
+        cache (DecodeCache or None, optional): The cache of decoded audio of formats other than
+            WAV, FLAC and Ogg, not used if None. Defaults to None.
+
+    Returns:
+        tuple[ndarray, int]: The audio waveform and its sample rate, read-only if it is loaded from the cache.
+    """
+    if cache is not None and not str(audio_path).lower().endswith(SOUNDFILE_EXTENSIONS):
+        key = cache.key(audio_path, sample_rate=sample_rate, res_type=res_type)
+        cached = cache.get(key, dtype)
+        if cached is None:
+            y, sr = librosa.load(audio_path, sr=sample_rate, res_type=res_type, dtype=dtype)
+            cache.put(key, y, int(sr))
+            cached = y, int(sr)
+        y, sr = cached
+        if segment is not None:
+            start, length = random_segment(len(y), sr, *segment)
+            y = y[start : start + length]
+        return y, sr
+    if not str(audio_path).lower().endswith(SOUNDFILE_EXTENSIONS):
+        offset, duration = 0.0, None
+        if segment is not None:
+            native_sr = librosa.get_samplerate(audio_path)
+            frames = round(librosa.get_duration(path=audio_path) * native_sr)
+            start, length = random_segment(frames, native_sr, *segment)
+            offset, duration = start / native_sr, length / native_sr
+        y, sr = librosa.load(
+            audio_path, sr=sample_rate, res_type=res_type, dtype=dtype, offset=offset, duration=duration
+        )
+        return y, int(sr)
+    start, length = 0, -1
+    if segment is not None:
+        info = sf.info(str(audio_path))
+        start, length = random_segment(info.frames, info.samplerate, *segment)
+    y, sr = sf.read(audio_path, frames=length, start=start, dtype=dtype, always_2d=False)
+    if y.ndim > 1:
+        y = y.mean(axis=1, dtype=dtype)
+    if sample_rate is not None and sample_rate != sr:
+        y = librosa.resample(y, orig_sr=sr, target_sr=sample_rate, res_type=res_type)
+        sr = sample_rate
+    return y, int(sr)
+
+
+def impulse_response(y: ndarray, sr: int, *, directory: str, p: float) -> ndarray:
+    """
+    Apply impulse response augmentation to the audio, with impulse responses loaded from WAV files.
+
+    Impulse responses are loaded once per process and applied by FFT convolution.
 
     Args:
         y (ndarray): The audio waveform.
         sr (int): The sample rate of the audio.
+        directory (str): The directory with impulse response WAV files.
+        p (float): The probability of applying an impulse response.
 
     Returns:
-        ndarray: The augmented audio waveform.
+        ndarray: The augmented audio waveform if the condition is met, otherwise the original audio.
     """
-    convert = Compose([ApplyImpulseResponse()])
-    return convert(samples=y, sample_rate=sr)
+    if random.random() < p:
+        return rooms.get_room_bank(None, sr, 0, directory).apply(y, sr)
+    return y
 
 
 def _invert_polarity(y: ndarray) -> ndarray:
@@ -58,7 +162,91 @@ def _time_stretch(y: ndarray, sr: int, factor: float) -> ndarray:
     Returns:
         ndarray: The time-stretched audio waveform.
     """
-    return librosa.effects.time_stretch(y, rate=factor)
+    return time_pitch(y, sr, rate=factor)
+
+
+class SpectrumCache:
+    """
+    Lazily computed STFT of a source waveform, shared by all variants of the same clip.
+
+    The STFT takes about four times the memory of a float32 waveform, so it is only kept
+    for the source clip, not for intermediate results.
+
+    Attributes:
+        spectrum (ndarray or None): The STFT of the source waveform, None until first used.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the SpectrumCache object.
+        """
+        self.spectrum: ndarray | None = None
+
+    def get(self, y: ndarray) -> ndarray:
+        """
+        Get the STFT of the source waveform, computing it on first use.
+
+        Args:
+            y (ndarray): The source audio waveform.
+
+        Returns:
+            ndarray: The STFT of the waveform.
+        """
+        if self.spectrum is None:
+            self.spectrum = librosa.stft(y)
+        return self.spectrum
+
+
+def time_pitch(
+    y: ndarray,
+    sr: int,
+    *,
+    rate: float = 1.0,
+    n_steps: float = 0.0,
+    res_type: str = "soxr_hq",
+    spectrum: ndarray | None = None,
+    quality: str = "high",
+) -> ndarray:
+    """
+    Stretch the audio in time and shift its pitch with one STFT, one phase vocoder pass and one resample.
+
+    Pitch shifting is time stretching followed by resampling (as in librosa.effects.pitch_shift),
+    so both stretches are combined into a single phase vocoder pass with the product of their rates.
+    With only one of them, the result is the same as librosa.effects.time_stretch or pitch_shift.
+    In fast quality, the phase vocoder is replaced by WSOLA, which is about twice as fast but
+    can double or drop pitch periods, which is audible on music but acceptable on speech.
+
+    Args:
+        y (ndarray): The audio waveform.
+        sr (int): The sample rate of the audio.
+        rate (float, optional): The time stretch factor, larger is faster. Defaults to 1.0.
+        n_steps (float, optional): The number of semitones to shift the pitch. Defaults to 0.0.
+        res_type (str, optional): The resampler used for pitch shifting. Defaults to "soxr_hq".
+        spectrum (ndarray or None, optional): The precomputed STFT of the waveform, used in high quality.
+            Defaults to None.
+        quality (str, optional): "high" for the phase vocoder, "fast" for WSOLA. Defaults to "high".
+
+    Returns:
+        ndarray: The audio waveform, with length of the input divided by the time stretch factor.
+    """
+    pitch_rate = 2.0 ** (-float(n_steps) / 12)
+    total_rate = rate * pitch_rate
+    if quality == "fast":
+        stretched = wsola.time_stretch(y, sr, total_rate)
+    else:
+        if spectrum is None:
+            spectrum = librosa.stft(y)
+        stretched = librosa.istft(
+            librosa.phase_vocoder(spectrum, rate=total_rate),
+            dtype=y.dtype,
+            length=round(y.shape[-1] / total_rate),
+        )
+    if n_steps == 0:
+        return stretched
+    shifted = librosa.resample(
+        stretched, orig_sr=float(sr) / pitch_rate, target_sr=sr, res_type=res_type
+    )
+    return librosa.util.fix_length(shifted, size=round(y.shape[-1] / rate))
 
 
 def time_shift(y: ndarray, sr: int, *, min_shift: float, max_shift: float, p: float) -> ndarray:
@@ -129,7 +317,7 @@ def _pitch_scale(y: ndarray, sr: int, num_semitones: float) -> ndarray:
     Returns:
         ndarray: The audio waveform with pitch scaling applied.
     """
-    return librosa.effects.pitch_shift(y, sr=sr, n_steps=num_semitones)
+    return time_pitch(y, sr, n_steps=num_semitones)
 
 
 def pitch_scale(y: ndarray, sr: int, *, min_semitones: int, max_semitones: int, p: float) -> ndarray:
@@ -0,0 +1,66 @@
+import numpy as np
+from numpy import ndarray
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import irfft, next_fast_len, rfft
+from scipy.signal import get_window
+
+# duration of overlapping frames, long enough for a few periods of speech
+FRAME_DURATION = 0.032
+# maximum shift of a frame from its nominal position, more than half of the longest pitch period of speech
+TOLERANCE_DURATION = 0.01
+
+
+def time_stretch(y: ndarray, sr: int, rate: float) -> ndarray:
+    """
+    Stretch the audio in time with WSOLA (waveform similarity overlap-add).
+
+    Hann-windowed frames are taken from the input every frame_length / 2 * rate samples and
+    overlap-added every frame_length / 2 samples. Every frame is shifted by up to the tolerance
+    to match the continuation of the previous frame, which keeps the waveform periodic across
+    frame boundaries.
+
+    Cross-correlations of all frames with the continuations of their predecessors are computed at once
+    with FFTs, from the nominal frame positions. Only picking the shifts is sequential, since each
+    shift is relative to the shift of the previous frame.
+
+    Args:
+        y (ndarray): The audio waveform.
+        sr (int): The sample rate of the audio.
+        rate (float): The time stretch factor, larger is faster.
+
+    Returns:
+        ndarray: The time-stretched audio waveform, with length of the input divided by the rate.
+    """
+    hop = max(round(sr * FRAME_DURATION / 2), 1)
+    frame_length = 2 * hop
+    tolerance = round(sr * TOLERANCE_DURATION)
+    length = round(len(y) / rate)
+    n_frames = -(-length // hop) + 1
+
+    # padding keeps every frame and search region within the signal
+    padding = frame_length + 2 * tolerance
+    padded = np.pad(y, (padding, padding + int(np.ceil(n_frames * hop * rate))))
+    nominal = padding - hop + np.round(np.arange(n_frames) * hop * rate).astype(np.int64)
+
+    # correlation over the overlapping half of frame k, shifted by -2 * tolerance to 2 * tolerance
+    # relative to the shift of frame k - 1
+    continuations = sliding_window_view(padded, hop)[nominal[:-1] + hop]
+    regions = sliding_window_view(padded, hop + 4 * tolerance)[nominal[1:] - 2 * tolerance]
+    size = next_fast_len(2 * hop + 4 * tolerance, real=True)
+    spectra = rfft(regions, size) * np.conj(rfft(continuations, size))
+    correlation = irfft(spectra, size)[:, : 4 * tolerance + 1]
+
+    shifts = np.zeros(n_frames, dtype=np.int64)
+    for k, frame_correlation in enumerate(correlation, start=1):
+        # keep every frame within the tolerance of its nominal position
+        start = tolerance - shifts[k - 1]
+        shifts[k] = (
+            shifts[k - 1] + start + np.argmax(frame_correlation[start : start + 2 * tolerance + 1])
+        )
+        shifts[k] -= 2 * tolerance
+
+    window = get_window("hann", frame_length).astype(y.dtype)
+    windowed = sliding_window_view(padded, frame_length)[nominal + shifts] * window
+    # with 50% overlap, output block k is the second half of frame k and the first half of frame k + 1
+    output = windowed[:-1, hop:] + windowed[1:, :hop]
+    return output.reshape(-1)[:length].astype(y.dtype, copy=False)
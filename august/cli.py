@@ -1,17 +1,27 @@
+import math
+import os
 import random
 import time
+from collections import defaultdict
 from multiprocessing import Pool
 from pathlib import Path
 
 import click
 
+from august.audio import rooms
+from august.audio import utils as audio_utils
 from august.audio.audio import AugustAudio
+from august.audio.cache import get_decode_cache
 from august.audio.config import AugustAudioConfig
+from august.audio.streaming import AugustAudioStream
 from august.images.config import AugustImageConfig
 from august.images.images import AugustImage
+from august.images.tiled import AugustTiledImage
 from august.text.config import AugustTextConfig
+from august.text.corpus import CORPUS_EXTENSIONS, ShardWriter, batched, read_records
 from august.text.text import AugustText
 from august.utils.dirs import files_with_extensions, get_directory
+from august.utils.writer import BackgroundWriter
 
 
 @click.group()
@@ -19,18 +29,97 @@ def cli() -> None:
     pass
 
 
-def _process_image(index, img, config, dest_path):
+def _group_by_source(files: list[str]) -> list[tuple[list[int], str]]:
+    """
+    Group output indices by source file, so that every source file is decoded once per group.
+
+    Groups are split into chunks small enough to keep all pool workers busy,
+    even if there are only a few source files.
+
+    Args:
+        files (list[str]): Source file of every output, in output index order.
+
+    Returns:
+        list[tuple[list[int], str]]: Output indices and their source file.
+    """
+    indices = defaultdict(list)
+    for index, file in enumerate(files):
+        indices[file].append(index)
+    chunk_size = max(1, math.ceil(len(files) / (4 * (os.cpu_count() or 1))))
+    return [
+        (file_indices[start : start + chunk_size], file)
+        for file, file_indices in indices.items()
+        for start in range(0, len(file_indices), chunk_size)
+    ]
+
+
+# background writer of the image worker process, created once by its initializer
+_image_worker = {}
+
+
+def _init_image_worker(writer_threads: int) -> None:
+    """
+    Create the background writer of an image worker process, shared by all its tasks.
+
+    Args:
+        writer_threads (int): The number of writer threads.
+    """
+    _image_worker["writer"] = BackgroundWriter(writer_threads)
+
+
+def _process_image(indices, img, config, dest_path, tiled=False):
     img_path = Path(img)
     print("IMG: ", img_path)
-    aug_img = AugustImage(audio_path=img_path, config=config)
-    aug_img.augment()
-    aug_img.save(dest_path / (f"{index}_{img_path.name}"))
+    source = (
+        AugustTiledImage(img_path, config=config)
+        if tiled
+        else AugustImage(audio_path=img_path, config=config)
+    )
+    writer = _image_worker["writer"]
+    for index in indices:
+        aug_img = source.copy()
+        aug_img.augment()
+        writer.submit(aug_img.save, dest_path / (f"{index}_{img_path.name}"))
+    # all images of the task are saved, and write errors reported, before it returns
+    writer.wait()
 
 
 @click.command()
 @click.option("--source", "-s", help="Source directory with images", required=True)
 @click.option("--destination", "-d", help="Destination directory for augmented images", required=True)
 @click.option("--n", "-n", help="Number of augmented images", required=True, type=int)
+@click.option("--target_size", help="Maximal size of the longer image side", default=None, type=int)
+@click.option("--tiled", help="Process images tile by tile, also reads .npy arrays", is_flag=True)
+@click.option(
+    "--tile_size", help="Size of square tiles processed at once in tiled mode", default=1024, type=int
+)
+@click.option(
+    "--output_format",
+    help="Format of augmented images, the source format is kept by default",
+    default=None,
+    type=click.Choice(("png", "jpeg", "webp")),
+)
+@click.option(
+    "--encode_preset",
+    help="Encoding preset overriding quality, compression and optimization settings",
+    default=None,
+    type=click.Choice(("fast", "small")),
+)
+@click.option(
+    "--quality",
+    help="JPEG and WebP quality, PIL defaults (75 for JPEG, 80 for WebP) if not set",
+    default=None,
+    type=int,
+)
+@click.option("--compress_level", help="PNG compression level", default=6, type=int)
+@click.option("--optimize", help="Optimize JPEG and PNG encoding for size", is_flag=True)
+@click.option("--progressive", help="Save progressive JPEG images", is_flag=True)
+@click.option(
+    "--writer_threads",
+    help="Number of background threads encoding images in every worker process",
+    default=1,
+    type=int,
+)
 @click.option("--mirror_p", help="Mirror probability", default=0.5, type=float)
 @click.option("--flip_p", help="Flip probability", default=0.5, type=float)
 @click.option("--color_p", help="Color change probability", default=0.5, type=float)
@@ -39,12 +128,54 @@ def _process_image(index, img, config, dest_path):
     "--min_temperature_ratio", help="Min color temperature change ratio", default=-50, type=int
 )
 @click.option("--max_temperature_ratio", help="Max color temperature change ratio", default=50, type=int)
+@click.option("--brightness_p", help="Brightness probability, off by default", default=0, type=float)
+@click.option("--min_brightness", help="Minimal brightness factor", default=0.7, type=float)
+@click.option("--max_brightness", help="Maximum brightness factor", default=1.3, type=float)
+@click.option("--contrast_p", help="Contrast probability, off by default", default=0, type=float)
+@click.option("--min_contrast", help="Minimal contrast factor", default=0.7, type=float)
+@click.option("--max_contrast", help="Maximum contrast factor", default=1.3, type=float)
 @click.option("--rotate_p", help="Rotate probability", default=0.5, type=float)
 @click.option("--min_angle", help="Minimal rotate angle", default=-89, type=int)
 @click.option("--max_angle", help="Maximum rotate angle", default=89, type=int)
 @click.option("--blur_p", help="Blur probability", default=0.5, type=float)
 @click.option("--min_pixel_radius", help="Minimal blur pixel radius", default=1, type=int)
 @click.option("--max_pixel_radius", help="Maximum blur pixel radius", default=5, type=int)
+@click.option(
+    "--blur_types",
+    help="Types of blur to choose from, gaussian and motion are opt-in",
+    default=("box",),
+    multiple=True,
+    type=click.Choice(("box", "gaussian", "motion")),
+)
+@click.option(
+    "--blur_quality",
+    help="Blur quality, fast blurs downscaled images for large radiuses",
+    default="exact",
+    type=click.Choice(("exact", "fast")),
+)
+@click.option("--noise_p", help="Noise probability, off by default", default=0, type=float)
+@click.option(
+    "--noise_types",
+    help="Types of noise to choose from",
+    default=("gaussian", "salt_and_pepper", "poisson"),
+    multiple=True,
+    type=click.Choice(("gaussian", "salt_and_pepper", "poisson")),
+)
+@click.option("--min_noise_std", help="Minimal standard deviation of noise", default=0, type=float)
+@click.option("--max_noise_std", help="Maximum standard deviation of noise", default=20, type=float)
+@click.option(
+    "--min_salt_pepper_amount",
+    help="Minimal part of pixels changed by salt and pepper",
+    default=0.01,
+    type=float,
+)
+@click.option(
+    "--max_salt_pepper_amount",
+    help="Maximum part of pixels changed by salt and pepper",
+    default=0.05,
+    type=float,
+)
+@click.option("--noise_tile_size", help="Size of pre-generated noise tiles", default=256, type=int)
 @click.option("--offset_p", help="Offset probability", default=0.5, type=float)
 @click.option("--min_x_offset", help="Minimal offset in x axis", default=-0.5, type=float)
 @click.option("--max_x_offset", help="Maximum offset in x axis", default=0.5, type=float)
@@ -55,32 +186,136 @@ def _process_image(index, img, config, dest_path):
 @click.option("--max_x_crop", help="Maximum crop width", default=0.9, type=float)
 @click.option("--min_y_crop", help="Minimal crop height", default=0.6, type=float)
 @click.option("--max_y_crop", help="Maximum crop height", default=0.9, type=float)
-def images(source: str, destination: str, n: int, **kwargs) -> None:
+def images(source: str, destination: str, n: int, tiled: bool, **kwargs) -> None:
     start = time.time()
     config = AugustImageConfig(**kwargs)
     dest_path = Path(get_directory(destination))
-    image_files = files_with_extensions(source, (".jpg", ".jpeg", ".png"))
+    extensions = (".jpg", ".jpeg", ".png", ".npy") if tiled else (".jpg", ".jpeg", ".png")
+    image_files = files_with_extensions(source, extensions)
     files_to_augment = random.choices(image_files, k=n)
 
-    arguments = [(index, img, config, dest_path) for index, img in enumerate(files_to_augment)]
-    with Pool() as p:
+    arguments = [
+        (indices, img, config, dest_path, tiled) for indices, img in _group_by_source(files_to_augment)
+    ]
+    # one writer thread mostly waits for augmentation, more of them take CPUs from workers
+    workers = max(1, (os.cpu_count() or 1) // max(1, config.writer_threads))
+    with Pool(workers, initializer=_init_image_worker, initargs=(config.writer_threads,)) as p:
         p.starmap(_process_image, arguments)
 
     print(f"Images function: {time.time() - start}")
 
 
-def _process_audio(index, aud, config, dest_path):
+def _prepare_rooms(config: AugustAudioConfig) -> AugustAudioConfig:
+    """
+    Create the room bank once before starting workers, so that workers only load it.
+
+    If no bank path is configured, the bank is kept in the user cache directory, so later runs
+    with the same settings load it instead of simulating rooms again.
+
+    Args:
+        config (AugustAudioConfig): The configuration settings for audio augmentation.
+
+    Returns:
+        AugustAudioConfig: The configuration with the path of the created bank.
+    """
+    if config.room_p == 0:
+        return config
+    sr = config.sample_rate or rooms.DEFAULT_ROOM_SR
+    if config.room_bank_path is None:
+        path = rooms.default_bank_path(sr, config.room_bank_size, config.room_ir_dir)
+        config = config.model_copy(update={"room_bank_path": str(path)})
+    rooms.prepare_room_bank(config.room_bank_path, sr, config.room_bank_size, config.room_ir_dir)
+    return config
+
+
+def _process_audio(indices, aud, config, dest_path, streaming=False):
     audio_path = Path(aud)
     print("AUDIO: ", audio_path)
-    augio = AugustAudio(audio_path=audio_path, config=config)
-    augio.augment()
-    augio.save(dest_path / (f"{index}_{audio_path.name}"))
+    source = (
+        AugustAudioStream(audio_path, config=config)
+        if streaming
+        else AugustAudio(audio_path=audio_path, config=config)
+    )
+    for index in indices:
+        # every variant reads its own random window, so the decoded file can't be shared
+        augio = source.copy() if config.segment is None else type(source)(audio_path, config=config)
+        augio.augment()
+        augio.save(dest_path / (f"{index}_{audio_path.name}"))
 
 
 @click.command()
 @click.option("--source", "-s", help="Source directory with audio", required=True)
 @click.option("--destination", "-d", help="Destination directory for augmented audio", required=True)
 @click.option("--n", "-n", help="Number of augmented audio", required=True, type=int)
+@click.option(
+    "--sample_rate",
+    help="Sample rate audio is resampled to on load, 0 keeps the native rate",
+    default=22050,
+    type=int,
+)
+@click.option(
+    "--res_type",
+    help="Resampler used on load, from best to fastest",
+    default="soxr_hq",
+    type=click.Choice(("soxr_vhq", "soxr_hq", "soxr_mq", "soxr_lq", "soxr_qq", "polyphase", "linear")),
+)
+@click.option(
+    "--dtype",
+    help="Data type of loaded audio",
+    default="float32",
+    type=click.Choice(("float32", "float64")),
+)
+@click.option(
+    "--decode_cache_dir",
+    help="Directory of the cache of decoded audio of formats other than WAV, FLAC and Ogg",
+    default=None,
+)
+@click.option(
+    "--decode_cache_size",
+    help="Size in GB the decode cache is reduced to after every run",
+    default=10,
+    type=float,
+)
+@click.option(
+    "--decode_cache_dtype",
+    help="Data type of cached audio, int16 takes half the space",
+    default="float32",
+    type=click.Choice(("float32", "int16")),
+)
+@click.option(
+    "--streaming", help="Process audio block by block, with memory independent of length", is_flag=True
+)
+@click.option(
+    "--block_size", help="Number of samples read at once in streaming mode", default=65536, type=int
+)
+@click.option(
+    "--output_format",
+    help="Format of augmented audio, npy and npz save log-mel spectrograms instead of audio",
+    default="wav",
+    type=click.Choice(("wav", "npy", "npz")),
+)
+@click.option("--n_mels", help="Number of mel bands of saved spectrograms", default=80, type=int)
+@click.option("--n_fft", help="FFT window length of saved spectrograms", default=2048, type=int)
+@click.option(
+    "--hop_length", help="Number of samples between frames of saved spectrograms", default=512, type=int
+)
+@click.option(
+    "--in_place",
+    help="Apply gain, polarity inversion, noise, time masks and time shifts in place, without temporary copies",
+    is_flag=True,
+)
+@click.option(
+    "--min_segment_duration",
+    help="Minimal duration in seconds of a random window read from every file, whole files are read if not set",
+    default=None,
+    type=float,
+)
+@click.option(
+    "--max_segment_duration",
+    help="Maximum duration in seconds of a random window, the minimal duration is used if not set",
+    default=None,
+    type=float,
+)
 @click.option("--time_shift_p", help="Time shift probability", default=0.5, type=float)
 @click.option(
     "--min_shift", help="Minimal shift as a fraction of total length", default=-0.5, type=float
@@ -89,6 +324,12 @@ def _process_audio(index, aud, config, dest_path):
 @click.option("--time_stretch_p", help="Time stretch probability", default=0.5, type=float)
 @click.option("--min_stretch_factor", help="Minimal time stretch factor", default=0.5, type=float)
 @click.option("--max_stretch_factor", help="Maximum time stretch factor", default=1.5, type=float)
+@click.option(
+    "--quality",
+    help="Time stretch and pitch scale engine, phase vocoder (high) or WSOLA (fast, fine for speech)",
+    default="high",
+    type=click.Choice(("high", "fast")),
+)
 @click.option("--invert_polarity_p", help="Invert polarity probability", default=0.5, type=float)
 @click.option("--pitch_scale_p", help="Pitch scale probability", default=0.5, type=float)
 @click.option("--min_semitones", help="Minimal pitch scale semitones", default=-6, type=int)
@@ -102,6 +343,14 @@ def _process_audio(index, aud, config, dest_path):
 @click.option("--time_mask_p", help="Time mask probability", default=0.5, type=float)
 @click.option("--min_mask_part", help="Minimal mask part", default=0.01, type=float)
 @click.option("--max_mask_part", help="Maximum mask part", default=0.5, type=float)
+@click.option(
+    "--frequency_mask_p",
+    help="Frequency mask probability, applied to saved spectrograms only",
+    default=0.5,
+    type=float,
+)
+@click.option("--min_frequency_mask_part", help="Minimal frequency mask part", default=0.01, type=float)
+@click.option("--max_frequency_mask_part", help="Maximum frequency mask part", default=0.15, type=float)
 @click.option("--low_pass_filter_p", help="Low pass filter probability", default=0.5, type=float)
 @click.option("--min_low_pass_freq", help="Minimal low pass filter frequency", default=150, type=float)
 @click.option("--max_low_pass_freq", help="Maximum low pass filter frequency", default=7500, type=float)
@@ -110,24 +359,135 @@ def _process_audio(index, aud, config, dest_path):
 @click.option(
     "--max_high_pass_freq", help="Maximum high pass filter frequency", default=2400, type=float
 )
+@click.option(
+    "--zero_phase_filters",
+    help="Apply low and high pass filters forwards and backwards without phase shift",
+    is_flag=True,
+)
 @click.option("--room_p", help="Room effect probability", default=0.5, type=float)
-def audio(source: str, destination: str, n: int, **kwargs) -> None:
+@click.option(
+    "--room_bank_path",
+    help="Path of the room impulse response bank, created there if it doesn't exist, "
+    "defaults to a bank in ~/.cache/august/rooms reused by runs with the same settings",
+    default=None,
+)
+@click.option(
+    "--room_ir_dir",
+    help="Directory with impulse response WAV files used instead of simulated rooms",
+    default=None,
+)
+@click.option("--room_bank_size", help="Number of simulated rooms in the bank", default=32, type=int)
+def audio(source: str, destination: str, n: int, sample_rate: int, streaming: bool, **kwargs) -> None:
     start = time.time()
-    config = AugustAudioConfig(**kwargs)
+    config = AugustAudioConfig(sample_rate=sample_rate or None, **kwargs)
+    if streaming and config.features:
+        raise click.UsageError("Spectrograms can't be saved in streaming mode.")
     dest_path = Path(get_directory(destination))
-    audio_files = files_with_extensions(source, (".mp3", ".wav", ".m4a"))
+    extensions = audio_utils.SOUNDFILE_EXTENSIONS if streaming else audio_utils.AUDIO_EXTENSIONS
+    audio_files = files_with_extensions(source, extensions)
     files_to_augment = random.choices(audio_files, k=n)
 
-    arguments = [(index, aud, config, dest_path) for index, aud in enumerate(files_to_augment)]
+    config = _prepare_rooms(config)
+    arguments = [
+        (indices, aud, config, dest_path, streaming)
+        for indices, aud in _group_by_source(files_to_augment)
+    ]
     with Pool() as p:
         p.starmap(_process_audio, arguments)
 
+    if config.decode_cache_dir is not None:
+        # workers only add entries, the least recently used ones are removed once per run
+        get_decode_cache(
+            config.decode_cache_dir, config.decode_cache_size, config.decode_cache_dtype
+        ).evict()
     print(f"Audio function: {time.time() - start}")
 
 
+# configuration and settings of the text worker process, set once by its initializer
+_text_worker = {}
+# number of corpus records sent to a worker at once
+CORPUS_CHUNK_SIZE = 64
+
+
+def _init_text_worker(config: AugustTextConfig, settings: dict) -> None:
+    """
+    Store the settings of a text worker process and build its augmenters before the first text.
+
+    Args:
+        config (AugustTextConfig): The configuration settings for text augmentation.
+        settings (dict): Other settings of the worker, such as the destination directory.
+    """
+    _text_worker.update(settings, config=config)
+    AugustText.warm_up(config)
+
+
+def _process_text(task: tuple[int, str]) -> None:
+    index, txt = task
+    txt_path = Path(txt)
+    print("TEXT: ", txt_path)
+    with open(txt_path, "r") as f:
+        text_content = f.read()
+    txt_aug = AugustText(text=text_content, config=_text_worker["config"])
+    txt_aug.augment()
+    txt_aug.save(_text_worker["dest_path"] / (f"{index}_{txt_path.name}"))
+
+
+def _process_record(record: dict) -> list[dict]:
+    text_field = _text_worker["text_field"]
+    variants = []
+    for _ in range(_text_worker["n"]):
+        txt_aug = AugustText(text=record[text_field], config=_text_worker["config"])
+        txt_aug.augment()
+        variants.append({**record, text_field: txt_aug.text})
+    return variants
+
+
+def _process_corpus(
+    corpus_files: list[str], dest_path: Path, p: Pool, workers: int, shard_size: int, text_field: str
+) -> None:
+    """
+    Augment corpus files record by record, writing the variants of every record to sharded files.
+
+    Records are read and dispatched in batches, so that memory use doesn't depend on the corpus size.
+
+    Args:
+        corpus_files (list[str]): The corpus files.
+        dest_path (Path): The destination directory.
+        p (Pool): The pool of text workers.
+        workers (int): The number of workers in the pool.
+        shard_size (int): The maximal number of records in an output file.
+        text_field (str): The field of records holding the text.
+    """
+    batch_size = 16 * CORPUS_CHUNK_SIZE * workers
+    for corpus_file in corpus_files:
+        print("CORPUS: ", corpus_file)
+        with ShardWriter(dest_path, Path(corpus_file).name, shard_size, text_field) as writer:
+            for batch in batched(read_records(corpus_file, text_field), batch_size):
+                for variants in p.imap(_process_record, batch, chunksize=CORPUS_CHUNK_SIZE):
+                    for variant in variants:
+                        writer.write(variant)
+
+
 @click.option("--source", "-s", help="Source directory with text", required=True)
 @click.option("--destination", "-d", help="Destination directory for augmented text", required=True)
-@click.option("--n", "-n", help="Number of augmented text", required=True, type=int)
+@click.option(
+    "--n", "-n", help="Number of augmented text, per record in corpus mode", required=True, type=int
+)
+@click.option(
+    "--corpus",
+    help="Read records from JSONL, CSV or one per line TXT files and write them to sharded files",
+    is_flag=True,
+)
+@click.option("--text_field", help="Field of JSONL and CSV records holding the text", default="text")
+@click.option(
+    "--shard_size",
+    help="Maximal number of records in an output file in corpus mode",
+    default=100000,
+    type=int,
+)
+@click.option(
+    "--workers", help="Number of worker processes, all CPUs by default", default=None, type=int
+)
 @click.option("--synonym_replace_p", help="Probability of synonym replacement", default=0.3, type=float)
 @click.option("--antonym_replace_p", help="Probability of antonym replacement", default=0.3, type=float)
 @click.option("--ocr_p", help="Probability of OCR distortion", default=0.3, type=float)
@@ -144,20 +504,39 @@ def audio(source: str, destination: str, n: int, **kwargs) -> None:
 @click.option("--random_word_swap_p", help="Probability of random word swap", default=0.3, type=float)
 @click.option("--spelling_p", help="Probability of misspelling ", default=0.3, type=float)
 @click.command()
-def text(source: str, destination: str, n: int, **kwargs) -> None:
+def text(
+    source: str,
+    destination: str,
+    n: int,
+    corpus: bool,
+    text_field: str,
+    shard_size: int,
+    workers: int | None,
+    **kwargs,
+) -> None:
     start = time.time()
     config = AugustTextConfig(**kwargs)
     dest_path = Path(get_directory(destination))
-    text_files = files_with_extensions(source, (".txt",))
-    files_to_augment = random.choices(text_files, k=n)
-    for index, txt in enumerate(files_to_augment):
-        txt_path = Path(txt)
-        print("TEXT: ", txt_path)
-        with open(txt_path, "r") as f:
-            text_content = f.read()
-        txt_aug = AugustText(text=text_content, config=config)
-        txt_aug.augment()
-        txt_aug.save(dest_path / (f"{index}_{txt_path.name}"))
+
+    # fails early if data of an augmenter is missing, forked workers also inherit the built augmenters
+    AugustText.warm_up(config)
+    workers = workers or os.cpu_count() or 1
+    if corpus:
+        corpus_files = (
+            [source] if os.path.isfile(source) else files_with_extensions(source, CORPUS_EXTENSIONS)
+        )
+        settings = {"n": n, "text_field": text_field}
+        with Pool(workers, initializer=_init_text_worker, initargs=(config, settings)) as p:
+            _process_corpus(corpus_files, dest_path, p, workers, shard_size, text_field)
+    else:
+        text_files = files_with_extensions(source, (".txt",))
+        files_to_augment = random.choices(text_files, k=n)
+        # texts are small, so they are sent to workers in chunks to keep messaging from dominating
+        chunk_size = max(1, math.ceil(n / (4 * workers)))
+        settings = {"dest_path": dest_path}
+        with Pool(workers, initializer=_init_text_worker, initargs=(config, settings)) as p:
+            for _ in p.imap_unordered(_process_text, enumerate(files_to_augment), chunksize=chunk_size):
+                pass
     print(f"Text function: {time.time() - start}")
 
 
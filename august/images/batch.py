@@ -0,0 +1,247 @@
+import numpy as np
+
+from august.images import utils
+from august.images.config import AugustImageConfig
+from august.images.decorators import AugustImageBatchMark, mark_batch_augmentation
+from august.mixins import ExecuteAugmentationMixin
+
+
+class AugustImageBatch(ExecuteAugmentationMixin):
+    """
+    A class for augmenting a batch of images at once with vectorized array operations.
+
+    Every augmentation draws its random parameters for all images in bulk and applies them to
+    the whole batch, so the per-image Python overhead of AugustImage is paid once per batch.
+    All images keep the shape of the batch, so crop scales the cropped window back to full size.
+
+    Args:
+        images (np.ndarray): Batch of RGB images of shape (N, H, W, 3) and dtype uint8.
+        config (AugustImageConfig, optional): Configuration settings for image augmentation. Defaults to AugustImageConfig().
+        rng (np.random.Generator or None, optional): Random generator used to draw parameters. Defaults to None.
+
+    Attributes:
+        images (np.ndarray): The batch of images.
+        config (AugustImageConfig): The configuration settings for image augmentation.
+        rng (np.random.Generator): Random generator used to draw parameters.
+    """
+
+    _augmentations = AugustImageBatchMark.augmentations
+
+    def __init__(
+        self,
+        images: np.ndarray,
+        config: AugustImageConfig = AugustImageConfig(),
+        rng: np.random.Generator | None = None,
+    ) -> None:
+        """
+        Initialize the AugustImageBatch object.
+
+        Args:
+            images (np.ndarray): Batch of RGB images of shape (N, H, W, 3) and dtype uint8.
+            config (AugustImageConfig, optional): Configuration settings for image augmentation. Defaults to AugustImageConfig().
+            rng (np.random.Generator or None, optional): Random generator used to draw parameters. Defaults to None.
+
+        Raises:
+            ValueError: If images are not a uint8 array of shape (N, H, W, 3).
+        """
+        if images.ndim != 4 or images.shape[-1] != 3 or images.dtype != np.uint8:
+            raise ValueError("Images should be a uint8 array of shape (N, H, W, 3).")
+        self.images = images.copy()
+        self.config = config
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def _draw(self, p: float) -> np.ndarray:
+        """
+        Draw which images of the batch an augmentation should be applied to.
+
+        Args:
+            p (float): The probability of applying the augmentation.
+
+        Returns:
+            np.ndarray: Boolean mask of shape (N,).
+        """
+        return self.rng.random(len(self)) <= p
+
+    def _gather(self, rows: np.ndarray, columns: np.ndarray) -> None:
+        """
+        Resample every image of the batch from per-image row and column indices.
+
+        Args:
+            rows (np.ndarray): Source row indices of shape (N, H).
+            columns (np.ndarray): Source column indices of shape (N, W).
+        """
+        batch = np.arange(len(self))[:, None, None]
+        self.images = self.images[batch, rows[:, :, None], columns[:, None, :]]
+
+    def _mirror(self, mask: np.ndarray) -> None:
+        """
+        Mirror the selected images horizontally (left to right).
+
+        Args:
+            mask (np.ndarray): Boolean mask of shape (N,) selecting images.
+        """
+        self.images[mask] = self.images[mask, :, ::-1]
+
+    def _flip(self, mask: np.ndarray) -> None:
+        """
+        Flip the selected images vertically (top to bottom).
+
+        Args:
+            mask (np.ndarray): Boolean mask of shape (N,) selecting images.
+        """
+        self.images[mask] = self.images[mask, ::-1]
+
+    def _sepia(self, mask: np.ndarray) -> None:
+        """
+        Apply a sepia filter to the selected images.
+
+        Args:
+            mask (np.ndarray): Boolean mask of shape (N,) selecting images.
+        """
+        selected = self.images[mask]
+        self.images[mask] = utils.sepia_pixels(selected.reshape(-1, 3)).reshape(selected.shape)
+
+    def _black_and_white(self, mask: np.ndarray) -> None:
+        """
+        Convert the selected images to black and white, keeping three channels.
+
+        Args:
+            mask (np.ndarray): Boolean mask of shape (N,) selecting images.
+        """
+        self.images[mask] = utils.grayscale_pixels(self.images[mask])[..., None]
+
+    def _color_temperature(self, ratios: np.ndarray) -> None:
+        """
+        Adjust the color temperature of every image.
+
+        Args:
+            ratios (np.ndarray): Color temperature change ratios of shape (N,), 0 keeps an image unchanged.
+        """
+        ratios = ratios.astype(np.int16)[:, None, None]
+        red, blue = self.images[..., 0].astype(np.int16), self.images[..., 2].astype(np.int16)
+        self.images[..., 0] = np.clip(red + ratios, 0, 255)
+        self.images[..., 2] = np.clip(blue - ratios, 0, 255)
+
+    def _noise(self, stds: np.ndarray) -> None:
+        """
+        Add Gaussian noise to every image.
+
+        Args:
+            stds (np.ndarray): Standard deviations of noise of shape (N,), 0 keeps an image unchanged.
+        """
+        selected = stds > 0
+        noise = self.rng.standard_normal(self.images[selected].shape, dtype=np.float32)
+        noise *= stds[selected].astype(np.float32)[:, None, None, None]
+        noise += self.images[selected]
+        self.images[selected] = np.clip(np.rint(noise), 0, 255)
+
+    def _offset(self, x_offsets: np.ndarray, y_offsets: np.ndarray) -> None:
+        """
+        Offset every image by a number of pixels, wrapping pixels around the edges as np.roll does.
+
+        Args:
+            x_offsets (np.ndarray): Offsets in the X direction of shape (N,).
+            y_offsets (np.ndarray): Offsets in the Y direction of shape (N,).
+        """
+        _, height, width, _ = self.images.shape
+        rows = (np.arange(height)[None, :] - y_offsets[:, None]) % height
+        columns = (np.arange(width)[None, :] - x_offsets[:, None]) % width
+        self._gather(rows, columns)
+
+    def _crop(self, x_min: np.ndarray, y_min: np.ndarray, x_max: np.ndarray, y_max: np.ndarray) -> None:
+        """
+        Crop a rectangular region from every image and scale it back to the batch size (nearest neighbour).
+
+        Args:
+            x_min (np.ndarray): The minimum X-coordinates of the cropping regions of shape (N,).
+            y_min (np.ndarray): The minimum Y-coordinates of the cropping regions of shape (N,).
+            x_max (np.ndarray): The maximum X-coordinates of the cropping regions of shape (N,).
+            y_max (np.ndarray): The maximum Y-coordinates of the cropping regions of shape (N,).
+        """
+        _, height, width, _ = self.images.shape
+        # source pixel centers of the output pixels
+        row_centers = (np.arange(height)[None, :] + 0.5) * ((y_max - y_min) / height)[:, None]
+        column_centers = (np.arange(width)[None, :] + 0.5) * ((x_max - x_min) / width)[:, None]
+        rows = y_min[:, None] + row_centers.astype(int)
+        columns = x_min[:, None] + column_centers.astype(int)
+        self._gather(rows, columns)
+
+    @mark_batch_augmentation
+    def mirror(self) -> None:
+        """
+        Apply mirroring to images drawn with the configured probability.
+        """
+        self._mirror(self._draw(self.config.mirror_p))
+
+    @mark_batch_augmentation
+    def flip(self) -> None:
+        """
+        Apply flipping to images drawn with the configured probability.
+        """
+        self._flip(self._draw(self.config.flip_p))
+
+    @mark_batch_augmentation
+    def color_change(self) -> None:
+        """
+        Apply sepia or black and white filter to images drawn with the configured probability.
+        """
+        mask = self._draw(self.config.color_p)
+        sepia = self.rng.random(len(self)) < 0.5
+        self._sepia(mask & sepia)
+        self._black_and_white(mask & ~sepia)
+
+    @mark_batch_augmentation
+    def color_temperature(self) -> None:
+        """
+        Adjust the color temperature of images drawn with the configured probability.
+        """
+        mask = self._draw(self.config.temperature_p)
+        min_ratio, max_ratio = self.config.min_temperature_ratio, self.config.max_temperature_ratio
+        ratios = self.rng.integers(min_ratio, max_ratio, len(self), endpoint=True)
+        if mask.any():
+            self._color_temperature(np.where(mask, ratios, 0))
+
+    @mark_batch_augmentation
+    def noise(self) -> None:
+        """
+        Add Gaussian noise to images drawn with the configured probability.
+        """
+        mask = self._draw(self.config.noise_p)
+        stds = self.rng.uniform(self.config.min_noise_std, self.config.max_noise_std, len(self))
+        if mask.any():
+            self._noise(np.where(mask, stds, 0))
+
+    @mark_batch_augmentation
+    def offset(self) -> None:
+        """
+        Offset images drawn with the configured probability.
+        """
+        mask = self._draw(self.config.offset_p)
+        _, height, width, _ = self.images.shape
+        x_offsets = self.rng.uniform(self.config.min_x_offset, self.config.max_x_offset, len(self))
+        y_offsets = self.rng.uniform(self.config.min_y_offset, self.config.max_y_offset, len(self))
+        x_offsets = np.where(mask, (x_offsets * width).astype(int), 0)
+        y_offsets = np.where(mask, (y_offsets * height).astype(int), 0)
+        if mask.any():
+            self._offset(x_offsets, y_offsets)
+
+    @mark_batch_augmentation
+    def crop(self) -> None:
+        """
+        Crop a portion of images drawn with the configured probability.
+        """
+        mask = self._draw(self.config.crop_p)
+        _, height, width, _ = self.images.shape
+        min_width, max_width = int(self.config.min_x_crop * width), int(self.config.max_x_crop * width)
+        min_height = int(self.config.min_y_crop * height)
+        max_height = int(self.config.max_y_crop * height)
+        crop_width = self.rng.integers(min_width, max_width, len(self), endpoint=True)
+        crop_height = self.rng.integers(min_height, max_height, len(self), endpoint=True)
+        crop_width, crop_height = np.where(mask, crop_width, width), np.where(mask, crop_height, height)
+        x_min = self.rng.integers(0, width - crop_width, endpoint=True)
+        y_min = self.rng.integers(0, height - crop_height, endpoint=True)
+        if mask.any():
+            self._crop(x_min, y_min, x_min + crop_width, y_min + crop_height)
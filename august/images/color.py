@@ -0,0 +1,54 @@
+import numpy as np
+from PIL import Image as PILImage
+
+from . import utils
+
+
+class ColorStage:
+    """
+    Deferred point-wise color transformations of an image.
+
+    Every per-channel color map (color temperature, brightness, contrast) is a lookup table
+    with 256 entries for each of the R, G and B channels. Consecutive maps are composed into
+    a single table, so the image is converted only once, no matter how many of them were applied.
+
+    Attributes:
+        lut (np.ndarray or None): 3x256 lookup table of pending transformations.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the ColorStage object.
+        """
+        self.lut: np.ndarray | None = None
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether there are any transformations waiting to be applied.
+        """
+        return self.lut is not None
+
+    def point(self, lut: list[int]) -> None:
+        """
+        Append a per-channel color map.
+
+        Args:
+            lut (list[int]): Lookup table with 256 entries for each of the R, G and B channels.
+        """
+        lut = np.asarray(lut).reshape(3, 256)
+        self.lut = lut if self.lut is None else np.take_along_axis(lut, self.lut, axis=1)
+
+    def apply(self, img: PILImage.Image) -> PILImage.Image:
+        """
+        Apply all pending transformations to the image in a single pass.
+
+        Args:
+            img (PIL.Image.Image): The source image.
+
+        Returns:
+            PIL.Image.Image: The transformed image, in RGB mode if any transformation was pending.
+        """
+        if not self.pending:
+            return img
+        return utils.to_rgb(img).point(self.lut.flatten().tolist())
@@ -1,11 +1,47 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+NoiseType = Literal["gaussian", "salt_and_pepper", "poisson"]
+BlurType = Literal["box", "gaussian", "motion"]
+OutputFormat = Literal["png", "jpeg", "webp"]
+EncodePreset = Literal["fast", "small"]
+
 
 class AugustImageConfig(BaseModel):
     """
     Model storing configuration data for AugustImage class
     """
 
+    target_size: int | None = Field(
+        None,
+        description="Maximal size of the longer image side, larger images are downscaled on load",
+        gt=0,
+    )
+
+    tile_size: int = Field(
+        1024, description="Size of square tiles processed at once in tiled mode", gt=0
+    )
+
+    output_format: OutputFormat | None = Field(
+        None, description="Format of augmented images, the format of the file name is used if None"
+    )
+    encode_preset: EncodePreset | None = Field(
+        None, description="Encoding preset overriding quality, compression and optimization settings"
+    )
+    quality: int | None = Field(
+        None,
+        description="JPEG and WebP quality, PIL defaults (75 for JPEG, 80 for WebP) if None",
+        ge=1,
+        le=100,
+    )
+    compress_level: int = Field(6, description="PNG compression level", ge=0, le=9)
+    optimize: bool = Field(False, description="Optimize JPEG and PNG encoding for size")
+    progressive: bool = Field(False, description="Save progressive JPEG images")
+    writer_threads: int = Field(
+        1, description="Number of background threads encoding images, 0 encodes in the worker", ge=0
+    )
+
     mirror_p: float = Field(0.5, description="Mirror probability", ge=0, le=1)
     flip_p: float = Field(0.5, description="Flip probability", ge=0, le=1)
     color_p: float = Field(0.5, description="Color change probability", ge=0, le=1)
@@ -14,6 +50,14 @@ class AugustImageConfig(BaseModel):
     min_temperature_ratio: int = Field(-50, description="Minimal color temperature change ratio")
     max_temperature_ratio: int = Field(50, description="Maximum color temperature change ratio")
 
+    brightness_p: float = Field(0, description="Brightness probability", ge=0, le=1)
+    min_brightness: float = Field(0.7, description="Minimal brightness factor", ge=0)
+    max_brightness: float = Field(1.3, description="Maximum brightness factor", ge=0)
+
+    contrast_p: float = Field(0, description="Contrast probability", ge=0, le=1)
+    min_contrast: float = Field(0.7, description="Minimal contrast factor", ge=0)
+    max_contrast: float = Field(1.3, description="Maximum contrast factor", ge=0)
+
     rotate_p: float = Field(0.5, description="Rotate probability", ge=0, le=1)
     min_angle: int = Field(-89, description="Minimal rotate angle")
     max_angle: int = Field(89, description="Maximum rotate angle")
@@ -21,6 +65,30 @@ class AugustImageConfig(BaseModel):
     blur_p: float = Field(0.5, description="Blur probability", ge=0, le=1)
     min_pixel_radius: int = Field(1, description="Minimal blur pixel radius")
     max_pixel_radius: int = Field(5, description="Maximum blur pixel radius")
+    blur_types: tuple[BlurType, ...] = Field(
+        ("box",),
+        description="Types of blur to choose from, gaussian and motion are opt-in",
+        min_length=1,
+    )
+    blur_quality: Literal["exact", "fast"] = Field(
+        "exact", description="Blur quality, fast blurs downscaled images for large radiuses"
+    )
+
+    noise_p: float = Field(0, description="Noise probability", ge=0, le=1)
+    noise_types: tuple[NoiseType, ...] = Field(
+        ("gaussian", "salt_and_pepper", "poisson"),
+        description="Types of noise to choose from",
+        min_length=1,
+    )
+    min_noise_std: float = Field(0, description="Minimal standard deviation of noise", ge=0)
+    max_noise_std: float = Field(20, description="Maximum standard deviation of noise", ge=0)
+    min_salt_pepper_amount: float = Field(
+        0.01, description="Minimal part of pixels changed by salt and pepper noise", ge=0, le=1
+    )
+    max_salt_pepper_amount: float = Field(
+        0.05, description="Maximum part of pixels changed by salt and pepper noise", ge=0, le=1
+    )
+    noise_tile_size: int = Field(256, description="Size of pre-generated noise tiles", gt=0)
 
     offset_p: float = Field(0.5, description="Offset probability", ge=0, le=1)
     min_x_offset: float = Field(-0.5, description="Minimal offset in x axis", ge=-1, le=1)
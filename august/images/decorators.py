@@ -6,3 +6,17 @@ class AugustImageMark(metaclass=MarkAugmentationMeta):
 
 
 mark_augmentation = AugustImageMark.mark_augmentation
+
+
+class AugustImageBatchMark(metaclass=MarkAugmentationMeta):
+    pass
+
+
+mark_batch_augmentation = AugustImageBatchMark.mark_augmentation
+
+
+class AugustTiledImageMark(metaclass=MarkAugmentationMeta):
+    pass
+
+
+mark_tiled_augmentation = AugustTiledImageMark.mark_augmentation
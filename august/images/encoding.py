@@ -0,0 +1,192 @@
+import struct
+import zlib
+from pathlib import Path
+from typing import Self
+
+import numpy as np
+from PIL import Image as PILImage
+
+from august.images.config import AugustImageConfig
+
+OUTPUT_EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+# settings overridden by encoding presets, "method" is the WebP encoder effort (0 is the fastest)
+ENCODE_PRESETS = {
+    "fast": {"compress_level": 1, "optimize": False, "progressive": False, "method": 0},
+    "small": {"compress_level": 9, "optimize": True, "progressive": True, "method": 6},
+}
+
+# save options used by every format, other formats are saved with PIL defaults
+FORMAT_OPTIONS = {
+    "png": ("compress_level", "optimize"),
+    "jpeg": ("quality", "optimize", "progressive"),
+    "webp": ("quality", "method"),
+}
+
+
+def output_path(filename: str | Path, config: AugustImageConfig) -> Path:
+    """
+    Get the path of an output file, with the extension of the configured output format.
+
+    Args:
+        filename (str or Path): The requested path of the output file.
+        config (AugustImageConfig): The configuration settings with encoding options.
+
+    Returns:
+        Path: The path of the output file.
+    """
+    path = Path(filename)
+    if config.output_format is None:
+        return path
+    return path.with_suffix(OUTPUT_EXTENSIONS[config.output_format])
+
+
+def save_options(image_format: str, config: AugustImageConfig) -> dict:
+    """
+    Get PIL save options of an image format.
+
+    Args:
+        image_format (str): The lowercase PIL name of the format, such as "png" or "jpeg".
+        config (AugustImageConfig): The configuration settings with encoding options.
+
+    Returns:
+        dict: Keyword arguments for PIL.Image.Image.save.
+    """
+    options = {
+        "quality": config.quality,
+        "compress_level": config.compress_level,
+        "optimize": config.optimize,
+        "progressive": config.progressive,
+        "method": 4,
+    }
+    if config.encode_preset is not None:
+        options.update(ENCODE_PRESETS[config.encode_preset])
+    # unset options keep PIL defaults
+    return {
+        key: options[key] for key in FORMAT_OPTIONS.get(image_format, ()) if options[key] is not None
+    }
+
+
+def save_image(img: PILImage.Image, filename: str | Path, config: AugustImageConfig) -> Path:
+    """
+    Encode an image with the configured format and options and save it to a file.
+
+    Args:
+        img (PIL.Image.Image): The image to save.
+        filename (str or Path): The requested path of the output file, its extension is replaced
+            if an output format is configured.
+        config (AugustImageConfig): The configuration settings with encoding options.
+
+    Returns:
+        Path: The path of the saved file.
+
+    Raises:
+        ValueError: If the output format can't be determined from the file name.
+    """
+    path = output_path(filename, config)
+    image_format = config.output_format or PILImage.registered_extensions().get(path.suffix.lower())
+    if image_format is None:
+        raise ValueError(f"Image format of {path.name} is unexpected.")
+    image_format = image_format.lower()
+    if image_format == "jpeg" and img.mode not in ("RGB", "L", "CMYK"):
+        img = img.convert("RGB")
+    img.save(path, format=image_format, **save_options(image_format, config))
+    return path
+
+
+# number of rows filtered and compressed at once by PngWriter
+PNG_BLOCK_ROWS = 64
+
+
+class PngWriter:
+    """
+    A streaming encoder of 8-bit RGB PNG files, written band of rows by band of rows.
+
+    Rows are encoded with the PNG "up" filter, which needs only the previous row, and compressed
+    with one zlib stream, so memory use is bounded by the size of a band, not of the image.
+
+    Args:
+        path (str or Path): The path of the output file.
+        size (tuple[int, int]): The size of the image.
+        compress_level (int, optional): The zlib compression level. Defaults to 6.
+
+    Attributes:
+        size (tuple[int, int]): The size of the image.
+    """
+
+    def __init__(self, path: str | Path, size: tuple[int, int], compress_level: int = 6) -> None:
+        """
+        Initialize the PngWriter object and write the PNG header.
+
+        Args:
+            path (str or Path): The path of the output file.
+            size (tuple[int, int]): The size of the image.
+            compress_level (int, optional): The zlib compression level. Defaults to 6.
+        """
+        self.size = size
+        width, height = size
+        self._file = open(path, "wb")  # noqa: SIM115, the writer owns the handle and close releases it
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        # 8 bits per channel, truecolor, default compression, filtering and no interlacing
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        self._compressor = zlib.compressobj(compress_level)
+        self._previous = np.zeros((1, width, 3), dtype=np.uint8)
+        self._rows = 0
+
+    def _chunk(self, chunk_type: bytes, data: bytes) -> None:
+        """
+        Write a PNG chunk.
+
+        Args:
+            chunk_type (bytes): The four letter type of the chunk.
+            data (bytes): The data of the chunk.
+        """
+        self._file.write(struct.pack(">I", len(data)) + chunk_type + data)
+        self._file.write(struct.pack(">I", zlib.crc32(chunk_type + data)))
+
+    def write(self, rows: np.ndarray) -> None:
+        """
+        Encode the next rows of the image.
+
+        Args:
+            rows (np.ndarray): uint8 array of shape (rows, width, 3).
+        """
+        for start in range(0, len(rows), PNG_BLOCK_ROWS):
+            block = rows[start : start + PNG_BLOCK_ROWS]
+            previous = np.concatenate([self._previous, block[:-1]])
+            filtered = np.empty((len(block), 1 + block[0].size), dtype=np.uint8)
+            # filter type of every row, followed by differences to the row above (modulo 256)
+            filtered[:, 0] = 2
+            np.subtract(block, previous, out=filtered[:, 1:].reshape(block.shape))
+            data = self._compressor.compress(filtered)
+            if data:
+                self._chunk(b"IDAT", data)
+            self._previous = block[-1:].copy()
+        self._rows += len(rows)
+
+    def close(self) -> None:
+        """
+        Finish the compressed stream and close the file.
+
+        Raises:
+            ValueError: If the number of written rows doesn't match the image height.
+        """
+        if self._file.closed:
+            return
+        try:
+            self._chunk(b"IDAT", self._compressor.flush())
+            self._chunk(b"IEND", b"")
+        finally:
+            self._file.close()
+        if self._rows != self.size[1]:
+            raise ValueError(f"PNG image of height {self.size[1]} got {self._rows} rows.")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # the image is incomplete anyway, keep the original error
+            self._file.close()
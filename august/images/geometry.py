@@ -0,0 +1,212 @@
+import math
+
+import numpy as np
+from PIL import Image as PILImage
+
+# PIL resamples affine transformations with 16.16 fixed point coordinates
+FIXED_POINT_ONE = 1 << 16
+
+
+def _fix(value: float) -> int:
+    """
+    Convert a coordinate or a coordinate step to 16.16 fixed point, rounding the way PIL does.
+
+    Args:
+        value (float): The coordinate or step.
+
+    Returns:
+        int: The fixed point value.
+    """
+    return math.floor(value * FIXED_POINT_ONE + 0.5)
+
+
+class GeometryStage:
+    """
+    Deferred geometric transformations of an image.
+
+    Mirror, flip, rotate and crop operations are collected into a single affine matrix and an output
+    window instead of being applied one by one. The matrix maps output pixel coordinates to source
+    pixel coordinates (the same convention as PIL.Image.transform), so the whole chain is resampled
+    only once, and only for the pixels of the final output window.
+
+    PIL samples rotations with nearest neighbours in 16.16 fixed point, stepping from pixel to pixel.
+    Once a rotation is pending, the chain is also kept as the fixed point coefficients PIL would use,
+    and mirrors, flips and crops around the rotation are composed into them with integer arithmetic,
+    so the single pass picks exactly the same source pixels as applying the operations one by one.
+
+    A rotation can only be composed with pending mirrors and flips. A rotation after a crop needs the
+    crop to be applied first (a copy of the window, without resampling), and a rotation after another
+    rotation needs both to be resampled, so that the corners filled by the first one stay black.
+
+    Args:
+        size (tuple[int, int]): The size of the source image.
+
+    Attributes:
+        source_size (tuple[int, int]): The size of the source image.
+        size (tuple[int, int]): The size of the image after pending transformations.
+        matrix (np.ndarray): 3x3 matrix mapping output coordinates to source coordinates.
+        frame_preserving (bool): Whether pending transformations keep every source pixel in the frame,
+            which is true as long as only mirror and flip are pending.
+    """
+
+    def __init__(self, size: tuple[int, int]) -> None:
+        """
+        Initialize the GeometryStage object.
+
+        Args:
+            size (tuple[int, int]): The size of the source image.
+        """
+        self.source_size = size
+        self.size = size
+        self.matrix = np.identity(3)
+        self.frame_preserving = True
+        # fixed point coefficients of a pending rotation, in the order of PIL affine data
+        self._fixed: list[int] | None = None
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether there are any transformations waiting to be applied.
+        """
+        return self.size != self.source_size or not np.array_equal(self.matrix, np.identity(3))
+
+    @property
+    def axis_aligned(self) -> bool:
+        """
+        Whether pending transformations only move pixels around, without filling any new ones.
+        """
+        return self._source_box() is not None
+
+    def _compose(self, matrix: list[list[float]]) -> None:
+        """
+        Append a transformation, given as a matrix mapping new output coordinates to current ones.
+
+        Args:
+            matrix (list[list[float]]): 3x3 transformation matrix.
+        """
+        self.matrix = self.matrix @ np.array(matrix, dtype=np.float64)
+
+    def mirror(self) -> None:
+        """
+        Mirror the image horizontally (left to right).
+        """
+        width, _ = self.size
+        self._compose([[-1, 0, width], [0, 1, 0], [0, 0, 1]])
+        if self._fixed is not None:
+            a, b, c, d, e, f = self._fixed
+            self._fixed = [-a, b, c + (width - 1) * a, -d, e, f + (width - 1) * d]
+
+    def flip(self) -> None:
+        """
+        Flip the image vertically (top to bottom).
+        """
+        _, height = self.size
+        self._compose([[1, 0, 0], [0, -1, height], [0, 0, 1]])
+        if self._fixed is not None:
+            a, b, c, d, e, f = self._fixed
+            self._fixed = [a, -b, c + (height - 1) * b, d, -e, f + (height - 1) * e]
+
+    def crop(self, x_min: int, y_min: int, x_max: int, y_max: int) -> None:
+        """
+        Crop a rectangular region from the image.
+
+        Args:
+            x_min (int): The minimum X-coordinate of the cropping region.
+            y_min (int): The minimum Y-coordinate of the cropping region.
+            x_max (int): The maximum X-coordinate of the cropping region.
+            y_max (int): The maximum Y-coordinate of the cropping region.
+        """
+        self._compose([[1, 0, x_min], [0, 1, y_min], [0, 0, 1]])
+        if self._fixed is not None:
+            a, b, c, d, e, f = self._fixed
+            self._fixed = [a, b, c + x_min * a + y_min * b, d, e, f + x_min * d + y_min * e]
+        self.size = (x_max - x_min, y_max - y_min)
+        self.frame_preserving = False
+
+    def rotate(self, angle: float) -> None:
+        """
+        Rotate the image by a specified angle around its center, keeping its size.
+
+        The matrix is built the same way as in PIL.Image.rotate. Rotation samples points outside
+        of the current frame, so it should be only composed with a frame preserving stage,
+        otherwise pixels cut off by earlier transformations would come back.
+
+        Args:
+            angle (float): The angle in degrees to rotate the image.
+
+        Raises:
+            ValueError: If a pending transformation is not frame preserving.
+        """
+        if self.pending and not self.frame_preserving:
+            raise ValueError("Rotation can be only composed with pending mirrors and flips.")
+        width, height = self.size
+        center_x, center_y = width / 2, height / 2
+        angle = -math.radians(angle % 360.0)
+        a, b = round(math.cos(angle), 15), round(math.sin(angle), 15)
+        d, e = round(-math.sin(angle), 15), round(math.cos(angle), 15)
+        c = a * -center_x + b * -center_y + center_x
+        f = d * -center_x + e * -center_y + center_y
+        # PIL starts sampling at the center of the first pixel
+        fixed = [
+            _fix(a),
+            _fix(b),
+            _fix(c + a * 0.5 + b * 0.5),
+            _fix(d),
+            _fix(e),
+            _fix(f + d * 0.5 + e * 0.5),
+        ]
+        # a pending mirror maps a source coordinate x in fixed point to (width - 1 / 2^16) - x,
+        # which picks the mirrored pixel of any sampled position, the same for a pending flip
+        if self.matrix[0, 0] < 0:
+            fixed[:3] = [-fixed[0], -fixed[1], width * FIXED_POINT_ONE - 1 - fixed[2]]
+        if self.matrix[1, 1] < 0:
+            fixed[3:] = [-fixed[3], -fixed[4], height * FIXED_POINT_ONE - 1 - fixed[5]]
+        self._fixed = fixed
+        self._compose([[a, b, c], [d, e, f], [0, 0, 1]])
+        self.frame_preserving = False
+
+    def _source_box(self) -> tuple[int, int, int, int] | None:
+        """
+        Get the source region of an axis aligned transformation (only mirror, flip and crop pending).
+
+        Returns:
+            tuple[int, int, int, int] or None: The source crop box, or None if the transformation
+            is not axis aligned with integer offsets.
+        """
+        (a, b, c), (d, e, f) = self.matrix[:2]
+        if b != 0 or d != 0 or abs(a) != 1 or abs(e) != 1 or c != int(c) or f != int(f):
+            return None
+        width, height = self.size
+        x_min = int(c) if a > 0 else int(c) - width
+        y_min = int(f) if e > 0 else int(f) - height
+        return x_min, y_min, x_min + width, y_min + height
+
+    def apply(self, img: PILImage.Image) -> PILImage.Image:
+        """
+        Apply all pending transformations to the image in a single pass.
+
+        Axis aligned transformations crop the source first and then transpose only the cropped
+        region, any other transformation is resampled with one affine PIL.Image.transform call,
+        with coefficients PIL converts back to exactly the composed fixed point ones.
+
+        Args:
+            img (PIL.Image.Image): The source image.
+
+        Returns:
+            PIL.Image.Image: The transformed image.
+        """
+        if not self.pending:
+            return img
+        box = self._source_box()
+        if box is None:
+            # all values are multiples of 2^-17 well within double precision, so PIL rounds them exactly
+            a, b, c, d, e, f = (value / FIXED_POINT_ONE for value in self._fixed)
+            data = (a, b, c - a * 0.5 - b * 0.5, d, e, f - d * 0.5 - e * 0.5)
+            return img.transform(self.size, PILImage.AFFINE, data, resample=PILImage.NEAREST)
+        if box != (0, 0) + img.size:
+            img = img.crop(box)
+        if self.matrix[0, 0] < 0:
+            img = img.transpose(PILImage.FLIP_LEFT_RIGHT)
+        if self.matrix[1, 1] < 0:
+            img = img.transpose(PILImage.FLIP_TOP_BOTTOM)
+        return img
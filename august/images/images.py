@@ -1,10 +1,14 @@
+import copy
 import random
 from pathlib import Path
 
 from PIL import Image as PILImage
 
+from august.images import encoding, utils
+from august.images.color import ColorStage
 from august.images.config import AugustImageConfig
 from august.images.decorators import AugustImageMark, mark_augmentation
+from august.images.geometry import GeometryStage
 from august.images.mixins import AugustImageMixin
 from august.mixins import ExecuteAugmentationMixin
 
@@ -14,7 +18,8 @@ class AugustImage(AugustImageMixin, ExecuteAugmentationMixin):
     A class for augmenting and processing images using various augmentation methods.
 
     This class provides methods for augmenting images with techniques like mirroring, flipping,
-    color changes, color temperature adjustments, rotation, blurring, offset, and cropping.
+    color changes, color temperature, brightness and contrast adjustments, rotation, noise, blurring,
+    offset, and cropping.
 
     Args:
         audio_path (str or Path): The path to the input image.
@@ -35,17 +40,64 @@ class AugustImage(AugustImageMixin, ExecuteAugmentationMixin):
             audio_path (str or Path): The path to the input image.
             config (AugustImageConfig, optional): Configuration settings for image augmentation. Defaults to AugustImageConfig().
         """
-        self.img = PILImage.open(audio_path)
+        self._img = PILImage.open(audio_path)
+        if config.target_size is not None:
+            self._img = utils.downscale(self._img, config.target_size)
+        self._geometry = GeometryStage(self._img.size)
+        self._color = ColorStage()
         self.config = config
 
-    def save(self, filename: str | Path) -> None:
+    @property
+    def img(self) -> PILImage.Image:
         """
-        Save the augmented image to a file.
+        The augmented image, with all pending transformations applied.
+        """
+        self._apply_pending()
+        return self._img
+
+    @img.setter
+    def img(self, img: PILImage.Image) -> None:
+        self._img = img
+        self._geometry = GeometryStage(img.size)
+        self._color = ColorStage()
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """
+        The size of the augmented image, without applying pending geometric transformations.
+        """
+        return self._geometry.size
+
+    def augment(self) -> None:
+        """
+        Execute augmentations and apply collected geometric and color transformations in a single pass.
+        """
+        super().augment()
+        self._apply_pending()
+
+    def copy(self) -> "AugustImage":
+        """
+        Create an independent copy of the augmented image, without decoding the source file again.
+
+        Returns:
+            AugustImage: The copy, sharing configuration with this object.
+        """
+        clone = copy.copy(self)
+        clone.img = self.img.copy()
+        return clone
+
+    def save(self, filename: str | Path) -> Path:
+        """
+        Save the augmented image to a file, encoded with the configured format and options.
 
         Args:
-            filename (str or Path): The path to the file where the augmented image will be saved.
+            filename (str or Path): The path to the file where the augmented image will be saved,
+                its extension is replaced if an output format is configured.
+
+        Returns:
+            Path: The path of the saved file.
         """
-        self.img.save(filename)
+        return encoding.save_image(self.img, filename, self.config)
 
     def show(self, title: str | None = None) -> None:
         """
@@ -90,6 +142,24 @@ class AugustImage(AugustImageMixin, ExecuteAugmentationMixin):
             ratio = random.randint(self.config.min_temperature_ratio, self.config.max_temperature_ratio)
             self._color_temperature(ratio)
 
+    @mark_augmentation
+    def brightness(self) -> None:
+        """
+        Adjust the brightness of the image if the random probability is within the configured range.
+        """
+        if random.random() <= self.config.brightness_p:
+            factor = random.uniform(self.config.min_brightness, self.config.max_brightness)
+            self._brightness(factor)
+
+    @mark_augmentation
+    def contrast(self) -> None:
+        """
+        Adjust the contrast of the image if the random probability is within the configured range.
+        """
+        if random.random() <= self.config.contrast_p:
+            factor = random.uniform(self.config.min_contrast, self.config.max_contrast)
+            self._contrast(factor)
+
     @mark_augmentation
     def rotate(self) -> None:
         """
@@ -106,7 +176,26 @@ class AugustImage(AugustImageMixin, ExecuteAugmentationMixin):
         """
         if random.random() <= self.config.blur_p:
             pixel_radius = random.randint(self.config.min_pixel_radius, self.config.max_pixel_radius)
-            self._blur(pixel_radius)
+            blur_types = self.config.blur_types
+            # a single type draws nothing, so the default box blur keeps the random stream of earlier versions
+            blur_type = random.choice(blur_types) if len(blur_types) > 1 else blur_types[0]
+            if blur_type == "motion":
+                blur_type = random.choice(("horizontal_motion", "vertical_motion"))
+            self._blur(pixel_radius, blur_type, fast=self.config.blur_quality == "fast")
+
+    @mark_augmentation
+    def noise(self) -> None:
+        """
+        Apply noise of a random type to the image if the random probability is within the configured range.
+        """
+        if random.random() <= self.config.noise_p:
+            noise_type = random.choice(self.config.noise_types)
+            if noise_type == "salt_and_pepper":
+                min_amount = self.config.min_salt_pepper_amount
+                strength = random.uniform(min_amount, self.config.max_salt_pepper_amount)
+            else:
+                strength = random.uniform(self.config.min_noise_std, self.config.max_noise_std)
+            self._noise(noise_type, strength, tile_size=self.config.noise_tile_size)
 
     @mark_augmentation
     def offset(self) -> None:
@@ -114,7 +203,7 @@ class AugustImage(AugustImageMixin, ExecuteAugmentationMixin):
         Offset the image if the random probability is within the configured range.
         """
         if random.random() <= self.config.offset_p:
-            x, y = self.img.size
+            x, y = self.size
             x_offset = random.uniform(self.config.min_x_offset, self.config.max_x_offset)
             y_offset = random.uniform(self.config.min_y_offset, self.config.max_y_offset)
             self._offset(int(x_offset * x), int(y_offset * y))
@@ -125,7 +214,7 @@ class AugustImage(AugustImageMixin, ExecuteAugmentationMixin):
         Crop a portion of the image if the random probability is within the configured range.
         """
         if random.random() <= self.config.crop_p:
-            width, height = self.img.size
+            width, height = self.size
             min_width, max_width = self.config.min_x_crop, self.config.max_x_crop
             min_height, max_height = self.config.min_y_crop, self.config.max_y_crop
             crop_width = random.randint(int(min_width * width), int(max_width * width))
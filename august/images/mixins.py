@@ -1,7 +1,8 @@
-from PIL import Image as PILImage
-from PIL import ImageChops, ImageFilter, ImageOps
+from PIL import ImageChops
 
-from . import utils
+from . import noise, utils
+from .color import ColorStage
+from .geometry import GeometryStage
 
 
 class AugustImageMixin:
@@ -11,21 +12,57 @@ class AugustImageMixin:
     This mixin provides various image augmentation methods, such as mirroring, flipping, color adjustments,
     rotation, blurring, cropping, and more.
 
+    Mirroring, flipping, rotation and cropping are deferred: they are collected in a GeometryStage
+    and applied in a single pass when the image is needed by another operation. Point-wise color
+    maps are deferred in the same way in a ColorStage.
+
     Attributes:
         img (PIL.Image.Image): The image to be augmented.
+        _img (PIL.Image.Image): The image without pending transformations.
+        _geometry (GeometryStage): Pending geometric transformations.
+        _color (ColorStage): Pending point-wise color transformations.
     """
 
+    def _apply_pending(self) -> None:
+        """
+        Apply pending geometric and color transformations to the image.
+
+        Color maps commute with transformations that only move pixels around, so those are applied
+        first to reduce the number of pixels to convert. Color maps pending together with a rotation
+        were added before it, so they are applied first to keep the rotation fill unchanged.
+        """
+        if not self._geometry.pending and not self._color.pending:
+            return
+        if self._geometry.axis_aligned:
+            self._img = self._color.apply(self._geometry.apply(self._img))
+        else:
+            self._img = self._geometry.apply(self._color.apply(self._img))
+        self._geometry = GeometryStage(self._img.size)
+        self._color = ColorStage()
+
+    def _point(self, lut: list[int]) -> None:
+        """
+        Apply a per-channel color map to the image.
+
+        Args:
+            lut (list[int]): Lookup table with 256 entries for each of the R, G and B channels.
+        """
+        if not self._geometry.axis_aligned:
+            # pixels filled by a pending rotation must not be changed by later color maps
+            self._apply_pending()
+        self._color.point(lut)
+
     def _mirror(self) -> None:
         """
         Mirror the image horizontally (left to right).
         """
-        self.img = self.img.transpose(PILImage.FLIP_LEFT_RIGHT)
+        self._geometry.mirror()
 
     def _flip(self) -> None:
         """
         Flip the image vertically (top to bottom).
         """
-        self.img = self.img.transpose(PILImage.FLIP_TOP_BOTTOM)
+        self._geometry.flip()
 
     def _sepia(self) -> None:
         """
@@ -37,7 +74,7 @@ class AugustImageMixin:
         """
         Convert the image to black and white (grayscale).
         """
-        self.img = ImageOps.grayscale(self.img.convert("RGB"))
+        self.img = utils.black_and_white(self.img)
 
     def _color_temperature(self, ratio: int) -> None:
         """
@@ -46,7 +83,25 @@ class AugustImageMixin:
         Args:
             ratio (int): The ratio to adjust the color temperature.
         """
-        self.img = utils.change_warmth(self.img, ratio)
+        self._point(utils.warmth_lut(ratio))
+
+    def _brightness(self, factor: float) -> None:
+        """
+        Adjust the brightness of the image.
+
+        Args:
+            factor (float): The brightness factor, 1 keeps the image unchanged.
+        """
+        self._point(utils.brightness_lut(factor))
+
+    def _contrast(self, factor: float) -> None:
+        """
+        Adjust the contrast of the image.
+
+        Args:
+            factor (float): The contrast factor, 1 keeps the image unchanged.
+        """
+        self._point(utils.contrast_lut(factor))
 
     def _rotate(self, angle: float, expand: bool = False) -> None:
         """
@@ -56,22 +111,51 @@ class AugustImageMixin:
             angle (float): The angle in degrees to rotate the image.
             expand (bool, optional): Whether to expand the image canvas to fit the rotated image. Defaults to False.
         """
-        self.img = self.img.rotate(angle=angle, expand=expand)
+        if expand:
+            self.img = self.img.rotate(angle=angle, expand=expand)
+            return
+        if not self._geometry.frame_preserving:
+            # rotation would bring back pixels cut off by earlier transformations
+            self._apply_pending()
+        self._geometry.rotate(angle)
 
-    def _noise(self) -> None:
-        """
-        Apply noise to the image (not implemented).
+    def _noise(self, noise_type: str, strength: float, tile_size: int = 256) -> None:
         """
-        pass
+        Apply noise to the image, taking it from the noise bank of the current process.
 
-    def _blur(self, pixel_radius: int) -> None:
-        """
-        Apply a box blur filter to the image.
+        Args:
+            noise_type (str): The type of noise, one of "gaussian", "salt_and_pepper" and "poisson".
+            strength (float): The standard deviation of gaussian and poisson noise (in pixel values),
+                or the part of pixels changed by salt and pepper noise.
+            tile_size (int, optional): The size of noise bank tiles. Defaults to 256.
+
+        Raises:
+            ValueError: If noise type is unexpected.
+        """
+        bank = noise.get_noise_bank(tile_size)
+        match noise_type:
+            case "gaussian":
+                self.img = noise.gaussian_noise(self.img, strength, bank)
+            case "salt_and_pepper":
+                self.img = noise.salt_and_pepper_noise(self.img, strength, bank)
+            case "poisson":
+                self.img = noise.poisson_noise(self.img, strength, bank)
+            case _:
+                raise ValueError(
+                    "Noise type is unexpected. Only support gaussian, salt_and_pepper and poisson."
+                )
+
+    def _blur(self, pixel_radius: int, blur_type: str = "box", fast: bool = False) -> None:
+        """
+        Apply a blur filter to the image.
 
         Args:
             pixel_radius (int): The pixel radius for the blur filter.
+            blur_type (str, optional): The type of blur, one of "box", "gaussian", "horizontal_motion"
+                and "vertical_motion". Defaults to "box".
+            fast (bool, optional): Whether to blur a downscaled image for large radiuses. Defaults to False.
         """
-        self.img = self.img.filter(ImageFilter.BoxBlur(pixel_radius))
+        self.img = utils.blur(self.img, blur_type, pixel_radius, fast=fast)
 
     def _crop(self, x_min: int, y_min: int, x_max: int, y_max: int) -> None:
         """
@@ -83,7 +167,7 @@ class AugustImageMixin:
             x_max (int): The maximum X-coordinate of the cropping region.
             y_max (int): The maximum Y-coordinate of the cropping region.
         """
-        self.img = self.img.crop((x_min, y_min, x_max, y_max))
+        self._geometry.crop(x_min, y_min, x_max, y_max)
 
     def _offset(self, x_offset: int, y_offset: int) -> None:
         """
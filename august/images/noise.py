@@ -0,0 +1,253 @@
+import random
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image as PILImage
+
+from . import utils
+
+BANK_TILES = 4
+
+
+class NoiseBank:
+    """
+    A bank of pre-generated noise tiles.
+
+    Generating random values for every pixel of every image is one of the most expensive parts
+    of adding noise. The bank generates a few tiles once, and noise fields of any size are assembled
+    from a randomly chosen tile, tiled over the image starting at a random offset.
+
+    Args:
+        tile_size (int): The size of square noise tiles.
+        tiles (int, optional): The number of tiles of every kind. Defaults to BANK_TILES.
+
+    Attributes:
+        tile_size (int): The size of square noise tiles.
+        normal (np.ndarray): Standard normal tiles of shape (tiles, tile_size, tile_size, 3).
+        uniform (np.ndarray): Uniform [0, 1) tiles of shape (tiles, tile_size, tile_size).
+    """
+
+    def __init__(self, tile_size: int, tiles: int = BANK_TILES) -> None:
+        """
+        Initialize the NoiseBank object.
+
+        Args:
+            tile_size (int): The size of square noise tiles.
+            tiles (int, optional): The number of tiles of every kind. Defaults to BANK_TILES.
+        """
+        rng = np.random.default_rng()
+        self.tile_size = tile_size
+        self.normal = rng.standard_normal((tiles, tile_size, tile_size, 3), dtype=np.float32)
+        self.uniform = rng.random((tiles, tile_size, tile_size), dtype=np.float32)
+
+    def origin(self) -> tuple[int, int, int]:
+        """
+        Draw a random tile and a random offset within it.
+
+        Returns:
+            tuple[int, int, int]: Tile index, Y offset and X offset.
+        """
+        return (
+            random.randrange(len(self.normal)),
+            random.randrange(self.tile_size),
+            random.randrange(self.tile_size),
+        )
+
+    def _field(
+        self, tiles: np.ndarray, height: int, width: int, origin: tuple[int, int, int] | None
+    ) -> np.ndarray:
+        """
+        Assemble a noise field from a tile, tiled over the field starting at an offset.
+
+        Args:
+            tiles (np.ndarray): The tiles to choose from.
+            height (int): The height of the field.
+            width (int): The width of the field.
+            origin (tuple[int, int, int] or None): Tile index and offsets, drawn randomly if None.
+
+        Returns:
+            np.ndarray: The noise field of shape (height, width, ...).
+        """
+        index, y_offset, x_offset = origin if origin is not None else self.origin()
+        # widen the small tile first, so that only the final field has the size of the image
+        field = tiles[index].take(np.arange(x_offset, x_offset + width), axis=1, mode="wrap")
+        return field.take(np.arange(y_offset, y_offset + height), axis=0, mode="wrap")
+
+    def normal_field(
+        self, shape: tuple[int, ...], origin: tuple[int, int, int] | None = None
+    ) -> np.ndarray:
+        """
+        Get a standard normal noise field.
+
+        Args:
+            shape (tuple[int, ...]): The shape of the field, (height, width) or (height, width, channels).
+            origin (tuple[int, int, int] or None, optional): Tile index and offsets. Defaults to None (random).
+
+        Returns:
+            np.ndarray: float32 noise field of the given shape.
+        """
+        field = self._field(self.normal, shape[0], shape[1], origin)
+        return field[..., : shape[2]] if len(shape) == 3 else field[..., 0]
+
+    def uniform_field(
+        self, shape: tuple[int, ...], origin: tuple[int, int, int] | None = None
+    ) -> np.ndarray:
+        """
+        Get a uniform [0, 1) noise field, shared by all channels of a pixel.
+
+        Args:
+            shape (tuple[int, ...]): The shape of the image, only height and width are used.
+            origin (tuple[int, int, int] or None, optional): Tile index and offsets. Defaults to None (random).
+
+        Returns:
+            np.ndarray: float32 noise field of shape (height, width).
+        """
+        return self._field(self.uniform, shape[0], shape[1], origin)
+
+
+@lru_cache
+def get_noise_bank(tile_size: int) -> NoiseBank:
+    """
+    Get the noise bank of the current process, generating it on first use.
+
+    Args:
+        tile_size (int): The size of square noise tiles.
+
+    Returns:
+        NoiseBank: The noise bank.
+    """
+    return NoiseBank(tile_size)
+
+
+def _noise_pixels(img: PILImage.Image) -> np.ndarray:
+    """
+    Get pixels of an image as an array, converting modes other than grayscale to RGB.
+
+    Args:
+        img (PIL.Image.Image): The input image.
+
+    Returns:
+        np.ndarray: uint8 array of shape (height, width) or (height, width, 3).
+    """
+    return np.asarray(img if img.mode == "L" else utils.to_rgb(img))
+
+
+def _to_pixels(values: np.ndarray) -> np.ndarray:
+    """
+    Round and clip noisy pixel values in place and convert them back to uint8.
+
+    Args:
+        values (np.ndarray): float array of pixel values.
+
+    Returns:
+        np.ndarray: uint8 array of pixel values.
+    """
+    np.rint(values, out=values)
+    np.clip(values, 0, 255, out=values)
+    return values.astype(np.uint8)
+
+
+def add_gaussian_noise(pixels: np.ndarray, std: float, field: np.ndarray) -> np.ndarray:
+    """
+    Add Gaussian noise to an array of pixels.
+
+    Args:
+        pixels (np.ndarray): uint8 array of pixel values.
+        std (float): The standard deviation of noise, in pixel values.
+        field (np.ndarray): Standard normal noise field of the same shape, modified in place.
+
+    Returns:
+        np.ndarray: uint8 array of noisy pixel values.
+    """
+    field *= np.float32(std)
+    field += pixels
+    return _to_pixels(field)
+
+
+def add_poisson_noise(pixels: np.ndarray, std: float, field: np.ndarray) -> np.ndarray:
+    """
+    Add Poisson (shot) noise to an array of pixels.
+
+    The noise is approximated with Gaussian noise whose variance grows linearly with the pixel value,
+    as for the Poisson distribution, reaching the given standard deviation at full intensity.
+
+    Args:
+        pixels (np.ndarray): uint8 array of pixel values.
+        std (float): The standard deviation of noise at full intensity, in pixel values.
+        field (np.ndarray): Standard normal noise field of the same shape, modified in place.
+
+    Returns:
+        np.ndarray: uint8 array of noisy pixel values.
+    """
+    field *= np.sqrt(pixels / np.float32(255))
+    field *= np.float32(std)
+    field += pixels
+    return _to_pixels(field)
+
+
+def add_salt_and_pepper_noise(pixels: np.ndarray, amount: float, field: np.ndarray) -> np.ndarray:
+    """
+    Set a random part of an array of pixels to black or white.
+
+    Args:
+        pixels (np.ndarray): uint8 array of pixel values.
+        amount (float): The part of pixels to change, half of them become black and half white.
+        field (np.ndarray): Uniform [0, 1) noise field of shape (height, width).
+
+    Returns:
+        np.ndarray: uint8 array of noisy pixel values.
+    """
+    pixels = pixels.copy()
+    pixels[field < amount / 2] = 0
+    pixels[field >= 1 - amount / 2] = 255
+    return pixels
+
+
+def gaussian_noise(img: PILImage.Image, std: float, bank: NoiseBank) -> PILImage.Image:
+    """
+    Add Gaussian noise to an image.
+
+    Args:
+        img (PIL.Image.Image): The input image.
+        std (float): The standard deviation of noise, in pixel values.
+        bank (NoiseBank): The noise bank to take noise from.
+
+    Returns:
+        PIL.Image.Image: The noisy image.
+    """
+    pixels = _noise_pixels(img)
+    return PILImage.fromarray(add_gaussian_noise(pixels, std, bank.normal_field(pixels.shape)))
+
+
+def poisson_noise(img: PILImage.Image, std: float, bank: NoiseBank) -> PILImage.Image:
+    """
+    Add Poisson (shot) noise to an image.
+
+    Args:
+        img (PIL.Image.Image): The input image.
+        std (float): The standard deviation of noise at full intensity, in pixel values.
+        bank (NoiseBank): The noise bank to take noise from.
+
+    Returns:
+        PIL.Image.Image: The noisy image.
+    """
+    pixels = _noise_pixels(img)
+    return PILImage.fromarray(add_poisson_noise(pixels, std, bank.normal_field(pixels.shape)))
+
+
+def salt_and_pepper_noise(img: PILImage.Image, amount: float, bank: NoiseBank) -> PILImage.Image:
+    """
+    Set a random part of pixels of an image to black or white.
+
+    Args:
+        img (PIL.Image.Image): The input image.
+        amount (float): The part of pixels to change, half of them become black and half white.
+        bank (NoiseBank): The noise bank to take noise from.
+
+    Returns:
+        PIL.Image.Image: The noisy image.
+    """
+    pixels = _noise_pixels(img)
+    return PILImage.fromarray(
+        add_salt_and_pepper_noise(pixels, amount, bank.uniform_field(pixels.shape))
+    )
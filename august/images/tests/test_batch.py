@@ -0,0 +1,81 @@
+import numpy as np
+from PIL import Image, ImageChops
+
+from .. import utils
+from ..batch import AugustImageBatch
+from ..config import AugustImageConfig
+from ..decorators import AugustImageBatchMark, mark_batch_augmentation
+
+
+def _batch(n: int = 4) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (n, 30, 40, 3), dtype=np.uint8)
+
+
+def test_mirror_and_flip():
+    images = _batch()
+    batch = AugustImageBatch(images)
+    mask = np.array([True, False, True, False])
+    batch._mirror(mask)
+    batch._flip(mask)
+
+    for image, augmented, selected in zip(images, batch.images, mask):
+        expected = Image.fromarray(image)
+        if selected:
+            expected = expected.transpose(Image.FLIP_LEFT_RIGHT).transpose(Image.FLIP_TOP_BOTTOM)
+        assert np.array_equal(augmented, np.asarray(expected))
+
+
+def test_color_matches_single_image():
+    images = _batch()
+    batch = AugustImageBatch(images)
+    batch._sepia(np.array([True, True, False, False]))
+    batch._black_and_white(np.array([False, False, True, False]))
+    batch._color_temperature(np.array([20, 0, 0, -20]))
+
+    expected = [
+        utils.change_warmth(utils.sepia(Image.fromarray(images[0])), 20),
+        utils.sepia(Image.fromarray(images[1])),
+        utils.black_and_white(Image.fromarray(images[2])).convert("RGB"),
+        utils.change_warmth(Image.fromarray(images[3]), -20),
+    ]
+    for augmented, img in zip(batch.images, expected):
+        assert np.array_equal(augmented, np.asarray(img))
+
+
+def test_offset_matches_single_image():
+    images = _batch()
+    batch = AugustImageBatch(images)
+    batch._offset(np.array([5, 0, -7, 39]), np.array([3, -2, 0, 29]))
+
+    for image, augmented, x, y in zip(images, batch.images, (5, 0, -7, 39), (3, -2, 0, 29)):
+        assert np.array_equal(augmented, np.asarray(ImageChops.offset(Image.fromarray(image), x, y)))
+
+
+def test_augment_keeps_shape():
+    config = AugustImageConfig(
+        mirror_p=1, flip_p=1, color_p=1, temperature_p=1, noise_p=1, offset_p=1, crop_p=1
+    )
+    images = _batch(8)
+    batch = AugustImageBatch(images, config=config, rng=np.random.default_rng(1))
+    batch.augment()
+
+    assert batch.images.shape == images.shape
+    assert batch.images.dtype == np.uint8
+    assert not np.array_equal(batch.images, images)
+
+
+def test_custom_augmentation():
+    @mark_batch_augmentation
+    def invert(self) -> None:
+        self.images = 255 - self.images
+
+    try:
+        config = AugustImageConfig(
+            mirror_p=0, flip_p=0, color_p=0, temperature_p=0, noise_p=0, offset_p=0, crop_p=0
+        )
+        images = _batch()
+        batch = AugustImageBatch(images, config=config)
+        batch.augment()
+        assert np.array_equal(batch.images, 255 - images)
+    finally:
+        AugustImageBatchMark.augmentations.remove(invert)
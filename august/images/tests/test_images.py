@@ -1,9 +1,14 @@
 # tests here
+import random
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 from pixelmatch.contrib.PIL import pixelmatch
 
+from .. import utils
+from ..config import AugustImageConfig
+from ..encoding import OUTPUT_EXTENSIONS
 from ..images import AugustImage
 
 BASE_TEST_IMAGES_PATH = Path("august/images/tests/resources/")
@@ -98,3 +103,171 @@ def test_sepia():
         test_img = Image.open(BASE_TEST_IMAGES_PATH / ext / f"test_image_sepia.{ext}")
 
         assert pixelmatch(transformed.img, test_img) == 0
+
+
+def test_color_engine_matches_per_pixel_formula():
+    pixels = [(r, g, b) for r in range(0, 256, 15) for g in range(0, 256, 15) for b in range(0, 256, 5)]
+    img = Image.new("RGB", (len(pixels), 1))
+    img.putdata(pixels)
+
+    expected_sepia = [
+        (
+            min(255, int(r * 0.393 + g * 0.769 + b * 0.189)),
+            min(255, int(r * 0.349 + g * 0.686 + b * 0.168)),
+            min(255, int(r * 0.272 + g * 0.534 + b * 0.131)),
+        )
+        for r, g, b in pixels
+    ]
+    assert list(utils.sepia(img).getdata()) == expected_sepia
+
+    for ratio in (-50, 50):
+        expected_warmth = [
+            (min(max(r + ratio, 0), 255), g, min(max(b - ratio, 0), 255)) for r, g, b in pixels
+        ]
+        assert list(utils.change_warmth(img, ratio).getdata()) == expected_warmth
+
+
+def test_geometry_is_applied_in_single_pass():
+    for ext in FORMATS:
+        source = Image.open(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+        expected = (
+            source.transpose(Image.FLIP_LEFT_RIGHT)
+            .crop((50, 50, 250, 250))
+            .transpose(Image.FLIP_TOP_BOTTOM)
+            .crop((20, 10, 120, 150))
+        )
+
+        transformed = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+        transformed._mirror()
+        transformed._crop(50, 50, 250, 250)
+        transformed._flip()
+        transformed._crop(20, 10, 120, 150)
+        assert transformed.size == (100, 140)
+        assert transformed._geometry.pending
+
+        assert pixelmatch(transformed.img, expected) == 0
+        assert not transformed._geometry.pending
+
+
+def test_rotation_chain_matches_sequential_operations():
+    for ext in FORMATS:
+        source = Image.open(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+        expected = (
+            source.transpose(Image.FLIP_TOP_BOTTOM)
+            .rotate(33)
+            .transpose(Image.FLIP_LEFT_RIGHT)
+            .crop((20, 30, 250, 200))
+            .transpose(Image.FLIP_TOP_BOTTOM)
+        )
+
+        transformed = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+        transformed._flip()
+        transformed._rotate(33)
+        transformed._mirror()
+        transformed._crop(20, 30, 250, 200)
+        transformed._flip()
+        assert transformed._geometry.pending
+
+        assert pixelmatch(transformed.img, expected) == 0
+
+
+def test_copies_are_independent():
+    for ext in FORMATS:
+        expected = Image.open(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+        source = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+
+        first, second = source.copy(), source.copy()
+        first._mirror()
+        first._brightness(1.3)
+        assert pixelmatch(first.img, expected) > 0
+        assert pixelmatch(source.img, expected) == 0
+        assert pixelmatch(second.img, expected) == 0
+
+        augmented = first.img.copy()
+        second._flip()
+        source._rotate(30)
+        assert pixelmatch(second.img, expected) > 0
+        assert pixelmatch(first.img, augmented) == 0
+
+
+def test_color_maps_are_applied_in_single_pass():
+    for ext in FORMATS:
+        source = Image.open(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+        expected = (
+            utils.change_warmth(source, 20)
+            .point(utils.brightness_lut(1.2))
+            .point(utils.contrast_lut(0.8))
+        )
+
+        transformed = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+        transformed._color_temperature(20)
+        transformed._brightness(1.2)
+        transformed._contrast(0.8)
+        assert transformed._color.pending
+
+        assert pixelmatch(transformed.img, expected) == 0
+        assert not transformed._color.pending
+
+
+def test_target_size():
+    config = AugustImageConfig(target_size=100)
+    for ext in FORMATS:
+        transformed = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}", config=config)
+        width, height = Image.open(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}").size
+
+        assert max(transformed.size) == 100
+        assert abs(transformed.size[0] / transformed.size[1] - width / height) < 0.05
+
+
+def test_noise():
+    for ext in FORMATS:
+        for noise_type, strength in (("gaussian", 10), ("poisson", 10), ("salt_and_pepper", 0.1)):
+            transformed = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+            transformed._noise(noise_type, strength, tile_size=64)
+            test_img = Image.open(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+
+            assert transformed.img.size == test_img.size
+            assert not np.array_equal(np.asarray(transformed.img), np.asarray(test_img))
+
+
+def test_blur_types():
+    for ext in FORMATS:
+        for blur_type in ("box", "gaussian", "horizontal_motion", "vertical_motion"):
+            exact = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+            exact._blur(16, blur_type)
+            fast = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+            fast._blur(16, blur_type, fast=True)
+
+            assert fast.img.size == exact.img.size
+            difference = np.abs(np.asarray(fast.img, dtype=int) - np.asarray(exact.img, dtype=int))
+            assert difference.mean() < 5
+
+
+def test_default_blur_is_box_blur():
+    for ext in FORMATS:
+        config = AugustImageConfig(blur_p=1)
+        random.seed(0)
+        blurred = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}", config=config)
+        blurred.blur()
+        state = random.getstate()
+
+        random.seed(0)
+        random.random()
+        radius = random.randint(config.min_pixel_radius, config.max_pixel_radius)
+        expected = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}")
+        expected._blur(radius)
+        assert np.array_equal(np.asarray(blurred.img), np.asarray(expected.img))
+        assert random.getstate() == state
+
+
+def test_output_encoding(tmp_path):
+    for ext in FORMATS:
+        for output_format, preset in (("jpeg", None), ("png", "fast"), ("webp", "small"), (None, None)):
+            config = AugustImageConfig(output_format=output_format, encode_preset=preset)
+            transformed = AugustImage(BASE_TEST_IMAGES_PATH / ext / f"test_image.{ext}", config=config)
+            path = transformed.save(tmp_path / f"test_image.{ext}")
+
+            with Image.open(path) as saved:
+                assert saved.format == Image.registered_extensions()[path.suffix]
+                assert path.suffix == (OUTPUT_EXTENSIONS[output_format] if output_format else f".{ext}")
+                assert saved.size == transformed.img.size
@@ -0,0 +1,121 @@
+import random
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from .. import noise, tiled, utils
+from ..config import AugustImageConfig
+from ..tiled import AugustTiledImage
+
+
+@pytest.fixture
+def pixels() -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (70, 90, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def npy_path(tmp_path, pixels) -> str:
+    path = str(tmp_path / "image.npy")
+    np.save(path, pixels)
+    return path
+
+
+def _tiled(npy_path: str, tile_size: int = 32) -> AugustTiledImage:
+    return AugustTiledImage(npy_path, config=AugustImageConfig(tile_size=tile_size))
+
+
+def _result(img: AugustTiledImage, tmp_path) -> np.ndarray:
+    path = str(tmp_path / "result.npy")
+    img.save(path)
+    return np.load(path)
+
+
+def test_geometry_and_color_match_whole_image(npy_path, pixels, tmp_path):
+    img = _tiled(npy_path)
+    img._mirror()
+    img._flip()
+    img._sepia()
+    img._color_temperature(20)
+    img._brightness(1.2)
+
+    expected = Image.fromarray(pixels).transpose(Image.FLIP_LEFT_RIGHT).transpose(Image.FLIP_TOP_BOTTOM)
+    expected = utils.change_warmth(utils.sepia(expected), 20).point(utils.brightness_lut(1.2))
+    assert np.array_equal(_result(img, tmp_path), np.asarray(expected))
+
+
+@pytest.mark.parametrize("blur_type", ["box", "gaussian", "horizontal_motion", "vertical_motion"])
+def test_blur_matches_whole_image(npy_path, pixels, tmp_path, blur_type):
+    img = _tiled(npy_path, tile_size=16)
+    img._blur(3, blur_type)
+    img._blur(2, "box")
+
+    expected = utils.blur(utils.blur(Image.fromarray(pixels), blur_type, 3), "box", 2)
+    assert np.array_equal(_result(img, tmp_path), np.asarray(expected))
+
+
+@pytest.mark.parametrize("noise_type", ["gaussian", "salt_and_pepper", "poisson"])
+def test_noise_matches_whole_image(npy_path, pixels, tmp_path, noise_type):
+    strength = 0.05 if noise_type == "salt_and_pepper" else 10
+    bank = noise.get_noise_bank(64)
+    random.seed(0)
+    expected = {
+        "gaussian": noise.gaussian_noise,
+        "salt_and_pepper": noise.salt_and_pepper_noise,
+        "poisson": noise.poisson_noise,
+    }[noise_type](Image.fromarray(pixels), strength, bank)
+
+    for tile_size in (16, 50):
+        img = _tiled(npy_path, tile_size=tile_size)
+        random.seed(0)
+        img._noise(noise_type, strength, tile_size=64)
+        assert np.array_equal(_result(img, tmp_path), np.asarray(expected))
+
+
+def test_save_image(npy_path, pixels, tmp_path):
+    img = _tiled(npy_path)
+    img._black_and_white()
+    img.save(str(tmp_path / "result.png"))
+
+    expected = utils.black_and_white(Image.fromarray(pixels)).convert("RGB")
+    assert np.array_equal(np.asarray(Image.open(tmp_path / "result.png")), np.asarray(expected))
+
+
+@pytest.mark.parametrize("mode", ["RGB", "P"])
+def test_decode_large_image(pixels, tmp_path, monkeypatch, mode):
+    source = Image.fromarray(pixels).convert(mode)
+    source.save(tmp_path / "image.png")
+    # images over twice the limit are rejected by PIL as decompression bombs
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+
+    img = _tiled(str(tmp_path / "image.png"), tile_size=16)
+    assert np.array_equal(img.pixels, np.asarray(source.convert("RGB")))
+    assert Image.MAX_IMAGE_PIXELS == 100
+
+
+def test_large_image_is_saved_only_band_by_band(npy_path, pixels, tmp_path, monkeypatch):
+    monkeypatch.setattr(tiled, "MAX_ENCODED_PIXELS", 100)
+    img = _tiled(npy_path, tile_size=16)
+    img._mirror()
+
+    img.save(str(tmp_path / "result.png"))
+    expected = np.asarray(Image.fromarray(pixels).transpose(Image.FLIP_LEFT_RIGHT))
+    assert np.array_equal(np.asarray(Image.open(tmp_path / "result.png")), expected)
+    with pytest.raises(ValueError):
+        img.save(str(tmp_path / "result.jpg"))
+
+
+def test_augment_keeps_size(npy_path, tmp_path):
+    config = AugustImageConfig(
+        tile_size=32, mirror_p=1, flip_p=1, color_p=1, temperature_p=1, blur_p=1, noise_p=1
+    )
+    img = AugustTiledImage(npy_path, config=config)
+    img.augment()
+    assert _result(img, tmp_path).shape == img.pixels.shape
+
+
+def test_invalid_array(tmp_path):
+    path = str(tmp_path / "image.npy")
+    np.save(path, np.zeros((10, 10), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        AugustTiledImage(path)
@@ -0,0 +1,426 @@
+import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from PIL import Image as PILImage
+
+from august.images import encoding, noise, utils
+from august.images.config import AugustImageConfig
+from august.images.decorators import AugustTiledImageMark, mark_tiled_augmentation
+from august.images.images import AugustImage
+from august.mixins import ExecuteAugmentationMixin
+
+# operation applied to a tile of pixels, given the output coordinates (y, x) of its top left pixel
+TileOperation = Callable[[np.ndarray, int, int], np.ndarray]
+
+# largest image encoded as a whole in formats that can't be written band by band (JPEG, WebP)
+MAX_ENCODED_PIXELS = 64 * 1024 * 1024
+
+
+class _LookupTable:
+    """
+    Tile operation applying per-channel lookup tables, consecutive tables are composed into one.
+
+    Args:
+        lut (list[int]): Lookup table with 256 entries for each of the R, G and B channels.
+    """
+
+    def __init__(self, lut: list[int]) -> None:
+        self.lut = np.asarray(lut, dtype=np.uint8).reshape(3, 256)
+
+    def compose(self, lut: list[int]) -> None:
+        self.lut = np.take_along_axis(np.asarray(lut, dtype=np.uint8).reshape(3, 256), self.lut, axis=1)
+
+    def __call__(self, tile: np.ndarray, y: int, x: int) -> np.ndarray:
+        return np.stack([self.lut[channel][tile[..., channel]] for channel in range(3)], axis=-1)
+
+
+def _scratch(shape: tuple[int, ...]) -> np.memmap:
+    """
+    Create a uint8 array backed by an anonymous temporary file, removed once the array is released.
+
+    Args:
+        shape (tuple[int, ...]): The shape of the array.
+
+    Returns:
+        np.memmap: The array.
+    """
+    return np.memmap(tempfile.TemporaryFile(), dtype=np.uint8, mode="w+", shape=shape)
+
+
+@contextmanager
+def _large_images() -> Iterator[None]:
+    """
+    Disable the decompression bomb check of PIL, large images are expected in tiled mode.
+    """
+    max_pixels = PILImage.MAX_IMAGE_PIXELS
+    PILImage.MAX_IMAGE_PIXELS = None
+    try:
+        yield
+    finally:
+        PILImage.MAX_IMAGE_PIXELS = max_pixels
+
+
+def _open_pixels(image_path: str | Path, rows: int) -> np.ndarray:
+    """
+    Open an image as an array of RGB pixels, without holding the decoded image in memory.
+
+    NumPy .npy files are memory-mapped. Other formats are decoded by PIL directly into a memory-mapped
+    temporary file, laid out the way PIL stores pixels (four bytes per RGB pixel), so decoded pixels
+    are kept in pages the system can write back to disk instead of in process memory. Images in other
+    modes than RGB are then converted to RGB strip by strip into another temporary file.
+    Temporary files are created in the directory given by the TMPDIR environment variable.
+
+    Args:
+        image_path (str or Path): The path to the input image.
+        rows (int): The number of rows converted at once.
+
+    Returns:
+        np.ndarray: uint8 array of shape (height, width, 3).
+
+    Raises:
+        ValueError: If a .npy file does not contain a uint8 array of shape (height, width, 3).
+    """
+    if str(image_path).endswith(".npy"):
+        pixels = np.load(image_path, mmap_mode="r")
+        if pixels.ndim != 3 or pixels.shape[-1] != 3 or pixels.dtype != np.uint8:
+            raise ValueError("Image array should be a uint8 array of shape (height, width, 3).")
+        return pixels
+    with _large_images(), PILImage.open(image_path) as img:
+        width, height = img.size
+        # PIL stores pixels of other modes than these in four bytes at most
+        pixel_size = 1 if img.mode in ("1", "L", "P") else 2 if img.mode.startswith("I;16") else 4
+        decoded = _scratch((height, width * pixel_size))
+        target = PILImage.core.map_buffer(decoded, img.size, "raw", 0, (img.mode, width * pixel_size, 1))
+        # decoders write into the image memory prepared before loading, if it has the right mode and size
+        img.im = target
+        img.load()
+        if img.im is target and img.mode == "RGB":
+            return decoded.reshape(height, width, 4)[..., :3]
+        # images decoded by plugins into their own memory are copied the same way
+        pixels = _scratch((height, width, 3))
+        for y_min in range(0, height, rows):
+            strip = img.crop((0, y_min, width, min(height, y_min + rows)))
+            pixels[y_min : y_min + rows] = np.asarray(utils.to_rgb(strip))
+        return pixels
+
+
+class AugustTiledImage(ExecuteAugmentationMixin):
+    """
+    A class for augmenting very large images tile by tile, with memory bounded by the tile size.
+
+    Augmentations are not applied immediately, they are collected as tile operations and the whole
+    chain is applied to one tile at a time when the image is saved. Mirroring and flipping change
+    which source tile is read, point-wise operations (color changes, noise) are applied to every tile
+    independently, and blurs read tiles with a halo of neighbouring pixels wide enough to give the same
+    result as blurring the whole image. Noise depends on the pixel position, not on the tile,
+    so tiles match at their borders.
+
+    Geometric augmentations changing the image size or moving pixels between tiles (rotation, offset,
+    crop) are not supported in tiled mode.
+
+    Source images are decoded into memory-mapped temporary files. Augmented images are written band
+    of tiles by band of tiles to .npy and .png files, other formats are encoded by PIL as a whole and
+    only for images up to MAX_ENCODED_PIXELS.
+
+    Args:
+        image_path (str or Path): The path to the input image, .npy files are memory-mapped.
+        config (AugustImageConfig, optional): Configuration settings for image augmentation. Defaults to AugustImageConfig().
+
+    Attributes:
+        pixels (np.ndarray): Source pixels of shape (height, width, 3).
+        config (AugustImageConfig): The configuration settings for image augmentation.
+        mirrored (bool): Whether the image is mirrored.
+        flipped (bool): Whether the image is flipped.
+        operations (list[TileOperation]): Operations applied to every tile, in order.
+        halo (int): The number of neighbouring pixels on every side needed to process a tile.
+    """
+
+    _augmentations = AugustTiledImageMark.augmentations
+
+    def __init__(self, image_path: str | Path, config: AugustImageConfig = AugustImageConfig()) -> None:
+        """
+        Initialize the AugustTiledImage object.
+
+        Args:
+            image_path (str or Path): The path to the input image, .npy files are memory-mapped.
+            config (AugustImageConfig, optional): Configuration settings for image augmentation. Defaults to AugustImageConfig().
+        """
+        self.pixels = _open_pixels(image_path, config.tile_size)
+        self.config = config
+        self.mirrored = False
+        self.flipped = False
+        self.operations: list[TileOperation] = []
+        self.halo = 0
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """
+        The size of the image.
+        """
+        height, width, _ = self.pixels.shape
+        return width, height
+
+    def copy(self) -> "AugustTiledImage":
+        """
+        Create a copy of the image without pending augmentations, sharing source pixels with this object.
+
+        Returns:
+            AugustTiledImage: The copy.
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.pixels = self.pixels
+        clone.config = self.config
+        clone.mirrored, clone.flipped = False, False
+        clone.operations, clone.halo = [], 0
+        return clone
+
+    def _read(self, y_min: int, x_min: int, y_max: int, x_max: int) -> np.ndarray:
+        """
+        Read a region of the mirrored and flipped image from the source pixels.
+
+        Args:
+            y_min (int): The minimum Y-coordinate of the region.
+            x_min (int): The minimum X-coordinate of the region.
+            y_max (int): The maximum Y-coordinate of the region.
+            x_max (int): The maximum X-coordinate of the region.
+
+        Returns:
+            np.ndarray: uint8 array of the region pixels.
+        """
+        width, height = self.size
+        if self.flipped:
+            y_min, y_max = height - y_max, height - y_min
+        if self.mirrored:
+            x_min, x_max = width - x_max, width - x_min
+        region = self.pixels[y_min:y_max, x_min:x_max]
+        return np.array(region[:: -1 if self.flipped else 1, :: -1 if self.mirrored else 1])
+
+    def _tile(self, y_min: int, x_min: int, y_max: int, x_max: int) -> np.ndarray:
+        """
+        Compute a tile of the augmented image.
+
+        Args:
+            y_min (int): The minimum Y-coordinate of the tile.
+            x_min (int): The minimum X-coordinate of the tile.
+            y_max (int): The maximum Y-coordinate of the tile.
+            x_max (int): The maximum X-coordinate of the tile.
+
+        Returns:
+            np.ndarray: uint8 array of the tile pixels.
+        """
+        width, height = self.size
+        top, left = max(0, y_min - self.halo), max(0, x_min - self.halo)
+        bottom, right = min(height, y_max + self.halo), min(width, x_max + self.halo)
+        tile = self._read(top, left, bottom, right)
+        for operation in self.operations:
+            tile = operation(tile, top, left)
+        return tile[y_min - top : y_max - top, x_min - left : x_max - left]
+
+    def tiles(self):
+        """
+        Iterate over tiles of the augmented image.
+
+        Yields:
+            tuple[tuple[int, int, int, int], np.ndarray]: Tile region (y_min, x_min, y_max, x_max) and its pixels.
+        """
+        width, height = self.size
+        tile_size = self.config.tile_size
+        for y_min in range(0, height, tile_size):
+            for x_min in range(0, width, tile_size):
+                region = (y_min, x_min, min(height, y_min + tile_size), min(width, x_min + tile_size))
+                yield region, self._tile(*region)
+
+    def bands(self):
+        """
+        Iterate over bands of tiles of the augmented image, spanning its whole width.
+
+        Yields:
+            tuple[int, np.ndarray]: The first row of the band and its pixels.
+        """
+        width = self.size[0]
+        band = None
+        for (y_min, x_min, y_max, x_max), tile in self.tiles():
+            if x_min == 0:
+                band = np.empty((y_max - y_min, width, 3), dtype=np.uint8)
+            band[:, x_min:x_max] = tile
+            if x_max == width:
+                yield y_min, band
+
+    def save(self, filename: str | Path) -> Path:
+        """
+        Save the augmented image to a file.
+
+        Bands of tiles are written one by one to memory-mapped .npy files and streamed to .png files,
+        other formats need the whole augmented image in memory to be encoded by PIL with the configured
+        format and options, so they are supported only up to MAX_ENCODED_PIXELS.
+
+        Args:
+            filename (str or Path): The path to the file where the augmented image will be saved,
+                its extension is replaced if an output format is configured.
+
+        Returns:
+            Path: The path of the saved file.
+
+        Raises:
+            ValueError: If the image is too large to be encoded as a whole in the output format.
+        """
+        path = encoding.output_path(filename, self.config)
+        shape = self.pixels.shape
+        if path.suffix.lower() == ".png":
+            compress_level = encoding.save_options("png", self.config)["compress_level"]
+            with encoding.PngWriter(path, self.size, compress_level) as writer:
+                for _, band in self.bands():
+                    writer.write(band)
+            return path
+        if path.suffix == ".npy":
+            result = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=shape)
+        elif shape[0] * shape[1] <= MAX_ENCODED_PIXELS:
+            result = np.empty(shape, dtype=np.uint8)
+        else:
+            raise ValueError(
+                f"Image of {shape[1]}x{shape[0]} pixels is too large to be encoded as {path.suffix}, "
+                "save it as .png or .npy."
+            )
+        for y_min, band in self.bands():
+            result[y_min : y_min + len(band)] = band
+        if isinstance(result, np.memmap):
+            result.flush()
+            return path
+        return encoding.save_image(PILImage.fromarray(result), path, self.config)
+
+    def _mirror(self) -> None:
+        """
+        Mirror the image horizontally (left to right).
+        """
+        self.mirrored = not self.mirrored
+
+    def _flip(self) -> None:
+        """
+        Flip the image vertically (top to bottom).
+        """
+        self.flipped = not self.flipped
+
+    def _sepia(self) -> None:
+        """
+        Apply a sepia filter to the image.
+        """
+        self.operations.append(
+            lambda tile, y, x: utils.sepia_pixels(tile.reshape(-1, 3)).reshape(tile.shape)
+        )
+
+    def _black_and_white(self) -> None:
+        """
+        Convert the image to black and white, keeping three channels.
+        """
+        self.operations.append(
+            lambda tile, y, x: np.repeat(utils.grayscale_pixels(tile)[..., None], 3, axis=-1)
+        )
+
+    def _point(self, lut: list[int]) -> None:
+        """
+        Apply a per-channel color map to the image.
+
+        Args:
+            lut (list[int]): Lookup table with 256 entries for each of the R, G and B channels.
+        """
+        if self.operations and isinstance(self.operations[-1], _LookupTable):
+            self.operations[-1].compose(lut)
+        else:
+            self.operations.append(_LookupTable(lut))
+
+    def _color_temperature(self, ratio: int) -> None:
+        """
+        Adjust the color temperature of the image.
+
+        Args:
+            ratio (int): The ratio to adjust the color temperature.
+        """
+        self._point(utils.warmth_lut(ratio))
+
+    def _brightness(self, factor: float) -> None:
+        """
+        Adjust the brightness of the image.
+
+        Args:
+            factor (float): The brightness factor, 1 keeps the image unchanged.
+        """
+        self._point(utils.brightness_lut(factor))
+
+    def _contrast(self, factor: float) -> None:
+        """
+        Adjust the contrast of the image.
+
+        Args:
+            factor (float): The contrast factor, 1 keeps the image unchanged.
+        """
+        self._point(utils.contrast_lut(factor))
+
+    def _noise(self, noise_type: str, strength: float, tile_size: int = 256) -> None:
+        """
+        Apply noise to the image, taking it from the noise bank of the current process.
+
+        Args:
+            noise_type (str): The type of noise, one of "gaussian", "salt_and_pepper" and "poisson".
+            strength (float): The standard deviation of gaussian and poisson noise (in pixel values),
+                or the part of pixels changed by salt and pepper noise.
+            tile_size (int, optional): The size of noise bank tiles. Defaults to 256.
+
+        Raises:
+            ValueError: If noise type is unexpected.
+        """
+        bank = noise.get_noise_bank(tile_size)
+        index, y_offset, x_offset = bank.origin()
+
+        def origin(y: int, x: int) -> tuple[int, int, int]:
+            return index, (y_offset + y) % tile_size, (x_offset + x) % tile_size
+
+        match noise_type:
+            case "gaussian":
+                add_noise, field = noise.add_gaussian_noise, bank.normal_field
+            case "salt_and_pepper":
+                add_noise, field = noise.add_salt_and_pepper_noise, bank.uniform_field
+            case "poisson":
+                add_noise, field = noise.add_poisson_noise, bank.normal_field
+            case _:
+                raise ValueError(
+                    "Noise type is unexpected. Only support gaussian, salt_and_pepper and poisson."
+                )
+
+        def operation(tile: np.ndarray, y: int, x: int) -> np.ndarray:
+            return add_noise(tile, strength, field(tile.shape, origin(y, x)))
+
+        self.operations.append(operation)
+
+    def _blur(self, pixel_radius: int, blur_type: str = "box", fast: bool = False) -> None:
+        """
+        Apply a blur filter to the image.
+
+        Tiles are always blurred at full resolution, so the fast mode is ignored.
+
+        Args:
+            pixel_radius (int): The pixel radius for the blur filter.
+            blur_type (str, optional): The type of blur, one of "box", "gaussian", "horizontal_motion"
+                and "vertical_motion". Defaults to "box".
+            fast (bool, optional): Ignored in tiled mode. Defaults to False.
+        """
+        blur_filter = utils.blur_filter(blur_type, pixel_radius)
+        self.operations.append(
+            lambda tile, y, x: np.asarray(PILImage.fromarray(tile).filter(blur_filter))
+        )
+        self.halo += utils.blur_halo(blur_type, pixel_radius)
+
+
+for augmentation in (
+    AugustImage.mirror,
+    AugustImage.flip,
+    AugustImage.color_change,
+    AugustImage.color_temperature,
+    AugustImage.brightness,
+    AugustImage.contrast,
+    AugustImage.blur,
+    AugustImage.noise,
+):
+    mark_tiled_augmentation(augmentation)
@@ -1,27 +1,131 @@
-from PIL import Image
+import math
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+# rows are output channels (r, g, b), columns are input channel weights (r, g, b)
+SEPIA_MATRIX = (
+    (0.393, 0.769, 0.189),
+    (0.349, 0.686, 0.168),
+    (0.272, 0.534, 0.131),
+)
+_SEPIA_WEIGHTS = np.array(SEPIA_MATRIX, dtype=np.float64)
+_SEPIA_WEIGHTS_F32 = _SEPIA_WEIGHTS.T.astype(np.float32)
+# sepia weights have three decimal places, so exact channel sums are multiples of 0.001
+# and the float32 error (< 1e-4 for sums up to 345) can only matter next to whole numbers
+_SEPIA_NEAR_INTEGER = 5e-4
+_SEPIA_CHUNK_PIXELS = 1 << 20
+
+# in fast blur mode, images are downscaled so that the blur radius is about this many pixels
+FAST_BLUR_RADIUS = 4
+
+
+def to_rgb(img: Image) -> Image:
+    """
+    Return an RGB version of an image, avoiding the conversion when it is already RGB.
+
+    Args:
+        img (Image): The input image.
+
+    Returns:
+        Image: The image in RGB mode.
+    """
+    return img if img.mode == "RGB" else img.convert("RGB")
+
+
+def sepia_pixels(pixels: np.ndarray) -> np.ndarray:
+    """
+    Apply sepia weights to an array of RGB pixels.
+
+    Args:
+        pixels (np.ndarray): Array of shape (N, 3) with uint8 RGB values.
+
+    Returns:
+        np.ndarray: Array of shape (N, 3) with uint8 sepia RGB values.
+    """
+    values = pixels.astype(np.float32) @ _SEPIA_WEIGHTS_F32
+    rows, channels = np.nonzero(np.abs(values - np.rint(values)) < _SEPIA_NEAR_INTEGER)
+    if rows.size:
+        # recompute sums close to whole numbers in double precision, as in the per-pixel formula
+        near = pixels[rows].astype(np.float64)
+        weights = _SEPIA_WEIGHTS[channels]
+        exact = near[:, 0] * weights[:, 0] + near[:, 1] * weights[:, 1] + near[:, 2] * weights[:, 2]
+        values[rows, channels] = np.trunc(exact)
+    np.minimum(values, 255, out=values)
+    return values.astype(np.uint8)
+
+
+def downscale(img: Image, target_size: int) -> Image:
+    """
+    Downscale an image so that its longer side is at most target_size, keeping the aspect ratio.
+
+    For images that are not loaded yet, JPEG files are decoded directly at a reduced scale (draft mode),
+    and other formats are first reduced by an integer factor before the final resampling.
+
+    Args:
+        img (Image): The input image.
+        target_size (int): Maximal size of the longer image side.
+
+    Returns:
+        Image: The downscaled image, or the input image if it is already small enough.
+    """
+    if max(img.size) <= target_size:
+        return img
+    img.thumbnail((target_size, target_size), reducing_gap=2.0)
+    return img
+
+
+def grayscale_pixels(pixels: np.ndarray) -> np.ndarray:
+    """
+    Convert an array of RGB pixels to grayscale, with the same ITU-R 601-2 luma transform as PIL.
+
+    Args:
+        pixels (np.ndarray): Array of shape (..., 3) with uint8 RGB values.
+
+    Returns:
+        np.ndarray: Array of shape (...) with uint8 luma values.
+    """
+    pixels = pixels.astype(np.uint32)
+    luma = pixels[..., 0] * 19595 + pixels[..., 1] * 38470 + pixels[..., 2] * 7471 + 0x8000
+    return (luma >> 16).astype(np.uint8)
 
 
 def sepia(img: Image) -> Image:
     """
     Convert an image to sepia.
 
+    Every output channel is a weighted sum of input channels, truncated and clipped to 0-255.
+    The whole image is processed with array operations in chunks of pixels.
+
     Args:
         img (Image): The input image.
 
     Returns:
         Image: The sepia-converted image.
     """
-    result = img.copy().convert("RGB")
-    pixels = result.load()
-    width, height = img.size
-    for px in range(width):
-        for py in range(height):
-            r, g, b = pixels[px, py]
-            new_r = int(r * 0.393 + g * 0.769 + b * 0.189)
-            new_g = int(r * 0.349 + g * 0.686 + b * 0.168)
-            new_b = int(r * 0.272 + g * 0.534 + b * 0.131)
-            pixels[px, py] = (new_r, new_g, new_b)
-    return result
+    pixels = np.asarray(to_rgb(img))
+    flat = pixels.reshape(-1, 3)
+    result = np.empty_like(flat)
+    for start in range(0, len(flat), _SEPIA_CHUNK_PIXELS):
+        chunk = slice(start, start + _SEPIA_CHUNK_PIXELS)
+        result[chunk] = sepia_pixels(flat[chunk])
+    return Image.fromarray(result.reshape(pixels.shape), mode="RGB")
+
+
+def warmth_lut(ratio: int) -> list[int]:
+    """
+    Build a per-channel lookup table changing the warmth of an RGB image.
+
+    Args:
+        ratio (int): The warmth ratio to apply.
+
+    Returns:
+        list[int]: Lookup table with 256 entries for each of the R, G and B channels.
+    """
+    values = np.arange(256)
+    red = np.clip(values + ratio, 0, 255)
+    blue = np.clip(values - ratio, 0, 255)
+    return np.concatenate((red, values, blue)).tolist()
 
 
 def change_warmth(img: Image, ratio: int) -> Image:
@@ -35,11 +139,115 @@ def change_warmth(img: Image, ratio: int) -> Image:
     Returns:
         Image: The image with warmth adjusted by the specified ratio.
     """
-    result = img.copy().convert("RGB")
-    pixels = result.load()
-    width, height = img.size
-    for px in range(width):
-        for py in range(height):
-            r, g, b = pixels[px, py]
-            pixels[px, py] = (r + ratio, g, b - ratio)
-    return result
+    return to_rgb(img).point(warmth_lut(ratio))
+
+
+def brightness_lut(factor: float) -> list[int]:
+    """
+    Build a per-channel lookup table changing the brightness of an RGB image.
+
+    Args:
+        factor (float): The brightness factor, 1 keeps the image unchanged.
+
+    Returns:
+        list[int]: Lookup table with 256 entries for each of the R, G and B channels.
+    """
+    values = np.clip(np.rint(np.arange(256) * factor), 0, 255).astype(int)
+    return np.tile(values, 3).tolist()
+
+
+def contrast_lut(factor: float) -> list[int]:
+    """
+    Build a per-channel lookup table changing the contrast of an RGB image around the middle gray.
+
+    Args:
+        factor (float): The contrast factor, 1 keeps the image unchanged.
+
+    Returns:
+        list[int]: Lookup table with 256 entries for each of the R, G and B channels.
+    """
+    values = np.clip(np.rint(128 + (np.arange(256) - 128) * factor), 0, 255).astype(int)
+    return np.tile(values, 3).tolist()
+
+
+def black_and_white(img: Image) -> Image:
+    """
+    Convert an image to black and white (grayscale).
+
+    Args:
+        img (Image): The input image.
+
+    Returns:
+        Image: The grayscale image.
+    """
+    return to_rgb(img).convert("L")
+
+
+def blur_filter(blur_type: str, radius: float) -> ImageFilter.Filter:
+    """
+    Get a blur filter, every filter has constant cost per pixel regardless of the radius.
+
+    Args:
+        blur_type (str): The type of blur, one of "box", "gaussian", "horizontal_motion" and "vertical_motion".
+        radius (float): The blur radius in pixels.
+
+    Returns:
+        ImageFilter.Filter: The blur filter.
+
+    Raises:
+        ValueError: If blur type is unexpected.
+    """
+    match blur_type:
+        case "box":
+            return ImageFilter.BoxBlur(radius)
+        case "gaussian":
+            return ImageFilter.GaussianBlur(radius)
+        case "horizontal_motion":
+            return ImageFilter.BoxBlur((radius, 0))
+        case "vertical_motion":
+            return ImageFilter.BoxBlur((0, radius))
+        case _:
+            raise ValueError(
+                "Blur type is unexpected. Only support box, gaussian, horizontal_motion and vertical_motion."
+            )
+
+
+def blur_halo(blur_type: str, radius: float) -> int:
+    """
+    Get the number of neighbouring pixels on every side that affect a pixel of a blurred image.
+
+    Args:
+        blur_type (str): The type of blur, one of "box", "gaussian", "horizontal_motion" and "vertical_motion".
+        radius (float): The blur radius in pixels.
+
+    Returns:
+        int: The number of pixels.
+    """
+    box_halo = math.ceil(radius) + 1
+    # gaussian blur is approximated with three box blur passes of about the same radius
+    return 3 * box_halo if blur_type == "gaussian" else box_halo
+
+
+def blur(img: Image, blur_type: str, radius: float, fast: bool = False) -> Image:
+    """
+    Blur an image.
+
+    In fast mode, large radius blurs are computed on an image downscaled by an integer factor
+    (only along blurred axes) and scaled back up, which trades a little quality for far fewer pixels.
+
+    Args:
+        img (Image): The input image.
+        blur_type (str): The type of blur, one of "box", "gaussian", "horizontal_motion" and "vertical_motion".
+        radius (float): The blur radius in pixels.
+        fast (bool, optional): Whether to blur a downscaled image for large radiuses. Defaults to False.
+
+    Returns:
+        Image: The blurred image.
+    """
+    factor = int(radius // FAST_BLUR_RADIUS)
+    if not fast or factor < 2:
+        return img.filter(blur_filter(blur_type, radius))
+    x_factor = 1 if blur_type == "vertical_motion" else factor
+    y_factor = 1 if blur_type == "horizontal_motion" else factor
+    reduced = img.reduce((x_factor, y_factor)).filter(blur_filter(blur_type, radius / factor))
+    return reduced.resize(img.size, Image.BILINEAR)
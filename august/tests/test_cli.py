@@ -0,0 +1,15 @@
+from collections import Counter
+
+from ..cli import _group_by_source
+
+
+def test_group_by_source_keeps_indices_and_multiplicity():
+    files = ["a.jpg", "b.jpg", "a.jpg", "c.jpg", "a.jpg", "b.jpg"] * 50
+    groups = _group_by_source(files)
+
+    indices = [index for group_indices, _ in groups for index in group_indices]
+    assert sorted(indices) == list(range(len(files)))
+    for group_indices, file in groups:
+        assert group_indices == sorted(group_indices)
+        assert all(files[index] == file for index in group_indices)
+    assert Counter(file for group_indices, file in groups for _ in group_indices) == Counter(files)
@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from ..utils.writer import BackgroundWriter
+
+
+def test_jobs_run_in_order():
+    written = []
+    with BackgroundWriter(1) as writer:
+        for index in range(20):
+            writer.submit(written.append, index)
+    assert written == list(range(20))
+
+    caller = []
+    with BackgroundWriter(0) as writer:
+        writer.submit(lambda: caller.append(threading.current_thread()))
+        assert caller == [threading.current_thread()]
+
+
+def test_pending_jobs_are_bounded():
+    release = threading.Event()
+    started = []
+    writer = BackgroundWriter(2, max_pending=2)
+    for index in range(2):
+        writer.submit(lambda index=index: started.append(index) or release.wait())
+
+    blocked = threading.Thread(target=writer.submit, args=(started.append, 2))
+    blocked.start()
+    time.sleep(0.1)
+    assert blocked.is_alive()
+    release.set()
+    blocked.join()
+    writer.close()
+    assert sorted(started) == [0, 1, 2]
+    assert not writer._pending
+
+
+def test_errors_are_raised_once():
+    release = threading.Event()
+
+    def fail():
+        release.wait()
+        raise OSError("disk full")
+
+    written = []
+    writer = BackgroundWriter(2)
+    writer.submit(fail)
+    writer.submit(written.append, 1)
+    release.set()
+    with pytest.raises(OSError, match="disk full"):
+        writer.wait()
+    assert written == [1]
+
+    writer.submit(written.append, 2)
+    writer.submit(fail)
+    with pytest.raises(OSError, match="disk full"):
+        writer.close()
+    assert written == [1, 2]
+
+
+def test_close_waits_for_jobs_and_stops_threads():
+    written = []
+    writer = BackgroundWriter(2)
+    for index in range(5):
+        writer.submit(lambda index=index: time.sleep(0.01) or written.append(index))
+    writer.close()
+    assert sorted(written) == list(range(5))
+    # rejected jobs give their slots back, so later submits raise instead of blocking
+    for index in range(10):
+        with pytest.raises(RuntimeError):
+            writer.submit(written.append, index)
@@ -0,0 +1,163 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import IO, Self
+
+# JSON Lines and CSV files hold one record per line or row, other corpus files one text per line
+CORPUS_EXTENSIONS = (".jsonl", ".csv", ".txt")
+# size of write buffers of shards, so that many short records are written at once
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def read_records(path: str | Path, text_field: str = "text") -> Iterator[dict]:
+    """
+    Read the records of a corpus file one by one, without loading the whole file.
+
+    Records of JSON Lines and CSV files are dictionaries with the text in text_field, every non-empty
+    line of other files is a record with only the text. Ragged CSV rows are normalised to the header:
+    missing cells are empty and cells beyond the header are dropped, so every record of a CSV file
+    has the same fields.
+
+    Args:
+        path (str or Path): The path to the corpus file.
+        text_field (str, optional): The field of records holding the text. Defaults to "text".
+
+    Yields:
+        dict: The records of the file.
+
+    Raises:
+        ValueError: If a record has no text field.
+    """
+    path = Path(path)
+    with open(path, "r", newline="" if path.suffix == ".csv" else None) as file:
+        match path.suffix:
+            case ".jsonl":
+                records = (json.loads(line) for line in file if line.strip())
+            case ".csv":
+                # cells beyond the header of a row are stored under None, they have no field name
+                rows = csv.DictReader(file, restval="")
+                records = (
+                    {name: value for name, value in row.items() if name is not None} for row in rows
+                )
+            case _:
+                records = ({text_field: line.rstrip("\r\n")} for line in file if line.strip())
+        for record in records:
+            if text_field not in record:
+                raise ValueError(f"Record of {path} has no {text_field} field.")
+            yield record
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """
+    Split an iterable into lists of consecutive items, consuming it only as the lists are used.
+
+    Args:
+        iterable (Iterable): The items.
+        size (int): The number of items in every list but the last one.
+
+    Yields:
+        list: The lists of items.
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class ShardWriter:
+    """
+    A writer of records to numbered shard files in the format of the source corpus file.
+
+    The records of a corpus named corpus.jsonl are written to corpus-00000.jsonl, corpus-00001.jsonl and so on,
+    with up to shard_size records in every shard. Shards are written through large buffers, so many short
+    records take few system calls.
+
+    Args:
+        directory (str or Path): The directory of the shards.
+        name (str): The file name of the source corpus, which gives the names and format of the shards.
+        shard_size (int): The maximal number of records in a shard.
+        text_field (str, optional): The field of records holding the text. Defaults to "text".
+
+    Attributes:
+        directory (Path): The directory of the shards.
+        shard_size (int): The maximal number of records in a shard.
+        text_field (str): The field of records holding the text.
+        paths (list[Path]): The paths of the written shards.
+    """
+
+    def __init__(
+        self, directory: str | Path, name: str, shard_size: int, text_field: str = "text"
+    ) -> None:
+        """
+        Initialize the ShardWriter object.
+
+        Args:
+            directory (str or Path): The directory of the shards.
+            name (str): The file name of the source corpus, which gives the names and format of the shards.
+            shard_size (int): The maximal number of records in a shard.
+            text_field (str, optional): The field of records holding the text. Defaults to "text".
+
+        Raises:
+            ValueError: If the shard size is not positive.
+        """
+        if shard_size < 1:
+            raise ValueError("Shards must hold at least one record.")
+        self.directory = Path(directory)
+        self.shard_size = shard_size
+        self.text_field = text_field
+        self.paths: list[Path] = []
+        self._stem, self._suffix = Path(name).stem, Path(name).suffix
+        self._file: IO | None = None
+        self._csv_writer: csv.DictWriter | None = None
+        self._count = 0
+
+    def _next_shard(self, record: dict) -> None:
+        """
+        Close the current shard and open the next one.
+
+        Args:
+            record (dict): The first record of the shard, its fields are the header of CSV shards.
+        """
+        self.close()
+        path = self.directory / f"{self._stem}-{len(self.paths):05d}{self._suffix}"
+        newline = "" if self._suffix == ".csv" else None
+        # the writer owns the handle, the shard is closed by the next shard or close
+        self._file = open(path, "w", buffering=WRITE_BUFFER_SIZE, newline=newline)  # noqa: SIM115
+        if self._suffix == ".csv":
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=list(record))
+            self._csv_writer.writeheader()
+        self.paths.append(path)
+        self._count = 0
+
+    def write(self, record: dict) -> None:
+        """
+        Write a record, starting a new shard if the current one is full.
+
+        Args:
+            record (dict): The record.
+        """
+        if self._file is None or self._count == self.shard_size:
+            self._next_shard(record)
+        match self._suffix:
+            case ".jsonl":
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            case ".csv":
+                self._csv_writer.writerow(record)
+            case _:
+                self._file.write(record[self.text_field] + "\n")
+        self._count += 1
+
+    def close(self) -> None:
+        """
+        Flush and close the current shard.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file, self._csv_writer = None, None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,68 @@
+import csv
+
+import pytest
+
+from ..corpus import ShardWriter, batched, read_records
+
+
+def test_read_records(tmp_path):
+    (tmp_path / "corpus.jsonl").write_text('{"text": "a", "id": 1}\n\n{"text": "b", "id": 2}\n')
+    (tmp_path / "corpus.txt").write_text("a\n\nb\n")
+    (tmp_path / "corpus.csv").write_text("id,text\n1,a\n2,b\n")
+
+    assert list(read_records(tmp_path / "corpus.jsonl")) == [
+        {"text": "a", "id": 1},
+        {"text": "b", "id": 2},
+    ]
+    assert list(read_records(tmp_path / "corpus.txt")) == [{"text": "a"}, {"text": "b"}]
+    assert list(read_records(tmp_path / "corpus.csv")) == [
+        {"id": "1", "text": "a"},
+        {"id": "2", "text": "b"},
+    ]
+
+
+def test_ragged_csv_rows_are_normalised(tmp_path):
+    (tmp_path / "corpus.csv").write_text("id,text,label\n1,a,x,extra\n2,b\n")
+
+    records = list(read_records(tmp_path / "corpus.csv"))
+    assert records == [{"id": "1", "text": "a", "label": "x"}, {"id": "2", "text": "b", "label": ""}]
+    (tmp_path / "shards").mkdir()
+    with ShardWriter(tmp_path / "shards", "corpus.csv", 10) as writer:
+        for record in records:
+            writer.write(record)
+    with open(writer.paths[0], newline="") as file:
+        assert list(csv.DictReader(file)) == records
+
+
+def test_record_without_text_field(tmp_path):
+    (tmp_path / "corpus.jsonl").write_text('{"body": "a"}\n')
+
+    with pytest.raises(ValueError):
+        list(read_records(tmp_path / "corpus.jsonl"))
+
+
+def test_batched():
+    assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(batched([], 3)) == []
+
+
+@pytest.mark.parametrize("name", ["corpus.jsonl", "corpus.csv", "corpus.txt"])
+def test_shards_roll_over(tmp_path, name):
+    records = [{"text": f"text {index}", "id": str(index)} for index in range(5)]
+    with ShardWriter(tmp_path, name, 2) as writer:
+        for record in records:
+            writer.write(record)
+
+    stem, suffix = name.split(".")
+    assert [path.name for path in writer.paths] == [f"{stem}-{index:05d}.{suffix}" for index in range(3)]
+    assert sorted(tmp_path.iterdir()) == writer.paths
+    written = [record for path in writer.paths for record in read_records(path)]
+    if suffix == "txt":
+        records = [{"text": record["text"]} for record in records]
+    assert written == records
+    assert [len(list(read_records(path))) for path in writer.paths] == [2, 2, 1]
+
+
+def test_shard_size_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        ShardWriter(tmp_path, "corpus.jsonl", 0)
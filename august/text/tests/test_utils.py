@@ -0,0 +1,18 @@
+import nlpaug.augmenter.char as nac
+
+from .. import utils
+
+TEXT = "The quick brown fox jumps over the lazy dog."
+
+
+def test_augmenters_are_built_once_per_parameters():
+    utils._augmenter.cache_clear()
+    for _ in range(5):
+        utils.ocr(TEXT, p=0.3)
+        utils.keyboard(TEXT, p=0.3)
+        utils.random_word_swap(TEXT, p=0.3)
+    assert utils._augmenter.cache_info().misses == 3
+
+    augmenter = utils._augmenter(nac.OcrAug, aug_char_p=0.3)
+    assert utils._augmenter(nac.OcrAug, aug_char_p=0.3) is augmenter
+    assert utils._augmenter(nac.OcrAug, aug_char_p=0.5) is not augmenter
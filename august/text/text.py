@@ -37,6 +37,21 @@ class AugustText(ExecuteAugmentationMixin):
         self.original_text = text
         self.config = config
 
+    @classmethod
+    def warm_up(cls, config: AugustTextConfig = AugustTextConfig()) -> None:
+        """
+        Build the augmenters of all augmentations with the configuration and load the data they use.
+
+        Augmenters are built once per process, so calling this at the start of a worker process, e.g. as
+        a Pool initializer, moves their load time from the first augmented text to the worker startup.
+
+        Args:
+            config (AugustTextConfig, optional): Configuration settings for text augmentation. Defaults to AugustTextConfig().
+        """
+        text = cls("The quick brown fox jumps over the lazy dog.", config)
+        for augmentation in cls._augmentations:
+            augmentation(text)
+
     def save(self, path: str | Path) -> None:
         """
         Save the augmented text to a file.
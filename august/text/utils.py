@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 import nlpaug.augmenter.char as nac
 import nlpaug.augmenter.word as naw
@@ -31,6 +32,24 @@ def _download_models(dest_dir: str = ".", model: str = "fasttext") -> None:
             raise ValueError("Model value is unexpected. Only support fasttext, word2vec and glove.")
 
 
+@lru_cache
+def _augmenter(augmenter: type, **params):
+    """
+    Get an nlpaug augmenter, built once per process for every set of parameters.
+
+    Building augmenters loads WordNet wrappers, character mapping tables or dictionaries, while
+    augmenting draws new random positions on every call, so the same objects are reused for all texts.
+
+    Args:
+        augmenter (type): The nlpaug augmenter class.
+        **params: Parameters of the augmenter.
+
+    Returns:
+        Augmenter: The augmenter.
+    """
+    return augmenter(**params)
+
+
 def synonym_replacement(text: str, *, p: float = 0.3, n: int = 1) -> str:
     """
     Replace n words in the sentence with synonyms from WordNet.
@@ -43,7 +62,7 @@ def synonym_replacement(text: str, *, p: float = 0.3, n: int = 1) -> str:
     Returns:
         str: The augmented text with synonym replacements.
     """
-    aug = naw.SynonymAug(aug_p=p)
+    aug = _augmenter(naw.SynonymAug, aug_p=p)
     augmented_text = aug.augment(text, n=n)
     return augmented_text
 
@@ -60,7 +79,7 @@ def antonym_replacement(text: str, *, p: float = 0.3, n: int = 1) -> str:
     Returns:
         str: The augmented text with antonym replacements.
     """
-    aug = naw.AntonymAug(aug_p=p)
+    aug = _augmenter(naw.AntonymAug, aug_p=p)
     augmented_text = aug.augment(text, n=n)
     return augmented_text
 
@@ -77,7 +96,7 @@ def ocr(text: str, *, p: float = 0.3, n: int = 1):
     Returns:
         str: A list of augmented texts with OCR errors.
     """
-    aug = nac.OcrAug(aug_char_p=p)
+    aug = _augmenter(nac.OcrAug, aug_char_p=p)
     augmented_texts = aug.augment(text, n=n)
     return augmented_texts
 
@@ -94,7 +113,7 @@ def keyboard(text: str, *, p: float = 0.3, n: int = 1):
     Returns:
         str: A list of augmented texts with keyboard typing errors.
     """
-    aug = nac.KeyboardAug(aug_char_p=p)
+    aug = _augmenter(nac.KeyboardAug, aug_char_p=p)
     augmented_texts = aug.augment(text, n=n)
     return augmented_texts
 
@@ -111,7 +130,7 @@ def random_char(text: str, *, p: float, n: int = 1):
     Returns:
         list[str]: A list of augmented texts with random character replacements.
     """
-    aug = nac.RandomCharAug(aug_char_p=p)
+    aug = _augmenter(nac.RandomCharAug, aug_char_p=p)
     augmented_texts = aug.augment(text, n=n)
     return augmented_texts
 
@@ -129,7 +148,7 @@ def _random_word_aug(mode: str, text: str, *, p: float = 0.3, n: int = 1):
     Returns:
         list[str]: A list of augmented texts based on the specified word-based augmentation mode.
     """
-    aug = naw.RandomWordAug(action=mode, aug_p=p)
+    aug = _augmenter(naw.RandomWordAug, action=mode, aug_p=p)
     augmented_texts = aug.augment(text, n=n)
     return augmented_texts
 
@@ -206,7 +225,7 @@ def spelling(text: str, *, p: float = 0.3, n: int = 1):
     Returns:
         list[str]: A list of augmented texts with spelling errors.
     """
-    aug = naw.SpellingAug(aug_p=p)
+    aug = _augmenter(naw.SpellingAug, aug_p=p)
     return aug.augment(text, n=n)
 
 
@@ -221,7 +240,8 @@ def embedding(text: str, n: int = 1):
     Returns:
         list[str]: A list of augmented texts with word embeddings-based substitutions.
     """
-    aug = naw.WordEmbsAug(
+    aug = _augmenter(
+        naw.WordEmbsAug,
         # model_type="word2vec", model_path="./models/GoogleNews-vectors-negative300.bin"
         model_type="fasttext",
         model_path="./models/wiki-news-300d-1M.vec",
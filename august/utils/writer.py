@@ -0,0 +1,110 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Self
+
+
+class BackgroundWriter:
+    """
+    A bounded pool of threads running write jobs (encoding and saving files) in the background.
+
+    Submitting a job blocks while too many jobs are pending, so that memory held by finished
+    but not yet written samples stays bounded. Encoders release the GIL, so the next sample
+    can be augmented while previous ones are compressed and written to disk.
+
+    Only pending jobs are tracked, so a writer can be kept for the whole life of a worker process.
+    The first error of a failed job is raised by the next call of submit, wait or close.
+
+    Args:
+        threads (int): The number of writer threads, 0 runs jobs immediately in the calling thread.
+        max_pending (int or None, optional): The maximal number of pending jobs. Defaults to None (2 * threads).
+
+    Attributes:
+        threads (int): The number of writer threads.
+    """
+
+    def __init__(self, threads: int, max_pending: int | None = None) -> None:
+        """
+        Initialize the BackgroundWriter object.
+
+        Args:
+            threads (int): The number of writer threads, 0 runs jobs immediately in the calling thread.
+            max_pending (int or None, optional): The maximal number of pending jobs. Defaults to None (2 * threads).
+        """
+        self.threads = threads
+        self._executor = ThreadPoolExecutor(threads) if threads > 0 else None
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * max(threads, 1))
+        self._lock = threading.Lock()
+        self._pending: set[Future] = set()
+        self._idle = threading.Condition(self._lock)
+        self._error: BaseException | None = None
+
+    def _done(self, future: Future) -> None:
+        """
+        Forget a finished job, keeping its error if it is the first one.
+
+        Args:
+            future (Future): The finished job.
+        """
+        with self._lock:
+            self._pending.discard(future)
+            if self._error is None and not future.cancelled():
+                self._error = future.exception()
+            self._idle.notify_all()
+        self._slots.release()
+
+    def _raise_error(self) -> None:
+        """
+        Raise the first error of a failed job, once.
+        """
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def submit(self, job: Callable, *args) -> None:
+        """
+        Run a write job in the background, waiting for a free slot if too many jobs are pending.
+
+        Args:
+            job (Callable): The function to run.
+            *args: Arguments of the function.
+        """
+        self._raise_error()
+        if self._executor is None:
+            job(*args)
+            return
+        self._slots.acquire()
+        with self._lock:
+            try:
+                future = self._executor.submit(job, *args)
+            except BaseException:
+                # the job never runs, so its slot is never released by _done
+                self._slots.release()
+                raise
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+
+    def wait(self) -> None:
+        """
+        Wait for all pending jobs, raising the first error of a failed job.
+        """
+        with self._lock:
+            self._idle.wait_for(lambda: not self._pending)
+        self._raise_error()
+
+    def close(self) -> None:
+        """
+        Wait for all pending jobs and stop the writer threads, raising the first error of a failed job.
+        """
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()